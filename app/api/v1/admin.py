@@ -0,0 +1,118 @@
+"""Cache administration endpoints."""
+import logging
+import secrets
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from app.core.config import settings
+from app.schemas.admin import CachePurgeResponse, NamespaceBumpResponse
+from app.services.cache import CacheUnavailableError, cache_service
+from app.services.location_resolver import location_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def require_admin(request: Request):
+    """Reject requests without the admin API key.
+
+    Raises:
+        HTTPException: If the admin API is disabled or the key is wrong
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin API disabled")
+    provided = request.headers.get(settings.API_KEY_HEADER, "")
+    if not secrets.compare_digest(provided.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+@router.post(
+    "/admin/cache/namespaces/{namespace}/bump", response_model=NamespaceBumpResponse
+)
+async def bump_cache_namespace(namespace: str) -> NamespaceBumpResponse:
+    """Invalidate every cache entry of a namespace.
+
+    Args:
+        namespace: Cache namespace (weather:current, weather:forecast or timezone)
+
+    Returns:
+        NamespaceBumpResponse with the new namespace version
+
+    Raises:
+        HTTPException: If the cache is unavailable
+    """
+    started = time.perf_counter()
+    try:
+        version = await cache_service.bump_namespace(namespace)
+    except CacheUnavailableError as e:
+        logger.error(f"Cache namespace bump failed: {e}")
+        raise HTTPException(status_code=503, detail="Cache unavailable")
+    return NamespaceBumpResponse(
+        namespace=namespace, version=version, duration_ms=_elapsed_ms(started)
+    )
+
+
+@router.delete("/admin/cache/tags/{tag:path}", response_model=CachePurgeResponse)
+async def purge_cache_tag(tag: str) -> CachePurgeResponse:
+    """Delete every cache entry stored with a tag.
+
+    Args:
+        tag: Cache tag (e.g., 'location:2643743', 'alias:paris,fr')
+
+    Returns:
+        CachePurgeResponse with the number of keys deleted
+
+    Raises:
+        HTTPException: If the cache is unavailable
+    """
+    started = time.perf_counter()
+    try:
+        purged = await cache_service.purge_tag(tag)
+    except CacheUnavailableError as e:
+        logger.error(f"Cache tag purge failed: {e}")
+        raise HTTPException(status_code=503, detail="Cache unavailable")
+    return CachePurgeResponse(tags=[tag], purged_keys=purged, duration_ms=_elapsed_ms(started))
+
+
+@router.delete("/admin/cache/locations", response_model=CachePurgeResponse)
+async def purge_cache_location(
+    city: str = Query(..., description="City name"),
+    country_code: str = Query(None, description="ISO 3166 country code (e.g., US, GB)"),
+) -> CachePurgeResponse:
+    """Delete every weather cache entry for a location.
+
+    Purges entries keyed by the location's canonical city id, when known,
+    and by its normalized name.
+
+    Args:
+        city: City name
+        country_code: ISO 3166 country code (optional)
+
+    Returns:
+        CachePurgeResponse with the number of keys deleted
+
+    Raises:
+        HTTPException: If the cache is unavailable
+    """
+    started = time.perf_counter()
+    alias = location_resolver.normalize(city, country_code)
+    city_id = await location_resolver.resolve(alias)
+    tags = [f"alias:{alias}"]
+    if city_id is not None:
+        tags.insert(0, f"location:{city_id}")
+
+    purged = 0
+    try:
+        for tag in tags:
+            purged += await cache_service.purge_tag(tag, operation="location")
+    except CacheUnavailableError as e:
+        logger.error(f"Cache location purge failed: {e}")
+        raise HTTPException(status_code=503, detail="Cache unavailable")
+    return CachePurgeResponse(tags=tags, purged_keys=purged, duration_ms=_elapsed_ms(started))
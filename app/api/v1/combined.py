@@ -7,7 +7,9 @@ from slowapi.util import get_remote_address
 
 from app.core.config import settings
 from app.schemas.combined import TimezoneWeatherResponse
+from app.services.resilience import CircuitOpenError
 from app.services.timezone_service import timezone_service
+from app.services.upstream_scheduler import UpstreamThrottledError
 from app.services.weather_client import weather_client
 
 logger = logging.getLogger(__name__)
@@ -22,7 +24,9 @@ async def get_timezone_and_weather(
     city: str = Query(..., description="City name"),
     timezone: str = Query(..., description="Timezone name (e.g., 'America/New_York')"),
     country_code: str = Query(None, description="ISO 3166 country code"),
-    units: str = Query("metric", regex="^(metric|imperial)$", description="Temperature units"),
+    units: str = Query(
+        "metric", regex="^(metric|imperial|standard)$", description="Temperature units"
+    ),
 ) -> TimezoneWeatherResponse:
     """Get both timezone information and current weather for a location.
 
@@ -31,7 +35,7 @@ async def get_timezone_and_weather(
         city: City name
         timezone: Timezone name
         country_code: ISO 3166 country code (optional)
-        units: Temperature units (metric or imperial)
+        units: Temperature units (metric, imperial or standard)
 
     Returns:
         TimezoneWeatherResponse with timezone and weather data
@@ -53,6 +57,9 @@ async def get_timezone_and_weather(
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
+    except (CircuitOpenError, UpstreamThrottledError) as e:
+        logger.warning(f"Weather service unavailable: {e}")
+        raise HTTPException(status_code=503, detail="Weather service temporarily unavailable")
     except Exception as e:
         logger.error(f"Error fetching combined data: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch timezone and weather data")
\ No newline at end of file
@@ -1,13 +1,14 @@
 """Timezone API endpoints."""
 import logging
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from app.core.config import settings
 from app.schemas.timezone import TimezoneResponse
 from app.services.timezone_service import timezone_service
+from app.utils.responses import json_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -19,7 +20,7 @@ limiter = Limiter(key_func=get_remote_address)
 async def get_timezone_info(
     request: Request,
     timezone: str,
-) -> TimezoneResponse:
+) -> Response:
     """Get timezone information for a specific timezone.
 
     Args:
@@ -35,8 +36,8 @@ async def get_timezone_info(
     logger.info(f"Fetching timezone info for: {timezone}")
 
     try:
-        result = await timezone_service.get_timezone_info(timezone)
-        return result
+        result = await timezone_service.get_timezone_info(timezone, as_json=True)
+        return json_response(result)
     except ValueError as e:
         logger.error(f"Invalid timezone: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,13 +1,22 @@
 """Weather API endpoints."""
 import logging
 
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from app.core.config import settings
-from app.schemas.weather import CurrentWeatherResponse, ForecastResponse
+from app.schemas.weather import (
+    BatchWeatherItem,
+    BatchWeatherRequest,
+    BatchWeatherResponse,
+    CurrentWeatherResponse,
+    ForecastResponse,
+)
+from app.services.resilience import CircuitOpenError
+from app.services.upstream_scheduler import UpstreamThrottledError
 from app.services.weather_client import weather_client
+from app.utils.responses import json_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -20,15 +29,17 @@ async def get_current_weather(
     request: Request,
     city: str = Query(..., description="City name"),
     country_code: str = Query(None, description="ISO 3166 country code (e.g., US, GB)"),
-    units: str = Query("metric", regex="^(metric|imperial)$", description="Temperature units"),
-) -> CurrentWeatherResponse:
+    units: str = Query(
+        "metric", regex="^(metric|imperial|standard)$", description="Temperature units"
+    ),
+) -> Response:
     """Get current weather data with a witty message.
 
     Args:
         request: FastAPI request object
         city: City name
         country_code: ISO 3166 country code (optional)
-        units: Temperature units (metric or imperial)
+        units: Temperature units (metric, imperial or standard)
 
     Returns:
         CurrentWeatherResponse with weather data and witty message
@@ -39,31 +50,86 @@ async def get_current_weather(
     logger.info(f"Fetching current weather for: {city}, {country_code}")
 
     try:
-        result = await weather_client.get_current_weather(city, country_code, units)
-        return result
+        result = await weather_client.get_current_weather(
+            city, country_code, units, as_json=True
+        )
+        return json_response(result)
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
+    except (CircuitOpenError, UpstreamThrottledError) as e:
+        logger.warning(f"Weather service unavailable: {e}")
+        raise HTTPException(status_code=503, detail="Weather service temporarily unavailable")
     except Exception as e:
         logger.error(f"Error fetching weather: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch weather data")
 
 
+@router.post("/weather/current/batch", response_model=BatchWeatherResponse)
+@limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
+async def get_current_weather_batch(
+    request: Request,
+    batch: BatchWeatherRequest,
+) -> BatchWeatherResponse:
+    """Get current weather for several locations in one request.
+
+    Args:
+        request: FastAPI request object
+        batch: Locations and temperature units
+
+    Returns:
+        BatchWeatherResponse with one result or error per location
+
+    Raises:
+        HTTPException: If the weather service is not configured
+    """
+    logger.info(f"Fetching current weather for {len(batch.locations)} locations")
+
+    try:
+        results = await weather_client.get_current_weather_batch(
+            [(location.city, location.country_code) for location in batch.locations],
+            batch.units,
+        )
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    items = []
+    for location, result in zip(batch.locations, results):
+        item = BatchWeatherItem(city=location.city, country_code=location.country_code, status="ok")
+        if isinstance(result, CurrentWeatherResponse):
+            item.weather = result
+        else:
+            item.status = "error"
+            if isinstance(result, ValueError):
+                item.error = str(result)
+            elif isinstance(result, (CircuitOpenError, UpstreamThrottledError)):
+                item.error = "Weather service temporarily unavailable"
+            else:
+                logger.error(f"Error fetching weather for {location.city}: {result}")
+                item.error = "Failed to fetch weather data"
+        items.append(item)
+
+    return BatchWeatherResponse(results=items)
+
+
 @router.get("/weather/forecast", response_model=ForecastResponse)
 @limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
 async def get_weather_forecast(
     request: Request,
     city: str = Query(..., description="City name"),
     country_code: str = Query(None, description="ISO 3166 country code (e.g., US, GB)"),
-    units: str = Query("metric", regex="^(metric|imperial)$", description="Temperature units"),
-) -> ForecastResponse:
+    units: str = Query(
+        "metric", regex="^(metric|imperial|standard)$", description="Temperature units"
+    ),
+) -> Response:
     """Get 5-day weather forecast with witty messages.
 
     Args:
         request: FastAPI request object
         city: City name
         country_code: ISO 3166 country code (optional)
-        units: Temperature units (metric or imperial)
+        units: Temperature units (metric, imperial or standard)
 
     Returns:
         ForecastResponse with 5-day forecast and witty messages
@@ -74,11 +140,14 @@ async def get_weather_forecast(
     logger.info(f"Fetching 5-day forecast for: {city}, {country_code}")
 
     try:
-        result = await weather_client.get_forecast(city, country_code, units)
-        return result
+        result = await weather_client.get_forecast(city, country_code, units, as_json=True)
+        return json_response(result)
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
+    except (CircuitOpenError, UpstreamThrottledError) as e:
+        logger.warning(f"Weather service unavailable: {e}")
+        raise HTTPException(status_code=503, detail="Weather service temporarily unavailable")
     except Exception as e:
         logger.error(f"Error fetching forecast: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch forecast data")
\ No newline at end of file
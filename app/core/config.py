@@ -1,5 +1,5 @@
 """Application configuration."""
-from typing import List
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -25,15 +25,126 @@ class Settings(BaseSettings):
     WEATHER_API_TIMEOUT: int = 30
     WEATHER_API_MAX_RETRIES: int = 3
 
+    # Weather API connection pool (per-phase timeouts fall back to WEATHER_API_TIMEOUT)
+    WEATHER_API_POOL_MAX_CONNECTIONS: int = 100
+    WEATHER_API_POOL_MAX_KEEPALIVE: int = 20
+    WEATHER_API_KEEPALIVE_EXPIRY: float = 30.0
+    WEATHER_API_CONNECT_TIMEOUT: Optional[float] = 5.0
+    WEATHER_API_READ_TIMEOUT: Optional[float] = None
+    WEATHER_API_WRITE_TIMEOUT: Optional[float] = 5.0
+    WEATHER_API_POOL_TIMEOUT: Optional[float] = 5.0
+    WEATHER_API_WARMUP_CONNECTIONS: int = 2
+
+    # Weather API resilience (WEATHER_API_MAX_RETRIES is the total attempt count)
+    WEATHER_API_BACKOFF_BASE: float = 0.2
+    WEATHER_API_BACKOFF_MAX: float = 5.0
+    WEATHER_API_RETRY_BUDGET_RATIO: float = 0.2
+    WEATHER_API_RETRY_BUDGET_MIN_RETRIES: int = 10
+    WEATHER_API_RETRY_BUDGET_WINDOW: float = 10.0
+    WEATHER_API_BREAKER_FAILURE_THRESHOLD: int = 5
+    WEATHER_API_BREAKER_RECOVERY_TIMEOUT: float = 30.0
+    WEATHER_API_BREAKER_HALF_OPEN_MAX_CALLS: int = 1
+
+    # Weather API quota scheduling, per worker process: with N workers use the
+    # plan quota / N (0 calls per minute disables the scheduler)
+    WEATHER_API_CALLS_PER_MINUTE: int = 60
+    WEATHER_API_BURST: int = 10
+    WEATHER_API_QUEUE_MAX_SIZE: int = 100
+    WEATHER_API_QUEUE_TIMEOUT_INTERACTIVE: float = 5.0
+    WEATHER_API_QUEUE_TIMEOUT_BACKGROUND: float = 60.0
+    WEATHER_API_QUOTA_PAUSE: float = 5.0
+
+    # Batch current-weather endpoint
+    WEATHER_BATCH_MAX_ITEMS: int = 100
+    WEATHER_BATCH_CONCURRENCY: int = 10
+
+    # Upstream micro-batching of current weather via /group (0 ms window disables)
+    WEATHER_GROUP_BATCH_WINDOW_MS: float = 5.0
+    WEATHER_GROUP_BATCH_MAX_SIZE: int = 20
+
     # Redis
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
+    # Connection pool: commands wait up to REDIS_POOL_TIMEOUT for one of
+    # REDIS_MAX_CONNECTIONS connections
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 1.0
+    REDIS_SOCKET_TIMEOUT: float = 1.0
+    REDIS_CONNECT_TIMEOUT: float = 1.0
+    # Reconnection backoff (full jitter) while Redis is unreachable
+    REDIS_RECONNECT_BACKOFF_BASE: float = 0.5
+    REDIS_RECONNECT_BACKOFF_MAX: float = 30.0
+    # In-process backend that serves the cache while Redis is unreachable
+    CACHE_FALLBACK_ENABLED: bool = True
+    CACHE_FALLBACK_MAX_ENTRIES: int = 10000
     CACHE_TTL: int = 1800  # 30 minutes
+    # Stale-while-revalidate: how long past CACHE_TTL an entry is still served
+    # while it is refreshed in the background (0 disables)
+    CACHE_STALE_TTL_CURRENT: int = 600
+    CACHE_STALE_TTL_FORECAST: int = 1800
+    # Adaptive fresh TTLs: entries expire when the provider is expected to
+    # have published newer data (0 cadence falls back to CACHE_TTL)
+    CACHE_TTL_PUBLISH_DELAY: int = 60
+    CACHE_TTL_CURRENT_CADENCE: int = 600
+    CACHE_TTL_CURRENT_MIN: int = 60
+    CACHE_TTL_CURRENT_MAX: int = 1800
+    CACHE_TTL_FORECAST_CADENCE: int = 10800
+    CACHE_TTL_FORECAST_MIN: int = 300
+    CACHE_TTL_FORECAST_MAX: int = 10800
+    # In-process alias -> city id map size (backed by a Redis hash)
+    LOCATION_ALIAS_CACHE_SIZE: int = 10000
+    # Aliases kept in the shared Redis hash, least recently learned dropped first,
+    # and seconds the hash outlives its last write
+    LOCATION_ALIAS_MAX_ENTRIES: int = 100000
+    LOCATION_ALIAS_TTL: int = 2592000
+    # Popularity-driven refresh of the hottest entries before they go stale
+    # (0 top keys disables; budget is upstream refreshes per cycle)
+    CACHE_REFRESH_TOP_K: int = 50
+    CACHE_REFRESH_INTERVAL: float = 10.0
+    CACHE_REFRESH_BUDGET: int = 10
+    CACHE_REFRESH_LEAD: float = 60.0
+    CACHE_REFRESH_SKETCH_SIZE: int = 1000
+    # In-process L1 cache in front of Redis; entries live at most CACHE_L1_TTL
+    # seconds (never past their Redis TTL). Invalidation publishes writes on
+    # CACHE_L1_CHANNEL so other workers drop their copies.
+    CACHE_L1_ENABLED: bool = True
+    CACHE_L1_MAX_ENTRIES: int = 10000
+    CACHE_L1_MAX_BYTES: int = 50_000_000
+    CACHE_L1_TTL: int = 5
+    CACHE_L1_INVALIDATION: bool = False
+    CACHE_L1_CHANNEL: str = "cache:invalidate"
+    # Redis client-side caching (CLIENT TRACKING, broadcast mode): keys with
+    # these prefixes are invalidated by the server and held in the in-process
+    # tier for their full Redis TTL
+    CACHE_CLIENT_TRACKING: bool = False
+    CACHE_CLIENT_TRACKING_PREFIXES: List[str] = ["timezone:", "weather:"]
+    # Stored value encoding: raw, zlib or zstd (needs the zstandard package);
+    # values shorter than CACHE_COMPRESS_MIN_BYTES are stored uncompressed
+    CACHE_CODEC: str = "zlib"
+    CACHE_COMPRESS_MIN_BYTES: int = 512
+    CACHE_COMPRESS_LEVEL: int = 6
+    # Namespace versions bumped by other workers are picked up within
+    # CACHE_VERSION_SYNC_INTERVAL seconds; tag indexes outlive their
+    # last write by at least CACHE_TAG_TTL seconds
+    CACHE_VERSION_SYNC_INTERVAL: float = 5.0
+    CACHE_TAG_TTL: int = 86400
+    # Unknown cities (upstream 404s) are remembered for this many seconds
+    # (0 disables), at most CACHE_NEGATIVE_MAX_ENTRIES of them
+    CACHE_NEGATIVE_TTL_CITY: int = 300
+    CACHE_NEGATIVE_MAX_ENTRIES: int = 10000
+    # Snapshot of up to CACHE_SNAPSHOT_MAX_ENTRIES hot entries, written every
+    # CACHE_SNAPSHOT_INTERVAL seconds and on shutdown, restored at startup
+    CACHE_SNAPSHOT_ENABLED: bool = False
+    CACHE_SNAPSHOT_PATH: str = "data/cache.snapshot"
+    CACHE_SNAPSHOT_MAX_ENTRIES: int = 5000
+    CACHE_SNAPSHOT_INTERVAL: float = 300.0
 
     # Security
     API_KEY_HEADER: str = "X-API-Key"
+    # Key required in API_KEY_HEADER by the admin endpoints; empty disables them
+    ADMIN_API_KEY: str = ""
     ALLOWED_HOSTS: str = "*"
     CORS_ORIGINS: List[str] = ["*"]
 
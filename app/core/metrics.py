@@ -0,0 +1,245 @@
+"""Application Prometheus metrics.
+
+Metrics are registered on the default ``prometheus_client`` registry, which is
+the one exposed on ``/metrics`` by the ``Instrumentator`` in ``app.main``.
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+# Upstream HTTP connection pool
+UPSTREAM_POOL_CONNECTIONS = Gauge(
+    "upstream_http_pool_connections",
+    "Connections held by the shared weather API client pool",
+    ["state"],
+)
+UPSTREAM_POOL_WAITING = Gauge(
+    "upstream_http_pool_waiting_requests",
+    "Requests waiting to acquire a connection from the weather API client pool",
+)
+
+# Request coalescing
+SINGLEFLIGHT_REQUESTS = Counter(
+    "singleflight_requests_total",
+    "Cache-miss fetches by single-flight role (leader runs the fetch, coalesced waits on it)",
+    ["namespace", "role"],
+)
+
+# Stale-while-revalidate
+CACHE_STALE_SERVED = Counter(
+    "cache_stale_served_total",
+    "Cache hits served past their soft TTL while a refresh runs",
+    ["namespace"],
+)
+CACHE_BACKGROUND_REFRESHES = Counter(
+    "cache_background_refreshes_total",
+    "Background refreshes of stale cache entries",
+    ["namespace", "outcome"],
+)
+
+# Upstream resilience
+UPSTREAM_RETRIES = Counter(
+    "upstream_retries_total",
+    "Upstream retry decisions (retried, or denied by the retry budget)",
+    ["policy", "outcome"],
+)
+UPSTREAM_CIRCUIT_STATE = Gauge(
+    "upstream_circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["breaker"],
+)
+UPSTREAM_CIRCUIT_TRANSITIONS = Counter(
+    "upstream_circuit_breaker_transitions_total",
+    "Circuit breaker state transitions",
+    ["breaker", "from_state", "to_state"],
+)
+
+# Upstream quota scheduling
+UPSTREAM_SCHEDULER_QUEUE_DEPTH = Gauge(
+    "upstream_scheduler_queue_depth",
+    "Upstream calls waiting for a quota token",
+    ["priority"],
+)
+UPSTREAM_SCHEDULER_WAIT = Histogram(
+    "upstream_scheduler_wait_seconds",
+    "Time upstream calls waited for a quota token",
+    ["priority"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+UPSTREAM_SCHEDULER_REJECTED = Counter(
+    "upstream_scheduler_rejected_total",
+    "Upstream calls rejected by the quota scheduler",
+    ["priority", "reason"],
+)
+
+# Location canonicalization
+LOCATION_ALIAS_LOOKUPS = Counter(
+    "location_alias_lookups_total",
+    "Alias to canonical city id lookups by where they were resolved",
+    ["source"],
+)
+LOCATION_ALIASES_PER_CITY = Gauge(
+    "location_aliases_per_city",
+    "Known query aliases per canonical city (cache entries merged per city)",
+)
+
+# Upstream micro-batching
+UPSTREAM_GROUP_BATCH_SIZE = Histogram(
+    "upstream_group_batch_size",
+    "Cities fetched per micro-batched current weather call",
+    buckets=(1, 2, 3, 5, 10, 15, 20),
+)
+
+# Popularity-driven cache refresh
+CACHE_REFRESHER_REFRESHES = Counter(
+    "cache_refresher_refreshes_total",
+    "Popular cache entries refreshed ahead of expiry",
+    ["namespace", "outcome"],
+)
+CACHE_REFRESHER_PREVENTED_MISSES = Counter(
+    "cache_refresher_prevented_misses_total",
+    "User lookups served by a proactive refresh that would otherwise have missed",
+    ["namespace"],
+)
+CACHE_REFRESHER_TRACKED_KEYS = Gauge(
+    "cache_refresher_tracked_keys",
+    "Cache keys monitored by the popularity sketch",
+)
+
+# Adaptive cache TTLs
+CACHE_TTL_ASSIGNED = Histogram(
+    "cache_ttl_assigned_seconds",
+    "Fresh TTL assigned to weather cache entries",
+    ["namespace"],
+    buckets=(30, 60, 120, 300, 600, 900, 1200, 1800, 3600, 7200, 10800),
+)
+CACHE_OBSERVATION_AGE = Histogram(
+    "cache_observation_age_seconds",
+    "Age of upstream data when it was cached",
+    ["namespace"],
+    buckets=(60, 300, 600, 900, 1200, 1800, 3600, 7200, 10800, 21600),
+)
+CACHE_TTL_CLAMPED = Counter(
+    "cache_ttl_clamped_total",
+    "Cache TTLs that fell back to a bound or the default",
+    ["namespace", "bound"],
+)
+
+# Two-tier cache
+CACHE_TIER_LOOKUPS = Counter(
+    "cache_tier_lookups_total",
+    "Cache lookups by tier (l1 in-process, redis) and result",
+    ["tier", "result"],
+)
+CACHE_L1_EVICTIONS = Counter(
+    "cache_l1_evictions_total",
+    "Entries removed from the in-process cache (capacity, expired, invalidated)",
+    ["reason"],
+)
+CACHE_L1_SIZE = Gauge(
+    "cache_l1_size",
+    "In-process cache size in entries and approximate bytes",
+    ["unit"],
+)
+
+# Cache backend availability
+CACHE_BACKEND_ACTIVE = Gauge(
+    "cache_backend_active",
+    "Active cache backend (1 for redis, memory fallback or none)",
+    ["backend"],
+)
+CACHE_BACKEND_SWITCHES = Counter(
+    "cache_backend_switches_total",
+    "Switches of the active cache backend, by backend switched to",
+    ["backend"],
+)
+CACHE_RECONNECT_ATTEMPTS = Counter(
+    "cache_redis_reconnect_attempts_total",
+    "Background Redis reconnection attempts",
+    ["outcome"],
+)
+
+# Redis client-side caching
+CACHE_TRACKING_ACTIVE = Gauge(
+    "cache_client_tracking_active",
+    "Whether Redis client-side caching invalidations are being received",
+)
+CACHE_TRACKING_INVALIDATIONS = Counter(
+    "cache_client_tracking_invalidations_total",
+    "Invalidations pushed by Redis client-side caching (single keys or full flushes)",
+    ["kind"],
+)
+
+# Cache administration
+CACHE_PURGE_DURATION = Histogram(
+    "cache_purge_duration_seconds",
+    "Time taken by cache purges (tag, location) and namespace version bumps",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+CACHE_PURGED_KEYS = Counter(
+    "cache_purged_keys_total",
+    "Cache keys deleted by tag purges",
+    ["operation"],
+)
+
+# Negative caching of unknown cities and timezones
+CACHE_NEGATIVE_LOOKUPS = Counter(
+    "cache_negative_lookups_total",
+    "Negative cache lookups; hits are upstream calls (or lookups) saved",
+    ["namespace", "result"],
+)
+CACHE_NEGATIVE_STORES = Counter(
+    "cache_negative_stores_total",
+    "Failed lookups stored in the negative cache",
+    ["namespace"],
+)
+CACHE_NEGATIVE_EVICTIONS = Counter(
+    "cache_negative_evictions_total",
+    "Negative cache entries dropped because the namespace was full",
+    ["namespace"],
+)
+CACHE_NEGATIVE_REJECTIONS = Counter(
+    "cache_negative_rejections_total",
+    "Names rejected in-process as invalid, before any cache or upstream lookup",
+    ["namespace"],
+)
+
+# Cache operations per namespace (weather-current, weather-forecast, timezone)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by namespace and result, whichever tier served them",
+    ["namespace", "result"],
+)
+CACHE_ERRORS = Counter(
+    "cache_errors_total",
+    "Cache operations that failed",
+    ["namespace", "operation"],
+)
+CACHE_OPERATION_DURATION = Histogram(
+    "cache_operation_duration_seconds",
+    "Cache backend round-trip time; bulk operations count under their first key's namespace",
+    ["namespace", "operation"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+CACHE_VALUE_SIZE = Histogram(
+    "cache_value_size_bytes",
+    "Stored (encoded) size of cache values read and written",
+    ["namespace", "operation"],
+    buckets=(128, 256, 512, 1024, 2048, 4096, 8192, 16384, 65536, 262144, 1048576),
+)
+
+# Cache snapshots for warm starts
+CACHE_SNAPSHOT_DURATION = Histogram(
+    "cache_snapshot_duration_seconds",
+    "Time taken to save a cache snapshot or to load one at startup",
+    ["operation"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+CACHE_SNAPSHOT_ENTRIES = Counter(
+    "cache_snapshot_entries_total",
+    "Snapshot entries written, and restored, expired, invalid or already present when loaded",
+    ["operation", "result"],
+)
+APP_STARTUP_DURATION = Gauge(
+    "app_startup_duration_seconds",
+    "Time from the start of startup until the app took traffic",
+)
@@ -1,5 +1,6 @@
 """Main FastAPI application module."""
 import logging
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -10,10 +11,14 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
-from app.api.v1 import combined, timezone, weather
+from app.api.v1 import admin, combined, timezone, weather
 from app.core.config import settings
 from app.core.logging_config import setup_logging
+from app.core.metrics import APP_STARTUP_DURATION
 from app.services.cache import cache_service
+from app.services.cache_refresher import cache_refresher
+from app.services.cache_snapshot import cache_snapshotter
+from app.services.http_client import upstream_client
 
 # Setup logging
 setup_logging()
@@ -27,9 +32,19 @@ limiter = Limiter(key_func=get_remote_address)
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     logger.info("Starting up Timezone Weather API...")
+    started = time.perf_counter()
     await cache_service.connect()
+    # Seed the cache before taking traffic, so a restart does not stampede the upstream
+    await cache_snapshotter.load()
+    await upstream_client.start()
+    cache_refresher.start()
+    cache_snapshotter.start()
+    APP_STARTUP_DURATION.set(time.perf_counter() - started)
     yield
     logger.info("Shutting down Timezone Weather API...")
+    await cache_snapshotter.stop()
+    await cache_refresher.stop()
+    await upstream_client.close()
     await cache_service.disconnect()
 
 
@@ -63,6 +78,7 @@ Instrumentator().instrument(app).expose(app)
 app.include_router(timezone.router, prefix="/api/v1", tags=["Timezone"])
 app.include_router(weather.router, prefix="/api/v1", tags=["Weather"])
 app.include_router(combined.router, prefix="/api/v1", tags=["Combined"])
+app.include_router(admin.router, prefix="/api/v1", tags=["Admin"])
 
 
 @app.get("/", include_in_schema=False)
@@ -77,6 +93,7 @@ async def root():
             "health": "/health",
             "timezone": "/api/v1/timezone/{timezone}",
             "current_weather": "/api/v1/weather/current",
+            "current_weather_batch": "/api/v1/weather/current/batch",
             "forecast": "/api/v1/weather/forecast",
             "combined": "/api/v1/timezone-weather",
         },
@@ -86,10 +103,12 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    redis_status = "healthy" if await cache_service.ping() else "unhealthy"
+    backend = cache_service.backend
+    redis_status = "healthy" if backend == "redis" and await cache_service.ping() else "unhealthy"
     return {
         "status": "healthy",
         "redis": redis_status,
+        "cache_backend": backend,
         "version": settings.APP_VERSION,
     }
 
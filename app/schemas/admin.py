@@ -0,0 +1,20 @@
+"""Admin data schemas."""
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class NamespaceBumpResponse(BaseModel):
+    """Response for a cache namespace version bump."""
+
+    namespace: str = Field(..., description="Cache namespace (e.g., 'weather:forecast')")
+    version: int = Field(..., description="New namespace version")
+    duration_ms: float = Field(..., description="Time taken in milliseconds")
+
+
+class CachePurgeResponse(BaseModel):
+    """Response for a tag or location cache purge."""
+
+    tags: List[str] = Field(..., description="Tags purged")
+    purged_keys: int = Field(..., description="Number of cache keys deleted")
+    duration_ms: float = Field(..., description="Time taken in milliseconds")
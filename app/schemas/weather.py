@@ -1,8 +1,10 @@
 """Weather data schemas."""
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+
 
 class CurrentWeatherResponse(BaseModel):
     """Response for current weather data."""
@@ -15,7 +17,7 @@ class CurrentWeatherResponse(BaseModel):
     condition: str = Field(..., description="Main weather condition")
     wind_speed: float = Field(..., description="Wind speed")
     timestamp: str = Field(..., description="Data timestamp in ISO format")
-    units: str = Field(..., description="Temperature units (metric or imperial)")
+    units: str = Field(..., description="Temperature units (metric, imperial or standard)")
     witty_message: str = Field(..., description="Humorous weather message")
 
     class Config:
@@ -79,4 +81,52 @@ class ForecastResponse(BaseModel):
                     }
                 ],
             }
-        }
\ No newline at end of file
+        }
+
+
+class BatchLocation(BaseModel):
+    """A location in a batch weather request."""
+
+    city: str = Field(..., min_length=1, description="City name")
+    country_code: Optional[str] = Field(None, description="ISO 3166 country code")
+
+
+class BatchWeatherRequest(BaseModel):
+    """Request for current weather in several locations."""
+
+    locations: List[BatchLocation] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.WEATHER_BATCH_MAX_ITEMS,
+        description="Locations to fetch",
+    )
+    units: str = Field(
+        "metric", pattern="^(metric|imperial|standard)$", description="Temperature units"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "locations": [
+                    {"city": "London", "country_code": "GB"},
+                    {"city": "Tokyo", "country_code": "JP"},
+                ],
+                "units": "metric",
+            }
+        }
+
+
+class BatchWeatherItem(BaseModel):
+    """Per-location result of a batch weather request."""
+
+    city: str = Field(..., description="Requested city name")
+    country_code: Optional[str] = Field(None, description="Requested country code")
+    status: str = Field(..., description="'ok' or 'error'")
+    weather: Optional[CurrentWeatherResponse] = Field(None, description="Current weather data")
+    error: Optional[str] = Field(None, description="Error message if the lookup failed")
+
+
+class BatchWeatherResponse(BaseModel):
+    """Response for a batch weather request."""
+
+    results: List[BatchWeatherItem] = Field(..., description="Results in request order")
@@ -1,39 +1,589 @@
-"""Redis cache service."""
+"""Redis cache service with an in-process L1 tier."""
+import asyncio
 import logging
-from typing import Optional
+import time
+import uuid
+from collections import OrderedDict
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from app.core.config import settings
+from app.core.metrics import (
+    CACHE_BACKEND_ACTIVE,
+    CACHE_BACKEND_SWITCHES,
+    CACHE_ERRORS,
+    CACHE_L1_EVICTIONS,
+    CACHE_L1_SIZE,
+    CACHE_LOOKUPS,
+    CACHE_OPERATION_DURATION,
+    CACHE_PURGE_DURATION,
+    CACHE_PURGED_KEYS,
+    CACHE_RECONNECT_ATTEMPTS,
+    CACHE_TIER_LOOKUPS,
+    CACHE_TRACKING_ACTIVE,
+    CACHE_TRACKING_INVALIDATIONS,
+    CACHE_VALUE_SIZE,
+)
+from app.services.cache_codec import CacheCodec
+from app.services.memory_backend import MemoryBackend
+from app.services.resilience import Backoff
 
 logger = logging.getLogger(__name__)
 
+# Channel Redis publishes client-side caching invalidations on (RESP2)
+TRACKING_CHANNEL = "__redis__:invalidate"
+
+# Hash of namespace -> version; bumping a version invalidates the namespace
+VERSIONS_KEY = "cache:versions"
+
+# Sorted sets of the keys stored with a tag, scored by expiry (Unix time)
+TAG_KEY_PREFIX = "cache:tag:"
+
+# Newline-separated tags of a tagged key, expiring with it, so snapshots keep them
+KEY_TAGS_PREFIX = "cache:tags:"
+
+# Keys deleted per round-trip when purging a tag
+PURGE_BATCH_SIZE = 500
+
+# Namespace -> label of its metrics; keys of other namespaces are "other"
+METRIC_NAMESPACES = {
+    "weather:current": "weather-current",
+    "weather:forecast": "weather-forecast",
+    "timezone": "timezone",
+}
+
+OPERATIONS = ("get", "get_many", "set", "set_many", "delete", "delete_many")
+
+
+class CacheUnavailableError(Exception):
+    """Raised when a cache administration command cannot reach the cache."""
+
+
+def _is_outage(error: Exception) -> bool:
+    """Whether a Redis error means the server cannot be reached in time.
+
+    This includes waiting longer than REDIS_POOL_TIMEOUT for a connection,
+    which is how a hanging connect surfaces; while the pool is exhausted the
+    fallback sheds the load from Redis too.
+    """
+    return isinstance(error, (RedisConnectionError, RedisTimeoutError, OSError))
+
+
+def _text(value: Optional[Union[bytes, str]]) -> Optional[str]:
+    """Decode a reply that may be bytes."""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class _NamespaceMetrics:
+    """Metric children of one namespace label.
+
+    Resolved once per label, since ``labels()`` takes a lock and builds a
+    key on every call.
+    """
+
+    _by_label: Dict[str, "_NamespaceMetrics"] = {}
+
+    def __init__(self, label: str):
+        self.hit = CACHE_LOOKUPS.labels(label, "hit")
+        self.miss = CACHE_LOOKUPS.labels(label, "miss")
+        self.duration = {op: CACHE_OPERATION_DURATION.labels(label, op) for op in OPERATIONS}
+        self.errors = {op: CACHE_ERRORS.labels(label, op) for op in OPERATIONS}
+        self.size = {op: CACHE_VALUE_SIZE.labels(label, op) for op in ("get", "set")}
+
+    @classmethod
+    def for_label(cls, label: str) -> "_NamespaceMetrics":
+        metrics = cls._by_label.get(label)
+        if metrics is None:
+            metrics = cls._by_label[label] = cls(label)
+        return metrics
+
+
+class _LocalEntry:
+    """Value held by the in-process tier."""
+
+    __slots__ = ("value", "size", "expires_at", "store_expires_at")
+
+    def __init__(
+        self, value: str, size: int, expires_at: float, store_expires_at: Optional[float]
+    ):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.store_expires_at = store_expires_at
+
+
+class LocalCache:
+    """Bounded in-process LRU cache in front of Redis.
+
+    Entries are bounded by count and by approximate size (key plus value
+    length) and are evicted least recently used first. Each entry lives at
+    most ``max_ttl`` seconds and never past the Redis TTL it was stored or
+    read with, whose remaining time is reported on reads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        max_ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_ttl = max_ttl
+        self.clock = clock
+        self.bytes = 0
+        self._entries: "OrderedDict[str, _LocalEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Tuple[str, int]]:
+        """Return a value and its remaining Redis TTL, if held and unexpired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (value, remaining TTL in seconds, -1 without expiry) or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            CACHE_TIER_LOOKUPS.labels("l1", "miss").inc()
+            return None
+
+        now = self.clock()
+        if entry.expires_at <= now:
+            self._remove(key, "expired")
+            CACHE_TIER_LOOKUPS.labels("l1", "miss").inc()
+            return None
+
+        self._entries.move_to_end(key)
+        CACHE_TIER_LOOKUPS.labels("l1", "hit").inc()
+        if entry.store_expires_at is None:
+            return entry.value, -1
+        return entry.value, max(int(entry.store_expires_at - now), 0)
+
+    def put(self, key: str, value: str, ttl: int, max_ttl: Optional[float] = None):
+        """Hold a value read from or written to Redis.
+
+        Args:
+            key: Cache key
+            value: Cached value
+            ttl: Remaining Redis TTL in seconds (-1 without expiry)
+            max_ttl: Cap on the local TTL instead of ``self.max_ttl``
+        """
+        if ttl == 0 or ttl < -1 or self.max_entries <= 0:
+            return
+
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            self.discard(key, "capacity")
+            return
+
+        now = self.clock()
+        store_expires_at = now + ttl if ttl > 0 else None
+        cap = self.max_ttl if max_ttl is None else max_ttl
+        local_ttl = min(ttl, cap) if ttl > 0 else cap
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous.size
+        self._entries[key] = _LocalEntry(value, size, now + local_ttl, store_expires_at)
+        self.bytes += size
+
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest, "capacity")
+
+    def discard(self, key: str, reason: str = "invalidated"):
+        """Drop a key if held.
+
+        Args:
+            key: Cache key
+            reason: Eviction reason reported in metrics
+        """
+        if key in self._entries:
+            self._remove(key, reason)
+
+    def clear(self):
+        """Drop every entry."""
+        self._entries.clear()
+        self.bytes = 0
+
+    def recent(self, limit: int) -> List[str]:
+        """Return up to ``limit`` keys, most recently used first."""
+        return list(islice(reversed(self._entries), limit))
+
+    def _remove(self, key: str, reason: str):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        CACHE_L1_EVICTIONS.labels(reason).inc()
+
 
 class CacheService:
-    """Redis cache service for caching API responses."""
+    """Redis cache service for caching API responses.
+
+    When given a LocalCache, reads are served from it before going to Redis,
+    and values read from or written to Redis are kept in it. With
+    ``invalidation_channel`` set, every write and delete is published on that
+    channel and other workers drop their local copy of the key.
 
-    def __init__(self):
+    Values are stored as bytes encoded by ``codec``; the API takes and
+    returns text. Hash fields are stored as plain text.
+
+    With ``tracking_prefixes``, Redis client-side caching tracks every key
+    with those prefixes (``CLIENT TRACKING ... BCAST``) and pushes
+    invalidations to a dedicated connection. Local copies of tracked keys
+    are then held for their full Redis TTL instead of the local tier's.
+
+    While Redis is unreachable, at startup or after a connection error,
+    commands go to the ``fallback`` in-process backend (or caching is off
+    without one) and a background loop reconnects with ``reconnect_backoff``.
+
+    Keys are ``<namespace>:<id>``. Bumping a namespace's version (kept in
+    Redis and re-read every ``version_sync_interval`` seconds) moves all of
+    its keys to a new physical prefix, so old entries are never read again
+    and expire on their own. Entries written with tags are indexed in one
+    sorted set per tag for ``purge_tag``, scored by expiry time; every write
+    to a tag drops its expired members, and the set lives at least
+    ``tag_ttl`` seconds past its last write. The tags of each entry are also
+    kept next to it, so that snapshots can restore them.
+    """
+
+    def __init__(
+        self,
+        local: Optional[LocalCache] = None,
+        invalidation_channel: Optional[str] = None,
+        codec: Optional[CacheCodec] = None,
+        fallback: Optional[MemoryBackend] = None,
+        reconnect_backoff: Optional[Backoff] = None,
+        tracking_prefixes: Sequence[str] = (),
+        version_sync_interval: float = 5.0,
+        tag_ttl: int = 86400,
+    ):
         self.redis_client: Optional[redis.Redis] = None
+        self.local = local
+        self.codec = codec or CacheCodec()
+        self.invalidation_channel = invalidation_channel if local is not None else None
+        self.fallback = fallback
+        self.reconnect_backoff = reconnect_backoff or Backoff(0.5, 30.0)
+        self._primary: Optional[redis.Redis] = None
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._reconnector: Optional[asyncio.Task] = None
+        self.tracking_prefixes = tuple(tracking_prefixes) if local is not None else ()
+        self.tracking = False
+        # Bumped on every tracking invalidation; reads that overlap one are
+        # not trusted to be tracked
+        self._tracking_epoch = 0
+        self._tracker: Optional[asyncio.Task] = None
+        self.version_sync_interval = version_sync_interval
+        self.tag_ttl = tag_ttl
+        self._versions: Dict[str, int] = {}
+        self._version_sync: Optional[asyncio.Task] = None
+        # Key prefix (with any namespace version) -> metrics
+        self._namespace_metrics: Dict[str, _NamespaceMetrics] = {}
 
-    async def connect(self):
-        """Connect to Redis."""
-        try:
-            self.redis_client = redis.from_url(
+    @property
+    def backend(self) -> str:
+        """Active backend: "redis", "memory" (in-process fallback) or "none"."""
+        if self.redis_client is None:
+            return "none"
+        if self.redis_client is self.fallback:
+            return "memory"
+        return "redis"
+
+    async def connect(self, client: Optional[redis.Redis] = None):
+        """Connect to Redis, falling back to the in-process backend if unreachable.
+
+        Args:
+            client: Redis client to use instead of one built from settings
+        """
+        if client is None:
+            pool = redis.BlockingConnectionPool.from_url(
                 settings.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
             )
-            await self.redis_client.ping()
-            logger.info("Connected to Redis successfully")
+            client = redis.Redis(connection_pool=pool)
+        self._primary = client
+        try:
+            await self._primary.ping()
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
-            self.redis_client = None
+            self._fail_over()
+            return
+
+        logger.info("Connected to Redis successfully")
+        self._use_primary()
 
     async def disconnect(self):
         """Disconnect from Redis."""
-        if self.redis_client:
-            await self.redis_client.close()
+        for task in (self._reconnector, self._listener, self._tracker, self._version_sync):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._reconnector = self._listener = self._tracker = self._version_sync = None
+        if self._primary is not None:
+            await self._primary.close()
             logger.info("Disconnected from Redis")
+        self._primary = self.redis_client = None
+
+    def _use_primary(self):
+        """Route commands to Redis."""
+        self.redis_client = self._primary
+        CACHE_BACKEND_SWITCHES.labels("redis").inc()
+        if self.fallback is not None:
+            self.fallback.clear()
+        if self.invalidation_channel:
+            # Invalidations published while disconnected were missed
+            self.local.clear()
+            self._listener = asyncio.create_task(self._listen_for_invalidations())
+        if self.tracking_prefixes and hasattr(self._primary, "connection_pool"):
+            self._tracker = asyncio.create_task(self._track_invalidations())
+        self._version_sync = asyncio.create_task(self._sync_versions())
+
+    def _fail_over(self):
+        """Route commands to the fallback backend and start reconnecting."""
+        self.redis_client = self.fallback
+        CACHE_BACKEND_SWITCHES.labels(self.backend).inc()
+        logger.warning(f"Redis unavailable, cache backend is now: {self.backend}")
+        if self._reconnector is None or self._reconnector.done():
+            self._reconnector = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self):
+        """Ping Redis with backoff until it answers, then switch back to it."""
+        attempt = 0
+        while True:
+            await asyncio.sleep(self.reconnect_backoff.delay(attempt))
+            try:
+                await self._primary.ping()
+            except Exception as e:
+                CACHE_RECONNECT_ATTEMPTS.labels("failure").inc()
+                logger.debug(f"Redis reconnect attempt {attempt + 1} failed: {e}")
+                attempt += 1
+                continue
+            CACHE_RECONNECT_ATTEMPTS.labels("success").inc()
+            logger.info(f"Reconnected to Redis after {attempt + 1} attempts")
+            self._use_primary()
+            return
+
+    def _handle_error(self, error: Exception):
+        """Fail over when a Redis command failed because the server is unreachable."""
+        if self.backend != "redis" or not _is_outage(error):
+            return
+        for task in (self._listener, self._tracker, self._version_sync):
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        self._listener = self._tracker = self._version_sync = None
+        self._fail_over()
+
+    async def _track_invalidations(self):
+        """Enable client-side caching and apply the invalidations Redis sends.
+
+        Uses RESP2 redirect mode: one connection subscribes to the
+        invalidation channel, and a second enables broadcast tracking of the
+        configured prefixes with invalidations redirected to the first. Both
+        are kept out of the pool, since tracking ends when they close.
+        """
+        pool = self._primary.connection_pool
+        # The receiver idles between invalidations, so it has no read timeout
+        receiver = pool.connection_class(**{**pool.connection_kwargs, "socket_timeout": None})
+        control = pool.connection_class(**pool.connection_kwargs)
+        try:
+            await receiver.send_command("CLIENT", "ID")
+            receiver_id = await receiver.read_response()
+            await receiver.send_command("SUBSCRIBE", TRACKING_CHANNEL)
+            await receiver.read_response()
+            prefixes = [arg for prefix in self.tracking_prefixes for arg in ("PREFIX", prefix)]
+            await control.send_command(
+                "CLIENT", "TRACKING", "ON", "REDIRECT", receiver_id, "BCAST", *prefixes
+            )
+            await control.read_response()
+
+            self.tracking = True
+            logger.info(f"Client-side caching enabled for: {', '.join(self.tracking_prefixes)}")
+            while True:
+                message = await receiver.read_response()
+                if message[0] in (b"message", "message"):
+                    self._apply_tracking_invalidation(message[2])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Client-side caching stopped: {e}")
+            self._handle_error(e)
+        finally:
+            if self.tracking:
+                self.tracking = False
+                # Tracked copies may have missed invalidations
+                self.local.clear()
+            await receiver.disconnect()
+            await control.disconnect()
+
+    def _apply_tracking_invalidation(self, keys: Optional[List[Union[bytes, str]]]):
+        """Drop local copies of keys Redis reports as changed (None: all keys)."""
+        self._tracking_epoch += 1
+        if keys is None:
+            CACHE_TRACKING_INVALIDATIONS.labels("flush").inc()
+            self.local.clear()
+            return
+        for key in keys:
+            CACHE_TRACKING_INVALIDATIONS.labels("key").inc()
+            self.local.discard(_text(key), "tracking")
+
+    async def _sync_versions(self):
+        """Re-read namespace versions bumped by other workers."""
+        while True:
+            try:
+                versions = await self.redis_client.hgetall(VERSIONS_KEY)
+                self._versions = {_text(ns): int(version) for ns, version in versions.items()}
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache namespace version sync failed: {e}")
+                if _is_outage(e):
+                    self._handle_error(e)
+                    return
+            await asyncio.sleep(self.version_sync_interval)
+
+    def _physical(self, key: str) -> str:
+        """Key as stored: the current namespace version precedes the id."""
+        namespace, _, rest = key.rpartition(":")
+        version = self._versions.get(namespace)
+        return f"{namespace}:v{version}:{rest}" if version else key
+
+    def _hold(self, key: str, value: str, ttl: int, epoch: int):
+        """Keep a value in the local tier.
+
+        Tracked keys are held for their full Redis TTL, unless an
+        invalidation arrived since ``epoch`` (taken before the Redis call)
+        and could have been for this value.
+        """
+        if self.local is None:
+            return
+        tracked = (
+            self.tracking
+            and epoch == self._tracking_epoch
+            and key.startswith(self.tracking_prefixes)
+        )
+        self.local.put(key, value, ttl, max_ttl=float("inf") if tracked else None)
+
+    async def _listen_for_invalidations(self):
+        """Drop local copies of keys written or deleted by other workers."""
+        pool = getattr(self.redis_client, "connection_pool", None)
+        subscriber_pool = None
+        if pool is not None:
+            # The subscriber idles between invalidations, so it has no read timeout
+            subscriber_pool = redis.ConnectionPool(
+                connection_class=pool.connection_class,
+                max_connections=1,
+                **{**pool.connection_kwargs, "socket_timeout": None},
+            )
+            pubsub = redis.Redis(connection_pool=subscriber_pool).pubsub()
+        else:
+            pubsub = self.redis_client.pubsub()
+        try:
+            await pubsub.subscribe(self.invalidation_channel)
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                origin, _, key = _text(message["data"]).partition(" ")
+                if origin != self._origin:
+                    self.local.discard(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if _is_outage(e):
+                # Restarted, with the local tier cleared, once Redis is back
+                logger.error(f"Cache invalidation listener lost Redis: {e}")
+                self._handle_error(e)
+                return
+            # Without invalidations local copies could outlive remote writes
+            logger.error(f"Cache invalidation listener failed, local cache disabled: {e}")
+            self.local.clear()
+            self.local.max_entries = 0
+        finally:
+            try:
+                await pubsub.aclose()
+                if subscriber_pool is not None:
+                    await subscriber_pool.disconnect()
+            except Exception:
+                pass
+
+    async def _write(
+        self, key: str, data: Optional[bytes], ttl: int, tags: Sequence[str] = ()
+    ):
+        """SETEX of encoded data (or DEL when None), indexing tags and publishing invalidations."""
+        if not self.invalidation_channel and not tags:
+            if data is None:
+                await self.redis_client.delete(key)
+            else:
+                await self.redis_client.setex(key, ttl, data)
+            return
+
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            if data is None:
+                pipe.delete(key)
+            else:
+                pipe.setex(key, ttl, data)
+            if tags:
+                pipe.setex(f"{KEY_TAGS_PREFIX}{key}", ttl, "\n".join(tags))
+                self._index_tags(pipe, key, ttl, tags)
+            self._publish_invalidations(pipe, [key])
+            await pipe.execute()
+
+    def _index_tags(self, pipe, key: str, ttl: int, tags: Sequence[str], extend_only=False):
+        """Queue adding a key to the indexes of its tags, dropping their expired members.
+
+        With ``extend_only``, an index entry is never moved to an earlier expiry.
+        """
+        now = time.time()
+        for tag in tags:
+            tag_key = f"{TAG_KEY_PREFIX}{tag}"
+            pipe.zremrangebyscore(tag_key, "-inf", now)
+            pipe.zadd(tag_key, {key: now + ttl}, gt=extend_only)
+            pipe.expire(tag_key, max(ttl, self.tag_ttl))
+
+    def _publish_invalidations(self, pipe, keys):
+        """Queue invalidation messages for ``keys`` on a pipeline."""
+        if self.invalidation_channel:
+            for key in keys:
+                pipe.publish(self.invalidation_channel, f"{self._origin} {key}")
+
+    def _metrics(self, key: str) -> "_NamespaceMetrics":
+        """Metrics of the namespace a (physical) key belongs to."""
+        prefix = key.rpartition(":")[0]
+        metrics = self._namespace_metrics.get(prefix)
+        if metrics is None:
+            namespace, _, version = prefix.rpartition(":")
+            if not (namespace and version[:1] == "v" and version[1:].isdigit()):
+                namespace = prefix
+            label = METRIC_NAMESPACES.get(namespace, "other")
+            metrics = _NamespaceMetrics.for_label(label)
+            if label != "other":
+                # Bounded by the known namespaces and their versions
+                self._namespace_metrics[prefix] = metrics
+        return metrics
+
+    def _decode(self, key: str, data: Optional[bytes]) -> Optional[str]:
+        """Decode a value read from the backend, counting the lookup."""
+        metrics = self._metrics(key)
+        CACHE_TIER_LOOKUPS.labels(self.backend, "miss" if data is None else "hit").inc()
+        if data is None:
+            metrics.miss.inc()
+            return None
+        metrics.hit.inc()
+        metrics.size["get"].observe(len(data))
+        return self.codec.decode(data)
 
     async def get(self, key: str) -> Optional[str]:
         """Get value from cache.
@@ -44,23 +594,159 @@ class CacheService:
         Returns:
             Cached value or None
         """
+        key = self._physical(key)
+        if self.local is not None:
+            return (await self._get_with_ttl(key))[0]
+
         if not self.redis_client:
+            self._metrics(key).miss.inc()
             return None
 
+        started = time.perf_counter()
         try:
-            value = await self.redis_client.get(key)
-            return value
+            data = await self.redis_client.get(key)
+            self._metrics(key).duration["get"].observe(time.perf_counter() - started)
+            return self._decode(key, data)
         except Exception as e:
             logger.error(f"Cache get error: {e}")
+            self._metrics(key).errors["get"].inc()
+            self._handle_error(e)
             return None
 
-    async def set(self, key: str, value: str, ttl: int = 3600) -> bool:
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[str], int]:
+        """Get value from cache together with its remaining time to live.
+
+        Both are read in a single pipelined round-trip.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of cached value (or None) and remaining TTL in seconds
+            (negative if the key is missing or has no expiry)
+        """
+        return await self._get_with_ttl(self._physical(key))
+
+    async def _get_with_ttl(self, key: str) -> Tuple[Optional[str], int]:
+        if self.local is not None:
+            held = self.local.get(key)
+            if held is not None:
+                self._metrics(key).hit.inc()
+                return held
+
+        if not self.redis_client:
+            self._metrics(key).miss.inc()
+            return None, -2
+
+        epoch = self._tracking_epoch
+        started = time.perf_counter()
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                data, ttl = await pipe.get(key).ttl(key).execute()
+            self._metrics(key).duration["get"].observe(time.perf_counter() - started)
+            value = self._decode(key, data)
+            if value is not None:
+                self._hold(key, value, ttl, epoch)
+            return value, ttl
+        except Exception as e:
+            logger.error(f"Cache get error: {e}")
+            self._metrics(key).errors["get"].inc()
+            self._handle_error(e)
+            return None, -2
+
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """Get several values in a single round-trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached values (None for misses) in the order of ``keys``
+        """
+        keys = [self._physical(key) for key in keys]
+        if self.local is not None:
+            return [value for value, _ in await self._get_many_with_ttl(keys)]
+
+        if not keys:
+            return []
+        if not self.redis_client:
+            for key in keys:
+                self._metrics(key).miss.inc()
+            return [None] * len(keys)
+
+        started = time.perf_counter()
+        try:
+            replies = await self.redis_client.mget(keys)
+            self._metrics(keys[0]).duration["get_many"].observe(time.perf_counter() - started)
+            return [self._decode(key, data) for key, data in zip(keys, replies)]
+        except Exception as e:
+            logger.error(f"Cache get_many error: {e}")
+            self._metrics(keys[0]).errors["get_many"].inc()
+            self._handle_error(e)
+            return [None] * len(keys)
+
+    async def get_many_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[str], int]]:
+        """Get several values and their remaining TTLs in a single round-trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            (value, remaining TTL) tuples in the order of ``keys``, as returned
+            by ``get_with_ttl``
+        """
+        return await self._get_many_with_ttl([self._physical(key) for key in keys])
+
+    async def _get_many_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[str], int]]:
+        results: List[Optional[Tuple[Optional[str], int]]] = [None] * len(keys)
+        if self.local is not None:
+            for index, key in enumerate(keys):
+                results[index] = self.local.get(key)
+                if results[index] is not None:
+                    self._metrics(key).hit.inc()
+        missing = [index for index, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        if not self.redis_client:
+            for index in missing:
+                self._metrics(keys[index]).miss.inc()
+            return [result or (None, -2) for result in results]
+
+        epoch = self._tracking_epoch
+        started = time.perf_counter()
+        first = keys[missing[0]]
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for index in missing:
+                    pipe.get(keys[index]).ttl(keys[index])
+                replies = await pipe.execute()
+            self._metrics(first).duration["get_many"].observe(time.perf_counter() - started)
+            values = [
+                self._decode(keys[index], data) for index, data in zip(missing, replies[::2])
+            ]
+        except Exception as e:
+            logger.error(f"Cache get_many error: {e}")
+            self._metrics(first).errors["get_many"].inc()
+            self._handle_error(e)
+            return [result or (None, -2) for result in results]
+
+        for index, value, ttl in zip(missing, values, replies[1::2]):
+            if value is not None:
+                self._hold(keys[index], value, ttl, epoch)
+            results[index] = (value, ttl)
+        return results
+
+    async def set(
+        self, key: str, value: str, ttl: int = 3600, tags: Sequence[str] = ()
+    ) -> bool:
         """Set value in cache.
 
         Args:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds
+            tags: Tags to index the key under, for ``purge_tag``
 
         Returns:
             True if successful, False otherwise
@@ -68,13 +754,26 @@ class CacheService:
         if not self.redis_client:
             return False
 
+        key = self._physical(key)
+        metrics = self._metrics(key)
+        data = self.codec.encode(value)
+        metrics.size["set"].observe(len(data))
+        epoch = self._tracking_epoch
+        started = time.perf_counter()
         try:
-            await self.redis_client.setex(key, ttl, value)
-            return True
+            await self._write(key, data, ttl, tags)
         except Exception as e:
             logger.error(f"Cache set error: {e}")
+            metrics.errors["set"].inc()
+            self._handle_error(e)
+            if self.local is not None:
+                self.local.discard(key)
             return False
 
+        metrics.duration["set"].observe(time.perf_counter() - started)
+        self._hold(key, value, ttl, epoch)
+        return True
+
     async def delete(self, key: str) -> bool:
         """Delete key from cache.
 
@@ -84,15 +783,436 @@ class CacheService:
         Returns:
             True if successful, False otherwise
         """
+        key = self._physical(key)
+        if self.local is not None:
+            self.local.discard(key)
+
         if not self.redis_client:
             return False
 
+        started = time.perf_counter()
         try:
-            await self.redis_client.delete(key)
-            return True
+            await self._write(key, None, 0)
         except Exception as e:
             logger.error(f"Cache delete error: {e}")
+            self._metrics(key).errors["delete"].inc()
+            self._handle_error(e)
+            return False
+        self._metrics(key).duration["delete"].observe(time.perf_counter() - started)
+        return True
+
+    async def set_many(self, items: Dict[str, Tuple[str, int]]) -> bool:
+        """Set several values, each with its own TTL, in a single round-trip.
+
+        Args:
+            items: Mapping of cache key to (value, time to live in seconds)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.redis_client:
+            return False
+        if not items:
+            return True
+
+        items = {self._physical(key): item for key, item in items.items()}
+        epoch = self._tracking_epoch
+        started = time.perf_counter()
+        first = next(iter(items))
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, (value, ttl) in items.items():
+                    data = self.codec.encode(value)
+                    self._metrics(key).size["set"].observe(len(data))
+                    pipe.setex(key, ttl, data)
+                self._publish_invalidations(pipe, items)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Cache set_many error: {e}")
+            self._metrics(first).errors["set_many"].inc()
+            self._handle_error(e)
+            if self.local is not None:
+                for key in items:
+                    self.local.discard(key)
+            return False
+
+        self._metrics(first).duration["set_many"].observe(time.perf_counter() - started)
+        for key, (value, ttl) in items.items():
+            self._hold(key, value, ttl, epoch)
+        return True
+
+    async def delete_many(self, keys: List[str]) -> bool:
+        """Delete several keys in a single round-trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            True if successful, False otherwise
+        """
+        keys = [self._physical(key) for key in keys]
+        if self.local is not None:
+            for key in keys:
+                self.local.discard(key)
+
+        if not self.redis_client:
             return False
+        if not keys:
+            return True
+
+        started = time.perf_counter()
+        try:
+            if self.invalidation_channel:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.delete(*keys)
+                    self._publish_invalidations(pipe, keys)
+                    await pipe.execute()
+            else:
+                await self.redis_client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Cache delete_many error: {e}")
+            self._metrics(keys[0]).errors["delete_many"].inc()
+            self._handle_error(e)
+            return False
+        self._metrics(keys[0]).duration["delete_many"].observe(time.perf_counter() - started)
+        return True
+
+    async def export_entries(
+        self, keys: List[str]
+    ) -> List[Tuple[str, bytes, int, Tuple[str, ...]]]:
+        """Read entries as stored, for a snapshot.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            (key as stored, encoded value, remaining TTL in seconds, tags)
+            for every key that exists with an expiry
+        """
+        if not self.redis_client or not keys:
+            return []
+
+        keys = list(dict.fromkeys(self._physical(key) for key in keys))
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.get(key).ttl(key).get(f"{KEY_TAGS_PREFIX}{key}")
+                replies = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Cache export error: {e}")
+            self._handle_error(e)
+            return []
+
+        return [
+            (
+                key,
+                data if isinstance(data, bytes) else data.encode(),
+                ttl,
+                tuple(_text(tags).split("\n")) if tags else (),
+            )
+            for key, data, ttl, tags in zip(keys, replies[::3], replies[1::3], replies[2::3])
+            if data is not None and ttl > 0
+        ]
+
+    async def import_entries(self, entries: List[Tuple[str, bytes, int, Sequence[str]]]) -> int:
+        """Store entries read by ``export_entries`` where their keys are missing.
+
+        Keys are used as stored, so entries of namespaces bumped since the
+        export stay unreachable. Existing keys are left alone, since they
+        are at least as fresh. Entries are indexed under their tags, which
+        only ever extends the index entries of existing keys. Entries that
+        do not decode are skipped.
+
+        Args:
+            entries: (key as stored, encoded value, remaining TTL in seconds, tags)
+
+        Returns:
+            Number of entries stored
+        """
+        if not self.redis_client or not entries:
+            return 0
+
+        decoded = []
+        for key, data, ttl, tags in entries:
+            try:
+                decoded.append((key, data, ttl, tags, self.codec.decode(data)))
+            except Exception as e:
+                logger.warning(f"Cache import skipped {key}: {e}")
+        if not decoded:
+            return 0
+
+        epoch = self._tracking_epoch
+        created = []
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, data, ttl, tags, _ in decoded:
+                    # Index of the SET reply of this entry
+                    created.append(len(pipe))
+                    pipe.set(key, data, ex=ttl, nx=True)
+                    if tags:
+                        pipe.set(f"{KEY_TAGS_PREFIX}{key}", "\n".join(tags), ex=ttl, nx=True)
+                        self._index_tags(pipe, key, ttl, tags, extend_only=True)
+                replies = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Cache import error: {e}")
+            self._handle_error(e)
+            return 0
+
+        stored = 0
+        for (key, _, ttl, _, value), reply in zip(decoded, created):
+            if replies[reply]:
+                stored += 1
+                self._hold(key, value, ttl, epoch)
+        return stored
+
+    async def bump_namespace(self, namespace: str) -> int:
+        """Invalidate every key of a namespace by moving it to a new version.
+
+        Other workers pick the new version up within the version sync
+        interval.
+
+        Args:
+            namespace: Key prefix before the last ":" (e.g. "weather:current")
+
+        Returns:
+            New namespace version
+
+        Raises:
+            CacheUnavailableError: If the cache cannot be reached
+        """
+        if not self.redis_client:
+            raise CacheUnavailableError("Cache is not connected")
+
+        started = time.perf_counter()
+        try:
+            version = int(await self.redis_client.hincrby(VERSIONS_KEY, namespace, 1))
+        except Exception as e:
+            logger.error(f"Cache bump_namespace error: {e}")
+            self._handle_error(e)
+            raise CacheUnavailableError(str(e)) from e
+        self._versions[namespace] = version
+        CACHE_PURGE_DURATION.labels("namespace").observe(time.perf_counter() - started)
+        logger.info(f"Cache namespace {namespace} bumped to version {version}")
+        return version
+
+    async def purge_tag(self, tag: str, operation: str = "tag") -> int:
+        """Delete every key stored with a tag, then the tag's index.
+
+        The index is scanned and its keys deleted in batches of
+        ``PURGE_BATCH_SIZE``, so Redis is never blocked for long.
+
+        Args:
+            tag: Tag the keys were stored with
+            operation: Purge kind reported in metrics
+
+        Returns:
+            Number of keys deleted
+
+        Raises:
+            CacheUnavailableError: If the cache cannot be reached
+        """
+        if not self.redis_client:
+            raise CacheUnavailableError("Cache is not connected")
+
+        started = time.perf_counter()
+        tag_key = f"{TAG_KEY_PREFIX}{tag}"
+        deleted = 0
+        batch: List[str] = []
+        try:
+            async for key, _ in self.redis_client.zscan_iter(tag_key, count=PURGE_BATCH_SIZE):
+                batch.append(_text(key))
+                if len(batch) >= PURGE_BATCH_SIZE:
+                    deleted += await self._purge_batch(batch)
+                    batch = []
+            if batch:
+                deleted += await self._purge_batch(batch)
+            await self.redis_client.delete(tag_key)
+        except Exception as e:
+            logger.error(f"Cache purge_tag error: {e}")
+            self._handle_error(e)
+            raise CacheUnavailableError(str(e)) from e
+
+        CACHE_PURGE_DURATION.labels(operation).observe(time.perf_counter() - started)
+        CACHE_PURGED_KEYS.labels(operation).inc(deleted)
+        logger.info(f"Cache tag {tag} purged: {deleted} keys")
+        return deleted
+
+    async def _purge_batch(self, keys: List[str]) -> int:
+        """Delete keys in one round-trip, returning how many existed."""
+        if self.local is not None:
+            for key in keys:
+                self.local.discard(key)
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            self._publish_invalidations(pipe, keys)
+            replies = await pipe.execute()
+        return int(replies[0])
+
+    async def hget(self, name: str, field: str) -> Optional[str]:
+        """Get a field from a hash.
+
+        Args:
+            name: Hash key
+            field: Field name
+
+        Returns:
+            Field value or None
+        """
+        if not self.redis_client:
+            return None
+
+        try:
+            return _text(await self.redis_client.hget(name, field))
+        except Exception as e:
+            logger.error(f"Cache hget error: {e}")
+            self._handle_error(e)
+            return None
+
+    async def hmget(self, name: str, fields: List[str]) -> List[Optional[str]]:
+        """Get several fields from a hash in a single round-trip.
+
+        Args:
+            name: Hash key
+            fields: Field names
+
+        Returns:
+            Field values (None for missing fields) in the order of ``fields``
+        """
+        if not self.redis_client or not fields:
+            return [None] * len(fields)
+
+        try:
+            return [_text(value) for value in await self.redis_client.hmget(name, fields)]
+        except Exception as e:
+            logger.error(f"Cache hmget error: {e}")
+            self._handle_error(e)
+            return [None] * len(fields)
+
+    async def hset(self, name: str, field: str, value: str) -> bool:
+        """Set a field in a hash.
+
+        Args:
+            name: Hash key
+            field: Field name
+            value: Field value
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.redis_client:
+            return False
+
+        try:
+            await self.redis_client.hset(name, field, value)
+            return True
+        except Exception as e:
+            logger.error(f"Cache hset error: {e}")
+            self._handle_error(e)
+            return False
+
+    async def hset_capped(
+        self, name: str, field: str, value: str, max_size: int, ttl: int
+    ) -> Optional[int]:
+        """Set a field in a size-capped hash.
+
+        A companion sorted set, ``<name>:recent``, scores every field by when
+        it was last set; beyond ``max_size`` the least recently set fields are
+        dropped from both. Both keys expire ``ttl`` seconds after the last set.
+
+        Args:
+            name: Hash key
+            field: Field name
+            value: Field value
+            max_size: Maximum number of fields kept
+            ttl: Time to live of the hash in seconds
+
+        Returns:
+            Number of fields dropped to stay within ``max_size``, or None on error
+        """
+        if not self.redis_client:
+            return None
+
+        recent = f"{name}:recent"
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(name, field, value)
+                pipe.zadd(recent, {field: time.time()})
+                pipe.zrange(recent, 0, -(max_size + 1))
+                pipe.zremrangebyrank(recent, 0, -(max_size + 1))
+                pipe.expire(name, ttl)
+                pipe.expire(recent, ttl)
+                replies = await pipe.execute()
+            evicted = [_text(dropped) for dropped in replies[2]]
+            if evicted:
+                await self.redis_client.hdel(name, *evicted)
+            return len(evicted)
+        except Exception as e:
+            logger.error(f"Cache hset_capped error: {e}")
+            self._handle_error(e)
+            return None
+
+    async def zscore(self, name: str, member: str) -> Optional[float]:
+        """Get the score of a sorted set member.
+
+        Args:
+            name: Sorted set key
+            member: Member
+
+        Returns:
+            Score or None
+        """
+        if not self.redis_client:
+            return None
+
+        try:
+            score = await self.redis_client.zscore(name, member)
+            return float(score) if score is not None else None
+        except Exception as e:
+            logger.error(f"Cache zscore error: {e}")
+            self._handle_error(e)
+            return None
+
+    async def zadd_capped(
+        self,
+        name: str,
+        member: str,
+        score: float,
+        max_size: int,
+        ttl: int,
+        floor: float = float("-inf"),
+    ) -> Optional[int]:
+        """Add a member to a size-capped sorted set in a single round-trip.
+
+        Members scored at or below ``floor`` are dropped first, then the
+        lowest scored members beyond ``max_size``. The set expires ``ttl``
+        seconds after the last add.
+
+        Args:
+            name: Sorted set key
+            member: Member to add
+            score: Member score
+            max_size: Maximum number of members kept
+            ttl: Time to live of the set in seconds
+            floor: Score at or below which members are dropped
+
+        Returns:
+            Number of members dropped to stay within ``max_size``, or None on error
+        """
+        if not self.redis_client:
+            return None
+
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(name, "-inf", floor)
+                pipe.zadd(name, {member: score})
+                pipe.zremrangebyrank(name, 0, -(max_size + 1))
+                pipe.expire(name, ttl)
+                replies = await pipe.execute()
+            return int(replies[2])
+        except Exception as e:
+            logger.error(f"Cache zadd_capped error: {e}")
+            self._handle_error(e)
+            return None
 
     async def ping(self) -> bool:
         """Check Redis connection.
@@ -110,4 +1230,40 @@ class CacheService:
             return False
 
 
-cache_service = CacheService()
\ No newline at end of file
+cache_service = CacheService(
+    fallback=MemoryBackend(max_entries=settings.CACHE_FALLBACK_MAX_ENTRIES)
+    if settings.CACHE_FALLBACK_ENABLED
+    else None,
+    reconnect_backoff=Backoff(
+        settings.REDIS_RECONNECT_BACKOFF_BASE, settings.REDIS_RECONNECT_BACKOFF_MAX
+    ),
+    tracking_prefixes=settings.CACHE_CLIENT_TRACKING_PREFIXES
+    if settings.CACHE_CLIENT_TRACKING
+    else (),
+    version_sync_interval=settings.CACHE_VERSION_SYNC_INTERVAL,
+    tag_ttl=settings.CACHE_TAG_TTL,
+    local=LocalCache(
+        max_entries=settings.CACHE_L1_MAX_ENTRIES,
+        max_bytes=settings.CACHE_L1_MAX_BYTES,
+        max_ttl=settings.CACHE_L1_TTL,
+    )
+    if settings.CACHE_L1_ENABLED
+    else None,
+    invalidation_channel=settings.CACHE_L1_CHANNEL if settings.CACHE_L1_INVALIDATION else None,
+    codec=CacheCodec(
+        compression=settings.CACHE_CODEC,
+        min_size=settings.CACHE_COMPRESS_MIN_BYTES,
+        level=settings.CACHE_COMPRESS_LEVEL,
+    ),
+)
+
+for _backend in ("redis", "memory", "none"):
+    CACHE_BACKEND_ACTIVE.labels(_backend).set_function(
+        lambda backend=_backend: float(cache_service.backend == backend)
+    )
+
+CACHE_TRACKING_ACTIVE.set_function(lambda: float(cache_service.tracking))
+
+if cache_service.local is not None:
+    CACHE_L1_SIZE.labels("entries").set_function(lambda: len(cache_service.local))
+    CACHE_L1_SIZE.labels("bytes").set_function(lambda: cache_service.local.bytes)
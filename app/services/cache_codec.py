@@ -0,0 +1,101 @@
+"""Byte encoding of cached values.
+
+Cached values are JSON text. They are stored in Redis as bytes behind a
+two-byte header: ``MAGIC`` (never the first byte of UTF-8 text, so entries
+written before the header existed still read as plain text) and a format
+byte. Values at least ``min_size`` bytes long are compressed when that
+makes them smaller.
+"""
+import logging
+import zlib
+from typing import Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+HAS_ZSTD = zstandard is not None
+
+# 0xC1 can never start a UTF-8 sequence
+MAGIC = 0xC1
+
+# Format byte following MAGIC
+FORMAT_RAW = 0
+FORMAT_ZLIB = 1
+FORMAT_ZSTD = 2
+
+CODECS = ("raw", "zlib", "zstd")
+
+
+class CacheCodec:
+    """Encode cached JSON text to bytes and back.
+
+    Args:
+        compression: "raw", "zlib" or "zstd" (falls back to zlib when the
+            zstandard package is not installed)
+        min_size: Smallest encoded value, in bytes, that is compressed
+        level: Compression level
+    """
+
+    def __init__(self, compression: str = "zlib", min_size: int = 512, level: int = 6):
+        if compression not in CODECS:
+            raise ValueError(f"Unsupported cache codec: {compression} (one of {CODECS})")
+        if compression == "zstd" and not HAS_ZSTD:
+            logger.warning("zstandard is not installed, compressing cache values with zlib")
+            compression = "zlib"
+        self.compression = compression
+        self.min_size = min_size
+        self.level = level
+        self._zstd_compressor = (
+            zstandard.ZstdCompressor(level=level) if compression == "zstd" else None
+        )
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if HAS_ZSTD else None
+
+    def encode(self, value: str) -> bytes:
+        """Encode JSON text for storage.
+
+        Args:
+            value: JSON text
+
+        Returns:
+            Header and (possibly compressed) UTF-8 bytes
+        """
+        data = value.encode()
+        if self.compression != "raw" and len(data) >= self.min_size:
+            if self.compression == "zstd":
+                compressed, fmt = self._zstd_compressor.compress(data), FORMAT_ZSTD
+            else:
+                compressed, fmt = zlib.compress(data, self.level), FORMAT_ZLIB
+            if len(compressed) < len(data):
+                return bytes((MAGIC, fmt)) + compressed
+        return bytes((MAGIC, FORMAT_RAW)) + data
+
+    def decode(self, data: Optional[Union[bytes, str]]) -> Optional[str]:
+        """Decode a stored value.
+
+        Args:
+            data: Value as read from Redis; text and header-less bytes are
+                legacy plain JSON
+
+        Returns:
+            JSON text, or None for a missing value
+
+        Raises:
+            ValueError: If the value uses an unknown or unavailable format
+        """
+        if data is None or isinstance(data, str):
+            return data
+        if not data or data[0] != MAGIC:
+            return data.decode()
+
+        fmt, payload = data[1], data[2:]
+        if fmt == FORMAT_RAW:
+            return payload.decode()
+        if fmt == FORMAT_ZLIB:
+            return zlib.decompress(payload).decode()
+        if fmt == FORMAT_ZSTD and self._zstd_decompressor is not None:
+            return self._zstd_decompressor.decompress(payload).decode()
+        raise ValueError(f"Unsupported cache value format: {fmt}")
@@ -0,0 +1,319 @@
+"""Popularity-driven background refresh of weather cache entries."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import (
+    CACHE_REFRESHER_PREVENTED_MISSES,
+    CACHE_REFRESHER_REFRESHES,
+    CACHE_REFRESHER_TRACKED_KEYS,
+)
+from app.services.cache import cache_service
+
+logger = logging.getLogger(__name__)
+
+Refresh = Callable[[], Awaitable[Any]]
+
+
+class _Counter:
+    """Space-saving counter for one monitored key."""
+
+    __slots__ = ("count", "error", "value")
+
+    def __init__(self, count: float, error: float, value: Any):
+        self.count = count
+        self.error = error
+        self.value = value
+
+
+class SpaceSavingSketch:
+    """Bounded heavy-hitter sketch (Metwally et al. space-saving).
+
+    At most ``capacity`` keys are monitored. An unmonitored key replaces the
+    key with the lowest count and inherits that count as its error bound, so
+    any key more frequent than 1/capacity of the stream is always monitored
+    and counts never underestimate. Each key carries the last value it was
+    added with.
+
+    The lowest count is found through a lazily updated min-heap with one
+    entry per key: increments leave the entry behind, so entries are lower
+    bounds of the counts, and an outdated entry that reaches the top is
+    pushed again with the current count. Eviction takes amortized
+    O(log capacity) instead of a scan of every counter.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._counters: Dict[str, _Counter] = {}
+        # (count when pushed, tie-breaker, key)
+        self._heap: List[Tuple[float, int, str]] = []
+        self._pushes = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._counters
+
+    def add(self, key: str, value: Any = None, weight: float = 1.0) -> Optional[str]:
+        """Count one occurrence of a key.
+
+        Args:
+            key: Observed key
+            value: Payload to keep with the key
+            weight: Amount to count
+
+        Returns:
+            The key evicted to make room, if any
+        """
+        counter = self._counters.get(key)
+        if counter is not None:
+            counter.count += weight
+            counter.value = value
+            return None
+
+        if len(self._counters) < self.capacity:
+            self._counters[key] = _Counter(weight, 0.0, value)
+            heapq.heappush(self._heap, (weight, next(self._pushes), key))
+            return None
+
+        victim = self._pop_min()
+        floor = self._counters.pop(victim).count
+        self._counters[key] = _Counter(floor + weight, floor, value)
+        heapq.heappush(self._heap, (floor + weight, next(self._pushes), key))
+        return victim
+
+    def _pop_min(self) -> str:
+        """Remove and return the heap entry of the key with the lowest count."""
+        while True:
+            pushed, _, key = self._heap[0]
+            count = self._counters[key].count
+            if count == pushed:
+                heapq.heappop(self._heap)
+                return key
+            heapq.heapreplace(self._heap, (count, next(self._pushes), key))
+
+    def top(self, k: int) -> List[Tuple[str, float, Any]]:
+        """Return the ``k`` most frequent keys as (key, count, value), largest first."""
+        return [
+            (key, counter.count, counter.value)
+            for key, counter in heapq.nlargest(
+                k, self._counters.items(), key=lambda item: item[1].count
+            )
+        ]
+
+    def decay(self, factor: float):
+        """Scale all counts so that old traffic gradually loses weight."""
+        for counter in self._counters.values():
+            counter.count *= factor
+            counter.error *= factor
+        # Entries must stay lower bounds of the counts
+        self._heap = [
+            (counter.count, next(self._pushes), key) for key, counter in self._counters.items()
+        ]
+        heapq.heapify(self._heap)
+
+
+class _Target:
+    """How to refresh a tracked cache entry."""
+
+    __slots__ = ("namespace", "refresh", "stale_ttl")
+
+    def __init__(self, namespace: str, refresh: Refresh, stale_ttl: int):
+        self.namespace = namespace
+        self.refresh = refresh
+        self.stale_ttl = stale_ttl
+
+
+class CacheRefresher:
+    """Re-fetch the most popular cache entries shortly before they go stale.
+
+    WeatherClient reports every cache lookup. Lookups are counted in a
+    space-saving sketch; every ``interval`` seconds those of the ``top_k``
+    keys still cached whose fresh period ends within ``lead`` seconds are
+    refreshed, at most ``budget`` per cycle, most popular first. Counts decay
+    each cycle so the ranking follows current traffic.
+
+    A user hit on a refreshed entry at a time when the replaced entry would
+    already have expired is counted as a prevented miss.
+
+    An entry still due right after its refresh got no newer data (e.g. an
+    old observation clamped to the minimum TTL); it is not refreshed again
+    for ``max(lead, interval)`` seconds, doubling on every such refresh up to
+    ``MAX_BACKOFF`` times that.
+    """
+
+    DECAY = 0.9
+    MAX_BACKOFF = 8
+
+    def __init__(
+        self,
+        top_k: int,
+        interval: float,
+        budget: int,
+        lead: float,
+        sketch_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.top_k = top_k
+        self.interval = interval
+        self.budget = budget
+        self.lead = lead
+        self.clock = clock
+        self.sketch = SpaceSavingSketch(max(sketch_size, top_k))
+        self._expiries: Dict[str, float] = {}
+        # Key -> (no refresh before, current backoff delay)
+        self._backoff: Dict[str, Tuple[float, float]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether lookups are tracked and entries refreshed."""
+        return self.top_k > 0 and self.interval > 0 and self.budget > 0
+
+    def record(self, namespace: str, cache_key: str, refresh: Refresh, stale_ttl: int, hit: bool):
+        """Record a user lookup of a cache entry.
+
+        Args:
+            namespace: Metric namespace of the entry (e.g. 'weather-current')
+            cache_key: Cache key looked up
+            refresh: Coroutine function that re-fetches and re-caches the entry
+            stale_ttl: Part of the entry's TTL during which it counts as stale
+            hit: Whether the lookup was served from the cache
+        """
+        if not self.enabled:
+            return
+
+        evicted = self.sketch.add(cache_key, _Target(namespace, refresh, stale_ttl))
+        if evicted is not None:
+            self._expiries.pop(evicted, None)
+            self._backoff.pop(evicted, None)
+
+        expires_at = self._expiries.get(cache_key)
+        if expires_at is None:
+            return
+        if not hit:
+            del self._expiries[cache_key]
+        elif self.clock() >= expires_at:
+            del self._expiries[cache_key]
+            CACHE_REFRESHER_PREVENTED_MISSES.labels(namespace).inc()
+
+    def due(self, ttls: Dict[str, int], targets: Dict[str, _Target]) -> List[str]:
+        """Select keys whose fresh period ends within the lead time.
+
+        Args:
+            ttls: Remaining TTL per key (-2 if missing, -1 if persistent)
+            targets: Refresh targets per key, in popularity order
+
+        Returns:
+            Keys to refresh this cycle, most popular first, within the budget
+        """
+        now = self.clock()
+        keys = []
+        for key, target in targets.items():
+            if key in self._backoff and now < self._backoff[key][0]:
+                continue
+            if self._is_due(ttls.get(key, -2), target):
+                keys.append(key)
+        return keys[: self.budget]
+
+    def _is_due(self, ttl: int, target: _Target) -> bool:
+        """Whether an entry with ``ttl`` left is cached and goes stale within the lead time."""
+        return ttl >= 0 and ttl - target.stale_ttl <= self.lead
+
+    def _back_off(self, key: str, now: float):
+        """Hold off refreshing a key whose refresh brought no newer data."""
+        base = max(self.lead, self.interval)
+        _, delay = self._backoff.get(key, (0.0, base / 2))
+        delay = min(delay * 2, base * self.MAX_BACKOFF)
+        self._backoff[key] = (now + delay, delay)
+        logger.debug(f"Popularity refresh of {key} brought no newer data, next in {delay:.0f}s")
+
+    async def refresh_once(self) -> int:
+        """Run one refresh cycle.
+
+        Returns:
+            Number of entries refreshed successfully
+        """
+        top = self.sketch.top(self.top_k)
+        self.sketch.decay(self.DECAY)
+        if not top:
+            return 0
+
+        targets = {key: target for key, _, target in top}
+        lookups = await cache_service.get_many_with_ttl(list(targets))
+        ttls = {key: ttl for key, (_, ttl) in zip(targets, lookups)}
+        keys = self.due(ttls, targets)
+        if not keys:
+            return 0
+
+        now = self.clock()
+        results = await asyncio.gather(
+            *(targets[key].refresh() for key in keys), return_exceptions=True
+        )
+        refreshed = []
+        for key, result in zip(keys, results):
+            namespace = targets[key].namespace
+            if isinstance(result, Exception):
+                CACHE_REFRESHER_REFRESHES.labels(namespace, "error").inc()
+                logger.warning(f"Popularity refresh failed for {key}: {result}")
+                continue
+            CACHE_REFRESHER_REFRESHES.labels(namespace, "success").inc()
+            expires_at = now + ttls[key]
+            self._expiries[key] = min(self._expiries.get(key, expires_at), expires_at)
+            refreshed.append(key)
+
+        if refreshed:
+            lookups = await cache_service.get_many_with_ttl(refreshed)
+            for key, (_, ttl) in zip(refreshed, lookups):
+                if self._is_due(ttl, targets[key]):
+                    self._back_off(key, now)
+                else:
+                    self._backoff.pop(key, None)
+        logger.debug(f"Popularity refresh: {len(refreshed)}/{len(keys)} entries refreshed")
+        return len(refreshed)
+
+    async def _run(self):
+        """Refresh loop."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh_once()
+            except Exception as e:
+                logger.error(f"Popularity refresh cycle failed: {e}")
+
+    def start(self):
+        """Start the background refresh loop."""
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Cache refresher started (top {self.top_k}, every {self.interval}s, "
+            f"budget {self.budget})"
+        )
+
+    async def stop(self):
+        """Stop the background refresh loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+cache_refresher = CacheRefresher(
+    top_k=settings.CACHE_REFRESH_TOP_K,
+    interval=settings.CACHE_REFRESH_INTERVAL,
+    budget=settings.CACHE_REFRESH_BUDGET,
+    lead=settings.CACHE_REFRESH_LEAD,
+    sketch_size=settings.CACHE_REFRESH_SKETCH_SIZE,
+)
+
+CACHE_REFRESHER_TRACKED_KEYS.set_function(lambda: len(cache_refresher.sketch))
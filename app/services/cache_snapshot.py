@@ -0,0 +1,267 @@
+"""Snapshots of hot cache entries for warm starts.
+
+The snapshot file is a header followed by self-delimiting records, each a
+fixed-size struct (absolute expiry time, key, value and tags lengths) and
+the key, stored value and newline-separated tags bytes. Records can be appended to a file without
+rewriting it, a truncated last record is ignored, and the file is read
+through ``mmap`` without loading it whole.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import CACHE_SNAPSHOT_DURATION, CACHE_SNAPSHOT_ENTRIES
+from app.services.cache import cache_service
+from app.services.cache_refresher import cache_refresher
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TWCS\x02"
+
+# Expiry (Unix time), key length, value length, tags length
+RECORD = struct.Struct("<dHIH")
+
+# Namespaces worth restoring; others are cheap to rebuild or not ours
+SNAPSHOT_PREFIXES = ("weather:", "timezone:")
+
+# Records read and imported per round-trip when loading, so memory stays bounded
+LOAD_BATCH_SIZE = 500
+
+Entry = Tuple[str, bytes, float, Tuple[str, ...]]
+
+
+def write_snapshot(path: Path, entries: Iterable[Entry]) -> int:
+    """Write a snapshot file atomically.
+
+    Args:
+        path: Snapshot file
+        entries: (key, stored value, expiry as Unix time, tags)
+
+    Returns:
+        Number of entries written
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}")
+    count = 0
+    with open(temporary, "wb") as file:
+        file.write(MAGIC)
+        for key, value, expires_at, tags in entries:
+            encoded_key = key.encode()
+            encoded_tags = "\n".join(tags).encode()
+            file.write(
+                RECORD.pack(expires_at, len(encoded_key), len(value), len(encoded_tags))
+            )
+            file.write(encoded_key)
+            file.write(value)
+            file.write(encoded_tags)
+            count += 1
+    os.replace(temporary, path)
+    return count
+
+
+def read_snapshot(path: Path) -> Iterator[Entry]:
+    """Read the entries of a snapshot file.
+
+    Args:
+        path: Snapshot file
+
+    Yields:
+        (key, stored value, expiry as Unix time, tags)
+
+    Raises:
+        ValueError: If the file is not a snapshot
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < len(MAGIC):
+            raise ValueError(f"Not a cache snapshot: {path}")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            if view[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"Not a cache snapshot: {path}")
+            offset, size = len(MAGIC), len(view)
+            while offset + RECORD.size <= size:
+                expires_at, key_length, value_length, tags_length = RECORD.unpack_from(
+                    view, offset
+                )
+                start = offset + RECORD.size
+                value_start = start + key_length
+                tags_start = value_start + value_length
+                offset = tags_start + tags_length
+                if offset > size:
+                    logger.warning(f"Cache snapshot {path} ends in a truncated record")
+                    return
+                tags = view[tags_start:offset].decode()
+                yield (
+                    view[start:value_start].decode(),
+                    view[value_start:tags_start],
+                    expires_at,
+                    tuple(tags.split("\n")) if tags else (),
+                )
+
+
+class CacheSnapshotter:
+    """Periodically snapshot hot cache entries and restore them at startup.
+
+    Hot entries are the most popular keys tracked by the cache refresher,
+    then the most recently used keys of the in-process tier, up to
+    ``max_entries``. They are saved with their stored (encoded) values,
+    absolute expiry times and tags every ``interval`` seconds and on
+    shutdown. Loading stores the unexpired ones whose keys are missing, in
+    Redis (or the in-process fallback) and the in-process tier, indexed
+    under their tags so that purges reach them. Records that do not
+    decode to JSON are skipped, and a failed load never stops startup.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int,
+        interval: float,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.interval = interval
+        self.enabled = enabled and max_entries > 0
+        self.clock = clock
+        self._task: Optional[asyncio.Task] = None
+
+    def hot_keys(self) -> List[str]:
+        """Candidate keys to snapshot, hottest first; some may no longer be cached."""
+        keys = [key for key, _, _ in cache_refresher.sketch.top(self.max_entries)]
+        if cache_service.local is not None:
+            keys.extend(cache_service.local.recent(self.max_entries))
+        return [key for key in dict.fromkeys(keys) if key.startswith(SNAPSHOT_PREFIXES)]
+
+    async def save(self) -> int:
+        """Write a snapshot of the hot entries.
+
+        Returns:
+            Number of entries written (0 if skipped)
+        """
+        started = time.perf_counter()
+        entries = (await cache_service.export_entries(self.hot_keys()))[: self.max_entries]
+        if not entries:
+            # Keep the last snapshot rather than replace it with nothing, e.g. during an outage
+            logger.info("Cache snapshot skipped: no hot entries cached")
+            return 0
+        now = self.clock()
+        records = [(key, value, now + ttl, tags) for key, value, ttl, tags in entries]
+        count = await asyncio.to_thread(write_snapshot, self.path, records)
+        CACHE_SNAPSHOT_DURATION.labels("save").observe(time.perf_counter() - started)
+        CACHE_SNAPSHOT_ENTRIES.labels("save", "written").inc(count)
+        logger.info(f"Cache snapshot saved: {count} entries to {self.path}")
+        return count
+
+    async def load(self) -> int:
+        """Restore the entries of the last snapshot.
+
+        Returns:
+            Number of entries restored
+        """
+        if not self.enabled or not self.path.exists():
+            return 0
+        try:
+            return await self._restore()
+        except Exception as e:
+            logger.error(f"Cache snapshot restore failed: {e}", exc_info=True)
+            return 0
+
+    async def _restore(self) -> int:
+        """Read, validate and import the last snapshot, ``LOAD_BATCH_SIZE`` records at a time."""
+        started = time.perf_counter()
+        records = read_snapshot(self.path)
+        read = restored = valid = invalid = 0
+        try:
+            while True:
+                try:
+                    batch = await asyncio.to_thread(
+                        lambda: list(itertools.islice(records, LOAD_BATCH_SIZE))
+                    )
+                except (OSError, ValueError) as e:
+                    logger.error(f"Cache snapshot could not be read: {e}")
+                    break
+                if not batch:
+                    break
+                entries, skipped = self._valid_entries(batch, self.clock())
+                read += len(batch)
+                valid += len(entries)
+                invalid += skipped
+                restored += await cache_service.import_entries(entries)
+        finally:
+            records.close()
+
+        CACHE_SNAPSHOT_DURATION.labels("load").observe(time.perf_counter() - started)
+        CACHE_SNAPSHOT_ENTRIES.labels("load", "restored").inc(restored)
+        CACHE_SNAPSHOT_ENTRIES.labels("load", "expired").inc(read - valid - invalid)
+        CACHE_SNAPSHOT_ENTRIES.labels("load", "invalid").inc(invalid)
+        CACHE_SNAPSHOT_ENTRIES.labels("load", "present").inc(valid - restored)
+        logger.info(
+            f"Cache snapshot loaded in {time.perf_counter() - started:.3f}s: "
+            f"{restored} of {read} entries restored"
+        )
+        return restored
+
+    @staticmethod
+    def _valid_entries(records: List[Entry], now: float) -> Tuple[List[tuple], int]:
+        """Unexpired records that decode to JSON, as import entries, and the number invalid."""
+        entries = []
+        invalid = 0
+        for key, value, expires_at, tags in records:
+            if expires_at - now < 1:
+                continue
+            try:
+                json.loads(cache_service.codec.decode(value))
+            except Exception as e:
+                # Corrupt, or written with a codec this build lacks
+                logger.warning(f"Cache snapshot entry {key} skipped: {e}")
+                invalid += 1
+                continue
+            entries.append((key, value, int(expires_at - now), tags))
+        return entries, invalid
+
+    async def _run(self):
+        """Snapshot loop."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.save()
+            except Exception as e:
+                logger.error(f"Cache snapshot failed: {e}")
+
+    def start(self):
+        """Start the background snapshot loop."""
+        if not self.enabled or self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the snapshot loop and take a last snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.enabled:
+            try:
+                await self.save()
+            except Exception as e:
+                logger.error(f"Cache snapshot failed: {e}")
+
+
+cache_snapshotter = CacheSnapshotter(
+    path=settings.CACHE_SNAPSHOT_PATH,
+    max_entries=settings.CACHE_SNAPSHOT_MAX_ENTRIES,
+    interval=settings.CACHE_SNAPSHOT_INTERVAL,
+    enabled=settings.CACHE_SNAPSHOT_ENABLED,
+)
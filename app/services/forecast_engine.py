@@ -0,0 +1,255 @@
+"""Aggregation of three-hourly forecast items into daily forecasts."""
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, Iterable, List, Sequence
+
+from app.schemas.weather import DailyForecast, TemperatureRange
+from app.services.weather_messages import get_witty_message
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+SECONDS_PER_DAY = 86400
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+HAS_NUMPY = np is not None
+
+
+class _DayAccumulator:
+    """Running totals for one UTC day of forecast items."""
+
+    __slots__ = (
+        "count",
+        "temp_min",
+        "temp_max",
+        "temp_sum",
+        "humidity_sum",
+        "wind_sum",
+        "conditions",
+        "descriptions",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.temp_min = float("inf")
+        self.temp_max = float("-inf")
+        self.temp_sum = 0.0
+        self.humidity_sum = 0
+        self.wind_sum = 0.0
+        self.conditions: Counter = Counter()
+        self.descriptions: Counter = Counter()
+
+    def add(self, item: Dict[str, Any]):
+        """Fold one three-hourly item into the totals."""
+        main = item["main"]
+        temp = main["temp"]
+        weather = item["weather"][0]
+
+        self.count += 1
+        if temp < self.temp_min:
+            self.temp_min = temp
+        if temp > self.temp_max:
+            self.temp_max = temp
+        self.temp_sum += temp
+        self.humidity_sum += main["humidity"]
+        self.wind_sum += item["wind"]["speed"]
+        self.conditions[weather["main"]] += 1
+        self.descriptions[weather["description"]] += 1
+
+
+def _day_string(day: int) -> str:
+    """Format a day index (days since the Unix epoch) as YYYY-MM-DD."""
+    return date.fromordinal(_EPOCH_ORDINAL + day).isoformat()
+
+
+def _mode(counts: Counter) -> str:
+    """Most common value, preferring the one seen first on ties."""
+    return counts.most_common(1)[0][0]
+
+
+def _build_day(
+    day: int,
+    count: int,
+    temp_min: float,
+    temp_max: float,
+    temp_sum: float,
+    humidity_sum: int,
+    wind_sum: float,
+    condition: str,
+    description: str,
+    units: str,
+) -> DailyForecast:
+    """Build the response model for one day from its reduced values."""
+    avg_temp = temp_sum / count
+    wind_speed = wind_sum / count
+    return DailyForecast(
+        date=_day_string(day),
+        temperature=TemperatureRange(
+            min=round(temp_min, 1),
+            max=round(temp_max, 1),
+            avg=round(avg_temp, 1),
+        ),
+        description=description,
+        condition=condition,
+        humidity=humidity_sum // count,
+        wind_speed=round(wind_speed, 1),
+        witty_message=get_witty_message(
+            condition=condition,
+            temperature=avg_temp,
+            wind_speed=wind_speed,
+            units=units,
+        ),
+    )
+
+
+def aggregate_daily(
+    items: Iterable[Dict[str, Any]], units: str, days: int = 5
+) -> List[DailyForecast]:
+    """Reduce three-hourly forecast items to one forecast per UTC day.
+
+    Items are grouped and reduced in a single pass. Each day reports the
+    temperature range and average, the most common condition and
+    description, and average humidity and wind speed.
+
+    Args:
+        items: The ``list`` entries of an OpenWeatherMap forecast response
+        units: Temperature units of the items
+        days: Number of leading days to return
+
+    Returns:
+        Daily forecasts in date order
+    """
+    accumulators: Dict[int, _DayAccumulator] = {}
+    for item in items:
+        day = item["dt"] // SECONDS_PER_DAY
+        accumulator = accumulators.get(day)
+        if accumulator is None:
+            accumulator = accumulators[day] = _DayAccumulator()
+        accumulator.add(item)
+
+    forecasts = []
+    for day in sorted(accumulators)[:days]:
+        acc = accumulators[day]
+        forecasts.append(
+            _build_day(
+                day,
+                acc.count,
+                acc.temp_min,
+                acc.temp_max,
+                acc.temp_sum,
+                acc.humidity_sum,
+                acc.wind_sum,
+                _mode(acc.conditions),
+                _mode(acc.descriptions),
+                units,
+            )
+        )
+    return forecasts
+
+
+def _vectorized_modes(group: "np.ndarray", values: List[str], n_groups: int) -> List[str]:
+    """Most common value per group, preferring the first seen on ties."""
+    labels, codes = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+    n_labels = len(labels)
+    pair = group * n_labels + codes
+
+    counts = np.bincount(pair, minlength=n_groups * n_labels).reshape(n_groups, n_labels)
+    first = np.full(n_groups * n_labels, len(values), dtype=np.int64)
+    np.minimum.at(first, pair, np.arange(len(values), dtype=np.int64))
+    first = first.reshape(n_groups, n_labels)
+
+    # Highest count wins; among equal counts the earliest first occurrence does.
+    score = np.where(counts > 0, counts * (len(values) + 1) - first, -1)
+    return [labels[code] for code in score.argmax(axis=1)]
+
+
+def aggregate_daily_many(
+    payloads: Sequence[Sequence[Dict[str, Any]]], units: str, days: int = 5
+) -> List[List[DailyForecast]]:
+    """Reduce many forecast payloads at once.
+
+    With NumPy installed the items of all payloads are reduced together
+    with vectorized group operations; otherwise each payload goes through
+    :func:`aggregate_daily`. Both paths return identical forecasts.
+
+    Args:
+        payloads: ``list`` entries of several forecast responses
+        units: Temperature units of the items
+        days: Number of leading days to return per payload
+
+    Returns:
+        Daily forecasts per payload, in the order of ``payloads``
+    """
+    if np is None:
+        return [aggregate_daily(items, units, days) for items in payloads]
+
+    owners: List[int] = []
+    dts: List[int] = []
+    temps: List[float] = []
+    humidities: List[int] = []
+    winds: List[float] = []
+    conditions: List[str] = []
+    descriptions: List[str] = []
+    for index, items in enumerate(payloads):
+        for item in items:
+            main = item["main"]
+            weather = item["weather"][0]
+            owners.append(index)
+            dts.append(item["dt"])
+            temps.append(main["temp"])
+            humidities.append(main["humidity"])
+            winds.append(item["wind"]["speed"])
+            conditions.append(weather["main"])
+            descriptions.append(weather["description"])
+
+    results: List[List[DailyForecast]] = [[] for _ in payloads]
+    if not owners:
+        return results
+
+    owner = np.asarray(owners, dtype=np.int64)
+    day = np.asarray(dts, dtype=np.int64) // SECONDS_PER_DAY
+    day_offset = day - day.min()
+    keys, group = np.unique(owner * (int(day_offset.max()) + 1) + day_offset, return_inverse=True)
+    n_groups = len(keys)
+
+    temp = np.asarray(temps, dtype=np.float64)
+    counts = np.bincount(group, minlength=n_groups)
+    temp_sum = np.bincount(group, weights=temp, minlength=n_groups)
+    wind_sum = np.bincount(group, weights=np.asarray(winds, dtype=np.float64), minlength=n_groups)
+    humidity_sum = np.zeros(n_groups, dtype=np.int64)
+    np.add.at(humidity_sum, group, np.asarray(humidities, dtype=np.int64))
+    temp_min = np.full(n_groups, np.inf)
+    np.minimum.at(temp_min, group, temp)
+    temp_max = np.full(n_groups, -np.inf)
+    np.maximum.at(temp_max, group, temp)
+
+    group_owner = np.zeros(n_groups, dtype=np.int64)
+    group_owner[group] = owner
+    group_day = np.zeros(n_groups, dtype=np.int64)
+    group_day[group] = day
+
+    modal_conditions = _vectorized_modes(group, conditions, n_groups)
+    modal_descriptions = _vectorized_modes(group, descriptions, n_groups)
+
+    # Groups are ordered by payload, then day, so each payload's first days come first.
+    for g in range(n_groups):
+        forecasts = results[int(group_owner[g])]
+        if len(forecasts) >= days:
+            continue
+        forecasts.append(
+            _build_day(
+                int(group_day[g]),
+                int(counts[g]),
+                float(temp_min[g]),
+                float(temp_max[g]),
+                float(temp_sum[g]),
+                int(humidity_sum[g]),
+                float(wind_sum[g]),
+                modal_conditions[g],
+                modal_descriptions[g],
+                units,
+            )
+        )
+    return results
@@ -0,0 +1,125 @@
+"""Micro-batching of current weather fetches into multi-city calls."""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.core.metrics import UPSTREAM_GROUP_BATCH_SIZE
+from app.services.upstream_scheduler import Priority
+
+logger = logging.getLogger(__name__)
+
+GroupFetcher = Callable[[List[int], str, Priority], Awaitable[List[Dict[str, Any]]]]
+
+
+class GroupMissError(LookupError):
+    """Raised when a group response does not contain a requested city."""
+
+
+class _Batch:
+    """City ids collected for one upstream call."""
+
+    __slots__ = ("futures", "priority", "timer")
+
+    def __init__(self, priority: Priority):
+        self.futures: Dict[int, asyncio.Future] = {}
+        self.priority = priority
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class GroupBatcher:
+    """Collect concurrent fetches for known city ids into one upstream call.
+
+    The first fetch for a units value opens a batch and arms a short timer;
+    fetches arriving before it fires (or until the batch is full) join it.
+    One call then retrieves every city and each waiter receives its own
+    entry of the response. A batch runs at the highest priority of its
+    members. A batch nobody else joined is handed back to its caller, which
+    then makes its usual single-city call.
+    """
+
+    def __init__(self, fetch_group: GroupFetcher, window: float, max_size: int):
+        self.fetch_group = fetch_group
+        self.window = window
+        self.max_size = max_size
+        self._batches: Dict[str, _Batch] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether fetches are batched at all."""
+        return self.window > 0 and self.max_size > 1
+
+    async def fetch(
+        self,
+        city_id: int,
+        units: str,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch the raw current weather payload of one city.
+
+        Args:
+            city_id: OpenWeatherMap city id
+            units: Temperature units
+            priority: Scheduling priority of the caller
+
+        Returns:
+            The city's entry of the upstream response, or None if the city
+            ended up alone in its batch and should be fetched individually
+
+        Raises:
+            GroupMissError: If the response did not include the city
+        """
+        batch = self._batches.get(units)
+        if batch is None:
+            batch = self._batches[units] = _Batch(priority)
+            batch.timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush, units
+            )
+        batch.priority = min(batch.priority, priority)
+
+        future = batch.futures.get(city_id)
+        if future is None:
+            future = batch.futures[city_id] = asyncio.get_running_loop().create_future()
+            if len(batch.futures) >= self.max_size:
+                self._flush(units)
+        return await asyncio.shield(future)
+
+    def _flush(self, units: str):
+        """Close the open batch for ``units`` and start its upstream call."""
+        batch = self._batches.pop(units, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._run(batch, units))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _Batch, units: str):
+        """Perform one batched call and hand each waiter its result."""
+        city_ids = list(batch.futures)
+        if len(city_ids) == 1:
+            future = batch.futures[city_ids[0]]
+            if not future.done():
+                future.set_result(None)
+            return
+
+        UPSTREAM_GROUP_BATCH_SIZE.observe(len(city_ids))
+        try:
+            items = await self.fetch_group(city_ids, units, batch.priority)
+        except Exception as e:
+            for future in batch.futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()
+            return
+
+        by_id = {item.get("id"): item for item in items}
+        for city_id, future in batch.futures.items():
+            if future.done():
+                continue
+            if city_id in by_id:
+                future.set_result(by_id[city_id])
+            else:
+                future.set_exception(GroupMissError(f"City {city_id} missing from group response"))
+                future.exception()
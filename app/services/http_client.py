@@ -0,0 +1,156 @@
+"""Shared HTTP client for the weather API upstream."""
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import UPSTREAM_POOL_CONNECTIONS, UPSTREAM_POOL_WAITING
+from app.services.upstream_scheduler import Priority, upstream_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamHTTPClient:
+    """Long-lived, pooled ``httpx.AsyncClient`` shared by all upstream calls.
+
+    The client is opened by the application lifespan and reused for every
+    request so that TCP/TLS connections to the weather API are kept alive
+    between cache misses instead of being re-established each time.
+    """
+
+    def __init__(self):
+        self.base_url = settings.WEATHER_API_BASE_URL
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _build_client(
+        self, transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> httpx.AsyncClient:
+        """Build the pooled client from settings."""
+        limits = httpx.Limits(
+            max_connections=settings.WEATHER_API_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.WEATHER_API_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.WEATHER_API_KEEPALIVE_EXPIRY,
+        )
+        # httpx treats an explicit None as "no timeout", so leave unset phases
+        # out for them to use WEATHER_API_TIMEOUT
+        phases = {
+            "connect": settings.WEATHER_API_CONNECT_TIMEOUT,
+            "read": settings.WEATHER_API_READ_TIMEOUT,
+            "write": settings.WEATHER_API_WRITE_TIMEOUT,
+            "pool": settings.WEATHER_API_POOL_TIMEOUT,
+        }
+        timeout = httpx.Timeout(
+            settings.WEATHER_API_TIMEOUT,
+            **{phase: value for phase, value in phases.items() if value is not None},
+        )
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=limits,
+            timeout=timeout,
+            transport=transport,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    async def start(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """Open the shared client and pre-open pooled connections.
+
+        Args:
+            transport: Optional transport override (e.g. for a local fake upstream)
+        """
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = self._build_client(transport)
+        logger.info("Upstream HTTP client started")
+        await self.warm_up(settings.WEATHER_API_WARMUP_CONNECTIONS)
+
+    async def warm_up(self, connections: int) -> int:
+        """Open ``connections`` keep-alive connections ahead of traffic.
+
+        Concurrent ``HEAD`` requests force the pool to establish one connection
+        each; the response status is irrelevant. Each takes a quota token at
+        ``Priority.WARMUP``, after every other queued call. Failures are logged
+        and never prevent startup.
+
+        Args:
+            connections: Number of connections to pre-open
+
+        Returns:
+            Number of warm-up requests that reached the upstream
+        """
+        if connections <= 0:
+            return 0
+
+        results = await asyncio.gather(
+            *(self._warm_up_connection() for _ in range(connections)),
+            return_exceptions=True,
+        )
+        opened = sum(1 for result in results if isinstance(result, httpx.Response))
+        if opened < connections:
+            logger.warning(f"Upstream warm-up opened {opened}/{connections} connections")
+        else:
+            logger.info(f"Upstream warm-up opened {opened} connections")
+        return opened
+
+    async def _warm_up_connection(self) -> httpx.Response:
+        """Open one connection with a ``HEAD`` request, once the scheduler allows it."""
+        await upstream_scheduler.acquire(Priority.WARMUP)
+        return await self.client.head("/")
+
+    async def close(self):
+        """Close the shared client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Upstream HTTP client closed")
+
+    async def get(self, path: str, params: Dict[str, Any]) -> httpx.Response:
+        """Send a GET request to the upstream.
+
+        Args:
+            path: Path relative to the weather API base URL
+            params: Query parameters
+
+        Returns:
+            The upstream response
+        """
+        return await self.client.get(path, params=params)
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Return connection pool usage.
+
+        Returns:
+            Dict with ``in_use``, ``idle`` and ``waiting`` counts
+        """
+        stats = {"in_use": 0, "idle": 0, "waiting": 0}
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        if pool is None:
+            return stats
+
+        for connection in pool.connections:
+            if connection.is_idle():
+                stats["idle"] += 1
+            else:
+                stats["in_use"] += 1
+        stats["waiting"] = sum(
+            1 for request in getattr(pool, "_requests", []) if request.is_queued()
+        )
+        return stats
+
+
+upstream_client = UpstreamHTTPClient()
+
+UPSTREAM_POOL_CONNECTIONS.labels("in_use").set_function(
+    lambda: upstream_client.pool_stats()["in_use"]
+)
+UPSTREAM_POOL_CONNECTIONS.labels("idle").set_function(
+    lambda: upstream_client.pool_stats()["idle"]
+)
+UPSTREAM_POOL_WAITING.set_function(lambda: upstream_client.pool_stats()["waiting"])
@@ -0,0 +1,156 @@
+"""Canonical location resolution for weather queries."""
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import LOCATION_ALIAS_LOOKUPS, LOCATION_ALIASES_PER_CITY
+from app.services.cache import cache_service
+
+logger = logging.getLogger(__name__)
+
+
+class LocationResolver:
+    """Map free-form location queries to canonical OpenWeatherMap city ids.
+
+    Queries are normalized ("London ", "london" and "LONDON" are one alias) and
+    aliases learn their city id from upstream responses. Mappings live in a
+    bounded in-process LRU backed by a Redis hash shared by all workers, which
+    is capped too: beyond ``redis_max_entries`` the least recently learned
+    aliases are dropped, and the hash expires ``redis_ttl`` seconds after the
+    last one was learned.
+
+    Args:
+        max_entries: Maximum aliases kept in process
+        redis_max_entries: Maximum aliases kept in Redis
+        redis_ttl: Seconds the Redis hash outlives its last write
+    """
+
+    REDIS_KEY = "location:aliases"
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        redis_max_entries: int = 100000,
+        redis_ttl: int = 2592000,
+    ):
+        self.max_entries = max_entries
+        self.redis_max_entries = redis_max_entries
+        self.redis_ttl = redis_ttl
+        self._aliases: "OrderedDict[str, int]" = OrderedDict()
+
+    @staticmethod
+    def normalize(city: str, country_code: Optional[str] = None) -> str:
+        """Normalize a location query into its alias form.
+
+        Args:
+            city: City name, optionally with ",<country>" suffixes
+            country_code: ISO 3166 country code (optional)
+
+        Returns:
+            Case-folded, whitespace-collapsed "city[,state][,country]" string
+        """
+        parts = [" ".join(part.split()).casefold() for part in city.split(",")]
+        if country_code:
+            parts.append(country_code.strip().casefold())
+        return ",".join(part for part in parts if part)
+
+    def _remember(self, alias: str, city_id: int):
+        """Store a mapping in the local LRU."""
+        self._aliases[alias] = city_id
+        self._aliases.move_to_end(alias)
+        while len(self._aliases) > self.max_entries:
+            self._aliases.popitem(last=False)
+
+    async def resolve(self, alias: str) -> Optional[int]:
+        """Return the canonical city id for an alias, if known.
+
+        Args:
+            alias: Normalized location alias
+
+        Returns:
+            City id or None
+        """
+        city_id = self._aliases.get(alias)
+        if city_id is not None:
+            self._aliases.move_to_end(alias)
+            LOCATION_ALIAS_LOOKUPS.labels("local").inc()
+            return city_id
+
+        stored = await cache_service.hget(self.REDIS_KEY, alias)
+        if stored is None:
+            LOCATION_ALIAS_LOOKUPS.labels("miss").inc()
+            return None
+
+        LOCATION_ALIAS_LOOKUPS.labels("redis").inc()
+        city_id = int(stored)
+        self._remember(alias, city_id)
+        return city_id
+
+    async def resolve_many(self, aliases: List[str]) -> List[Optional[int]]:
+        """Resolve several aliases, reading unknown ones from Redis in one round-trip.
+
+        Args:
+            aliases: Normalized location aliases
+
+        Returns:
+            City ids (None where unknown) in the order of ``aliases``
+        """
+        city_ids: List[Optional[int]] = [self._aliases.get(alias) for alias in aliases]
+        unknown = sorted({alias for alias, city_id in zip(aliases, city_ids) if city_id is None})
+        LOCATION_ALIAS_LOOKUPS.labels("local").inc(sum(1 for city_id in city_ids if city_id))
+        if not unknown:
+            return city_ids
+
+        stored = dict(zip(unknown, await cache_service.hmget(self.REDIS_KEY, unknown)))
+        for alias, value in stored.items():
+            if value is None:
+                LOCATION_ALIAS_LOOKUPS.labels("miss").inc()
+            else:
+                LOCATION_ALIAS_LOOKUPS.labels("redis").inc()
+                self._remember(alias, int(value))
+        return [
+            city_id if city_id is not None else self._aliases.get(alias)
+            for alias, city_id in zip(aliases, city_ids)
+        ]
+
+    async def learn(self, alias: str, city_id: int):
+        """Record the city id an upstream response returned for an alias.
+
+        Args:
+            alias: Normalized location alias
+            city_id: OpenWeatherMap city id
+        """
+        if self._aliases.get(alias) == city_id:
+            return
+        self._remember(alias, city_id)
+        await cache_service.hset_capped(
+            self.REDIS_KEY,
+            alias,
+            str(city_id),
+            max_size=self.redis_max_entries,
+            ttl=self.redis_ttl,
+        )
+        logger.debug(f"Learned location alias '{alias}' -> {city_id}")
+
+    def stats(self) -> Dict[str, float]:
+        """Return local alias map statistics.
+
+        Returns:
+            Dict with ``aliases``, ``cities`` and ``aliases_per_city``
+        """
+        cities = len(set(self._aliases.values()))
+        return {
+            "aliases": len(self._aliases),
+            "cities": cities,
+            "aliases_per_city": len(self._aliases) / cities if cities else 0.0,
+        }
+
+
+location_resolver = LocationResolver(
+    settings.LOCATION_ALIAS_CACHE_SIZE,
+    redis_max_entries=settings.LOCATION_ALIAS_MAX_ENTRIES,
+    redis_ttl=settings.LOCATION_ALIAS_TTL,
+)
+
+LOCATION_ALIASES_PER_CITY.set_function(lambda: location_resolver.stats()["aliases_per_city"])
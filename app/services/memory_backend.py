@@ -0,0 +1,281 @@
+"""In-process backend for the Redis commands CacheService uses.
+
+Takes over from Redis while the server is unreachable, so that caching
+keeps working, per worker, during an outage. Also the base of the Redis
+stand-in used by tests and benchmarks.
+"""
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class MemoryBackend:
+    """Dict-backed stand-in for the Redis commands CacheService uses.
+
+    Keys expire like Redis keys. Beyond ``max_entries`` keys the oldest
+    written are evicted. ``_command`` and ``_round_trip`` are called for
+    every command and round-trip (a pipeline is one) so subclasses can
+    instrument them.
+    """
+
+    def __init__(self, max_entries: float = 10000, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._pipelined = False
+        self._values: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = defaultdict(list)
+
+    def _live(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        entry = self._values.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= self.clock():
+            del self._values[key]
+            return None
+        return entry
+
+    def _store(self, key: str, value: Any, expires_at: Optional[float]):
+        self._values.pop(key, None)
+        self._values[key] = (value, expires_at)
+        while len(self._values) > self.max_entries:
+            del self._values[next(iter(self._values))]
+
+    async def _command(self, name: str):
+        if not self._pipelined:
+            await self._round_trip()
+
+    async def _round_trip(self):
+        pass
+
+    def clear(self):
+        """Drop every key."""
+        self._values.clear()
+
+    async def ping(self) -> bool:
+        await self._command("ping")
+        return True
+
+    async def close(self):
+        pass
+
+    async def get(self, key: str) -> Optional[str]:
+        await self._command("get")
+        entry = self._live(key)
+        return entry[0] if entry is not None and isinstance(entry[0], (str, bytes)) else None
+
+    async def ttl(self, key: str) -> int:
+        await self._command("ttl")
+        entry = self._live(key)
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return max(int(entry[1] - self.clock()), 0)
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        await self._command("mget")
+        values = []
+        for key in keys:
+            entry = self._live(key)
+            held = entry is not None and isinstance(entry[0], (str, bytes))
+            values.append(entry[0] if held else None)
+        return values
+
+    async def set(
+        self, key: str, value: str, ex: Optional[int] = None, nx: bool = False
+    ) -> Optional[bool]:
+        await self._command("set")
+        if nx and self._live(key) is not None:
+            return None
+        self._store(key, value, self.clock() + ex if ex else None)
+        return True
+
+    async def setex(self, key: str, ttl: int, value: str) -> bool:
+        await self._command("setex")
+        self._store(key, value, self.clock() + ttl)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        await self._command("del")
+        return sum(1 for key in keys if self._values.pop(key, None) is not None)
+
+    async def hget(self, name: str, field: str) -> Optional[str]:
+        await self._command("hget")
+        entry = self._live(name)
+        return entry[0].get(field) if entry is not None else None
+
+    async def hmget(self, name: str, fields: List[str]) -> List[Optional[str]]:
+        await self._command("hmget")
+        entry = self._live(name)
+        mapping = entry[0] if entry is not None else {}
+        return [mapping.get(field) for field in fields]
+
+    async def hset(self, name: str, field: str, value: str) -> int:
+        await self._command("hset")
+        entry = self._live(name)
+        if entry is None:
+            entry = ({}, None)
+            self._store(name, *entry)
+        added = field not in entry[0]
+        entry[0][field] = value
+        return int(added)
+
+    async def hdel(self, name: str, *fields: str) -> int:
+        await self._command("hdel")
+        entry = self._live(name)
+        if entry is None:
+            return 0
+        removed = [field for field in fields if entry[0].pop(field, None) is not None]
+        return len(removed)
+
+    async def hincrby(self, name: str, field: str, amount: int = 1) -> int:
+        await self._command("hincrby")
+        entry = self._live(name)
+        if entry is None:
+            entry = ({}, None)
+            self._store(name, *entry)
+        entry[0][field] = str(int(entry[0].get(field, 0)) + amount)
+        return int(entry[0][field])
+
+    async def hgetall(self, name: str) -> Dict[str, str]:
+        await self._command("hgetall")
+        entry = self._live(name)
+        return dict(entry[0]) if entry is not None else {}
+
+    async def expire(self, name: str, ttl: int) -> bool:
+        await self._command("expire")
+        entry = self._live(name)
+        if entry is None:
+            return False
+        self._values[name] = (entry[0], self.clock() + ttl)
+        return True
+
+    async def zadd(self, name: str, mapping: Dict[str, float], gt: bool = False) -> int:
+        await self._command("zadd")
+        entry = self._live(name)
+        if entry is None:
+            entry = ({}, None)
+            self._store(name, *entry)
+        added = len(set(mapping) - set(entry[0]))
+        for member, score in mapping.items():
+            if not gt or member not in entry[0] or float(score) > entry[0][member]:
+                entry[0][member] = float(score)
+        return added
+
+    async def zscore(self, name: str, member: str) -> Optional[float]:
+        await self._command("zscore")
+        entry = self._live(name)
+        return entry[0].get(member) if entry is not None else None
+
+    async def zscan_iter(self, name: str, match: Optional[str] = None, count: Optional[int] = None):
+        await self._command("zscan")
+        entry = self._live(name)
+        for member, score in list(entry[0].items()) if entry is not None else []:
+            yield member, score
+
+    async def zremrangebyscore(self, name: str, min: float, max: float) -> int:
+        await self._command("zremrangebyscore")
+        entry = self._live(name)
+        if entry is None:
+            return 0
+        low, high = float(min), float(max)
+        removed = [member for member, score in entry[0].items() if low <= score <= high]
+        for member in removed:
+            del entry[0][member]
+        return len(removed)
+
+    def _ranked(self, name: str, start: int, end: int) -> List[str]:
+        entry = self._live(name)
+        if entry is None:
+            return []
+        ranked = sorted(entry[0], key=lambda member: (entry[0][member], member))
+        start = max(start if start >= 0 else len(ranked) + start, 0)
+        end = end if end >= 0 else len(ranked) + end
+        return ranked[start : end + 1] if end >= 0 else []
+
+    async def zrange(self, name: str, start: int, end: int) -> List[str]:
+        await self._command("zrange")
+        return self._ranked(name, start, end)
+
+    async def zremrangebyrank(self, name: str, start: int, end: int) -> int:
+        await self._command("zremrangebyrank")
+        removed = self._ranked(name, start, end)
+        for member in removed:
+            del self._values[name][0][member]
+        return len(removed)
+
+    async def publish(self, channel: str, message: str) -> int:
+        await self._command("publish")
+        queues = self._subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(queues)
+
+    def pipeline(self, transaction: bool = True) -> "MemoryPipeline":
+        return MemoryPipeline(self)
+
+    def pubsub(self) -> "MemoryPubSub":
+        return MemoryPubSub(self)
+
+
+class MemoryPubSub:
+    """Channel subscriptions on an MemoryBackend."""
+
+    def __init__(self, redis: MemoryBackend):
+        self._redis = redis
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._channels: List[str] = []
+
+    async def subscribe(self, *channels: str):
+        for channel in channels:
+            self._redis._subscribers[channel].append(self._queue)
+            self._channels.append(channel)
+            self._queue.put_nowait({"type": "subscribe", "channel": channel, "data": 1})
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def aclose(self):
+        for channel in self._channels:
+            self._redis._subscribers[channel].remove(self._queue)
+        self._channels.clear()
+
+
+class MemoryPipeline:
+    """Buffers commands and runs them on ``execute``, like a Redis pipeline."""
+
+    def __init__(self, redis: MemoryBackend):
+        self._redis = redis
+        self._calls: List[Tuple[str, tuple, Dict[str, Any]]] = []
+
+    async def __aenter__(self) -> "MemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._calls.clear()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __getattr__(self, command: str):
+        if not hasattr(self._redis, command):
+            raise AttributeError(command)
+
+        def queue(*args, **kwargs):
+            self._calls.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> List[Any]:
+        calls, self._calls = self._calls, []
+        await self._redis._round_trip()
+        # Commands run back to back without suspending, as one server-side batch
+        self._redis._pipelined = True
+        try:
+            return [
+                await getattr(self._redis, command)(*args, **kwargs)
+                for command, args, kwargs in calls
+            ]
+        finally:
+            self._redis._pipelined = False
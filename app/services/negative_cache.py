@@ -0,0 +1,100 @@
+"""Short-lived cache of lookups known to fail."""
+import hashlib
+import logging
+import time
+from typing import Callable, Dict
+
+from app.core.config import settings
+from app.core.metrics import (
+    CACHE_NEGATIVE_EVICTIONS,
+    CACHE_NEGATIVE_LOOKUPS,
+    CACHE_NEGATIVE_STORES,
+)
+from app.services.cache import cache_service
+
+logger = logging.getLogger(__name__)
+
+
+class NegativeCache:
+    """Remember names an upstream or library rejected, for a short time.
+
+    Each namespace is one Redis sorted set, ``negative:<namespace>``, apart
+    from the positive entries: members are MD5 hashes of the names and
+    scores their expiry times. Expired members are dropped on every add,
+    and beyond ``max_entries`` the ones closest to expiry are, so flooding
+    it with made-up names costs bounded memory.
+
+    Args:
+        ttl: Seconds a failure is remembered per namespace (0 disables it)
+        max_entries: Maximum names remembered per namespace
+        clock: Wall clock shared by all workers
+    """
+
+    def __init__(
+        self,
+        ttl: Dict[str, int],
+        max_entries: int = 10000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+
+    @staticmethod
+    def _key(namespace: str) -> str:
+        return f"negative:{namespace}"
+
+    @staticmethod
+    def _member(name: str) -> str:
+        return hashlib.md5(name.encode()).hexdigest()
+
+    async def contains(self, namespace: str, name: str) -> bool:
+        """Whether a name is known to fail.
+
+        A hit stands for an upstream call (or lookup) saved.
+
+        Args:
+            namespace: Kind of name (e.g. "city")
+            name: Name as looked up
+
+        Returns:
+            True if the name failed within the namespace's TTL
+        """
+        if not self.ttl.get(namespace):
+            return False
+        expires_at = await cache_service.zscore(self._key(namespace), self._member(name))
+        found = expires_at is not None and expires_at > self.clock()
+        CACHE_NEGATIVE_LOOKUPS.labels(namespace, "hit" if found else "miss").inc()
+        return found
+
+    async def add(self, namespace: str, name: str):
+        """Remember that a name failed.
+
+        Args:
+            namespace: Kind of name (e.g. "city")
+            name: Name as looked up
+        """
+        ttl = self.ttl.get(namespace)
+        if not ttl:
+            return
+        now = self.clock()
+        evicted = await cache_service.zadd_capped(
+            self._key(namespace),
+            self._member(name),
+            now + ttl,
+            max_size=self.max_entries,
+            ttl=ttl,
+            floor=now,
+        )
+        if evicted is None:
+            return
+        CACHE_NEGATIVE_STORES.labels(namespace).inc()
+        if evicted:
+            CACHE_NEGATIVE_EVICTIONS.labels(namespace).inc(evicted)
+            logger.debug(f"Negative cache {namespace} full, dropped {evicted} entries")
+
+
+negative_cache = NegativeCache(
+    ttl={"city": settings.CACHE_NEGATIVE_TTL_CITY},
+    max_entries=settings.CACHE_NEGATIVE_MAX_ENTRIES,
+)
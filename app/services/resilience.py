@@ -0,0 +1,250 @@
+"""Retry, retry-budget and circuit-breaker policies for upstream calls."""
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, TypeVar
+
+from app.core.metrics import (
+    UPSTREAM_CIRCUIT_STATE,
+    UPSTREAM_CIRCUIT_TRANSITIONS,
+    UPSTREAM_RETRIES,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+class Backoff:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, base: float, maximum: float):
+        self.base = base
+        self.maximum = maximum
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay before retry number ``attempt`` (0-based).
+
+        Args:
+            attempt: Number of retries already made
+
+        Returns:
+            Delay in seconds, uniformly drawn from [0, min(maximum, base * 2**attempt)]
+        """
+        return random.uniform(0, min(self.maximum, self.base * (2**attempt)))
+
+
+class RetryBudget:
+    """Cap retries at a share of calls over a sliding window.
+
+    A retry is allowed while retries in the window stay below
+    ``max(min_retries, ratio * calls)``, so a degraded upstream sees at most
+    ``1 + ratio`` times its normal load instead of ``max_attempts`` times.
+    """
+
+    def __init__(
+        self,
+        ratio: float,
+        min_retries: int,
+        window: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._clock = clock
+        self._calls: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+
+    def _prune(self, now: float):
+        """Drop events that left the window."""
+        cutoff = now - self.window
+        for events in (self._calls, self._retries):
+            while events and events[0] < cutoff:
+                events.popleft()
+
+    def record_call(self):
+        """Record a first attempt."""
+        self._calls.append(self._clock())
+
+    def try_acquire(self) -> bool:
+        """Reserve a retry if the budget allows it.
+
+        Returns:
+            True if the retry may proceed
+        """
+        now = self._clock()
+        self._prune(now)
+        if len(self._retries) >= max(self.min_retries, self.ratio * len(self._calls)):
+            return False
+        self._retries.append(now)
+        return True
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a half-open probe phase."""
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        UPSTREAM_CIRCUIT_STATE.labels(name).set(self._STATE_VALUES[self.CLOSED])
+
+    @property
+    def state(self) -> str:
+        """Current breaker state."""
+        return self._state
+
+    def _transition(self, state: str):
+        """Move to ``state`` and export the transition."""
+        if state == self._state:
+            return
+        logger.warning(f"Circuit breaker '{self.name}' {self._state} -> {state}")
+        UPSTREAM_CIRCUIT_TRANSITIONS.labels(self.name, self._state, state).inc()
+        UPSTREAM_CIRCUIT_STATE.labels(self.name).set(self._STATE_VALUES[state])
+        self._state = state
+        if state == self.OPEN:
+            self._opened_at = self._clock()
+        if state != self.HALF_OPEN:
+            self._half_open_calls = 0
+
+    def raise_if_open(self):
+        """Reject a call while the breaker is open, without changing state.
+
+        Raises:
+            CircuitOpenError: If the breaker is open and still recovering
+        """
+        if self._state == self.OPEN and self._clock() - self._opened_at < self.recovery_timeout:
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+
+    def before_call(self):
+        """Admit or reject a call.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with all
+                probe slots taken
+        """
+        if self._state == self.OPEN:
+            self.raise_if_open()
+            self._transition(self.HALF_OPEN)
+
+        if self._state == self.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                raise CircuitOpenError(f"Circuit '{self.name}' is half-open")
+            self._half_open_calls += 1
+
+    def release_call(self):
+        """Give back the probe slot of a half-open call that ended without an outcome."""
+        if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_success(self):
+        """Record a call that reached a healthy upstream."""
+        self._failures = 0
+        self._transition(self.CLOSED)
+
+    def record_failure(self):
+        """Record a call that failed because of the upstream."""
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._transition(self.OPEN)
+
+
+class ResiliencePolicy:
+    """Run a call with backoff retries, a retry budget and a circuit breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int,
+        backoff: Backoff,
+        budget: RetryBudget,
+        breaker: CircuitBreaker,
+        is_retryable: Callable[[Exception], bool],
+    ):
+        self.name = name
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.budget = budget
+        self.breaker = breaker
+        self.is_retryable = is_retryable
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        gate: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> T:
+        """Call ``fn`` under this policy.
+
+        Exceptions for which ``is_retryable`` is False (e.g. a 404) are raised
+        immediately and count as a healthy upstream response.
+
+        Args:
+            fn: Zero-argument coroutine function performing one attempt
+            gate: Optional coroutine function awaited before every attempt
+                (e.g. a quota scheduler); its errors propagate unchanged
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: If the breaker rejects the call
+            Exception: The last attempt's error once retries are exhausted
+        """
+        self.budget.record_call()
+        attempt = 0
+        while True:
+            if gate is not None:
+                self.breaker.raise_if_open()
+                await gate()
+            self.breaker.before_call()
+            try:
+                result = await fn()
+            except Exception as e:
+                if not self.is_retryable(e):
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                logger.warning(
+                    f"Upstream error on attempt {attempt + 1}/{self.max_attempts}: {e}"
+                )
+                if attempt + 1 >= self.max_attempts:
+                    raise
+                if not self.budget.try_acquire():
+                    UPSTREAM_RETRIES.labels(self.name, "budget_exhausted").inc()
+                    raise
+                UPSTREAM_RETRIES.labels(self.name, "retried").inc()
+                await asyncio.sleep(self.backoff.delay(attempt))
+                attempt += 1
+            except BaseException:
+                # Cancelled (client gone, timeout, shutdown): no verdict on the upstream
+                self.breaker.release_call()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
@@ -0,0 +1,57 @@
+"""Single-flight coalescing of concurrent cache misses."""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, TypeVar
+
+from app.core.metrics import SINGLEFLIGHT_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Run at most one in-flight fetch per key and share its outcome.
+
+    The first caller for a key (the leader) starts the fetch as a task; callers
+    arriving while it is still running await the same task and receive its
+    result or exception. The fetch runs detached from the leader, so a leader
+    that is cancelled (e.g. client disconnect) does not fail the others.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._calls: Dict[str, "asyncio.Task[T]"] = {}
+
+    def in_flight(self, key: str) -> bool:
+        """Return whether a fetch for ``key`` is currently running."""
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for ``key`` unless a call for it is already in flight.
+
+        Args:
+            key: Coalescing key (the cache key of the fetched entry)
+            fn: Zero-argument coroutine function performing the fetch
+
+        Returns:
+            Result of the single shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            SINGLEFLIGHT_REQUESTS.labels(self.namespace, "leader").inc()
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            SINGLEFLIGHT_REQUESTS.labels(self.namespace, "coalesced").inc()
+            logger.debug(f"Coalesced {self.namespace} fetch for key: {key}")
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Task[T]"):
+        """Drop a finished call and mark its exception as retrieved."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()
@@ -1,45 +1,67 @@
 """Timezone service for handling timezone operations."""
 import hashlib
-import json
 import logging
 from datetime import datetime
+from typing import Union
 
 import pytz
 
-from app.core.config import settings
+from app.core.metrics import CACHE_NEGATIVE_REJECTIONS
 from app.schemas.timezone import TimezoneResponse
 from app.services.cache import cache_service
+from app.services.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Names pytz.timezone accepts (case-insensitively), checked in-process
+KNOWN_TIMEZONES = frozenset(name.lower() for name in pytz.all_timezones)
+
 
 class TimezoneService:
     """Service for timezone operations."""
 
+    def __init__(self):
+        self._flights = SingleFlight("timezone")
+
     def _generate_cache_key(self, timezone: str) -> str:
         """Generate cache key for timezone."""
         return f"timezone:{hashlib.md5(timezone.encode()).hexdigest()}"
 
-    async def get_timezone_info(self, timezone: str) -> TimezoneResponse:
+    async def get_timezone_info(
+        self, timezone: str, as_json: bool = False
+    ) -> Union[TimezoneResponse, str]:
         """Get timezone information.
 
         Args:
             timezone: Timezone name (e.g., 'America/New_York')
+            as_json: Return cache hits as the cached JSON text, without
+                building the model
 
         Returns:
-            TimezoneResponse with timezone information
+            TimezoneResponse with timezone information, or its JSON text
 
         Raises:
             ValueError: If timezone is invalid
         """
+        if timezone.lower() not in KNOWN_TIMEZONES:
+            CACHE_NEGATIVE_REJECTIONS.labels("timezone").inc()
+            raise ValueError(f"Unknown timezone: {timezone}")
+
         # Check cache
         cache_key = self._generate_cache_key(timezone)
         cached_data = await cache_service.get(cache_key)
         if cached_data:
             logger.info(f"Cache hit for timezone: {timezone}")
-            data = json.loads(cached_data)
-            return TimezoneResponse(**data)
+            if as_json:
+                return cached_data
+            return TimezoneResponse.model_validate_json(cached_data)
+
+        return await self._flights.do(
+            cache_key, lambda: self._build_timezone_info(timezone, cache_key)
+        )
 
+    async def _build_timezone_info(self, timezone: str, cache_key: str) -> TimezoneResponse:
+        """Compute timezone information and cache it."""
         try:
             # Get timezone
             tz = pytz.timezone(timezone)
@@ -0,0 +1,67 @@
+"""Cache TTLs aligned to the upstream's publication cadence."""
+import logging
+import time
+from typing import Callable, Optional
+
+from app.core.metrics import CACHE_OBSERVATION_AGE, CACHE_TTL_ASSIGNED, CACHE_TTL_CLAMPED
+
+logger = logging.getLogger(__name__)
+
+
+class TTLPolicy:
+    """Compute how long an upstream payload stays fresh.
+
+    The provider publishes new data every ``cadence`` seconds. A payload
+    anchored at ``observed_at`` (its observation or period start time) is
+    superseded at ``observed_at + cadence``, and the new data becomes
+    available ``publish_delay`` seconds later. The TTL runs until then,
+    clamped to ``[min_ttl, max_ttl]``. Payloads without an anchor, or a
+    policy with no cadence, get ``default_ttl``.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        cadence: int,
+        publish_delay: int,
+        min_ttl: int,
+        max_ttl: int,
+        default_ttl: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.namespace = namespace
+        self.cadence = cadence
+        self.publish_delay = publish_delay
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.default_ttl = default_ttl
+        self.clock = clock
+
+    def ttl(self, observed_at: Optional[int], cache_key: str = "") -> int:
+        """Return the fresh TTL for a payload.
+
+        Args:
+            observed_at: Unix time the payload's data refers to
+            cache_key: Cache key the TTL is for, used in debug logging
+
+        Returns:
+            TTL in seconds
+        """
+        if observed_at is None or self.cadence <= 0:
+            CACHE_TTL_CLAMPED.labels(self.namespace, "default").inc()
+            ttl = self.default_ttl
+        else:
+            now = self.clock()
+            age = now - observed_at
+            CACHE_OBSERVATION_AGE.labels(self.namespace).observe(max(age, 0))
+            ttl = int(observed_at + self.cadence + self.publish_delay - now)
+            if ttl < self.min_ttl:
+                CACHE_TTL_CLAMPED.labels(self.namespace, "min").inc()
+                ttl = self.min_ttl
+            elif ttl > self.max_ttl:
+                CACHE_TTL_CLAMPED.labels(self.namespace, "max").inc()
+                ttl = self.max_ttl
+            logger.debug(f"TTL for {cache_key or self.namespace}: {ttl}s (data {age:.0f}s old)")
+
+        CACHE_TTL_ASSIGNED.labels(self.namespace).observe(ttl)
+        return ttl
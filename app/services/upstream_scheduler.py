@@ -0,0 +1,189 @@
+"""Quota-aware scheduler for outbound weather API calls."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import (
+    UPSTREAM_SCHEDULER_QUEUE_DEPTH,
+    UPSTREAM_SCHEDULER_REJECTED,
+    UPSTREAM_SCHEDULER_WAIT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Upstream call priority classes (lower values are served first)."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+    WARMUP = 2
+
+
+class UpstreamThrottledError(Exception):
+    """Raised when the scheduler cannot grant an upstream call in time."""
+
+
+class UpstreamQueueFullError(UpstreamThrottledError):
+    """Raised when the scheduler queue is at capacity."""
+
+
+class UpstreamQueueTimeoutError(UpstreamThrottledError):
+    """Raised when a queued call misses its deadline."""
+
+
+class UpstreamScheduler:
+    """Token bucket in front of the upstream with a bounded priority queue.
+
+    Calls take a token immediately when one is available and nobody is
+    queued; otherwise they wait in a heap ordered by priority, then arrival,
+    and are released as tokens refill. The bucket refills at
+    ``(calls_per_minute - burst) / 60`` tokens per second so that a full
+    burst plus a minute of refill never exceeds the provider's quota.
+
+    The bucket is per process while the provider's quota is per API key, so
+    with several workers ``calls_per_minute`` must be each worker's share.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: int,
+        burst: int,
+        max_queue: int,
+        timeouts: Dict[Priority, float],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.enabled = calls_per_minute > 0
+        self.capacity = max(1, min(burst, calls_per_minute))
+        self.rate = max(calls_per_minute - self.capacity, 1) / 60.0
+        self.max_queue = max_queue
+        self.timeouts = timeouts
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._queued: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls currently waiting for a token."""
+        return sum(self._queued.values())
+
+    def _refill(self, now: float):
+        """Add tokens accrued since the last update."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _take(self, now: float) -> bool:
+        """Take a token if one is available."""
+        self._refill(now)
+        if now < self._paused_until or self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _set_depth(self, priority: Priority, delta: int):
+        """Adjust and export the queue depth of a priority class."""
+        self._queued[priority] += delta
+        UPSTREAM_SCHEDULER_QUEUE_DEPTH.labels(priority.name.lower()).set(self._queued[priority])
+
+    async def acquire(
+        self,
+        priority: Priority = Priority.INTERACTIVE,
+        timeout: Optional[float] = None,
+    ):
+        """Wait for permission to make one upstream call.
+
+        Args:
+            priority: Priority class of the call
+            timeout: Maximum wait in seconds (defaults to the class timeout)
+
+        Raises:
+            UpstreamQueueFullError: If the queue is at capacity
+            UpstreamQueueTimeoutError: If no token was granted before the deadline
+        """
+        if not self.enabled:
+            return
+
+        label = priority.name.lower()
+        if not self._waiters and self._take(self._clock()):
+            UPSTREAM_SCHEDULER_WAIT.labels(label).observe(0)
+            return
+
+        if self.queue_depth >= self.max_queue:
+            UPSTREAM_SCHEDULER_REJECTED.labels(label, "queue_full").inc()
+            raise UpstreamQueueFullError("Upstream request queue is full")
+
+        started = self._clock()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._set_depth(priority, 1)
+        self._schedule_dispatch()
+        try:
+            await asyncio.wait_for(future, timeout or self.timeouts[priority])
+        except asyncio.TimeoutError:
+            UPSTREAM_SCHEDULER_REJECTED.labels(label, "deadline").inc()
+            raise UpstreamQueueTimeoutError("Timed out waiting for upstream quota")
+        finally:
+            self._set_depth(priority, -1)
+        UPSTREAM_SCHEDULER_WAIT.labels(label).observe(self._clock() - started)
+
+    def penalize(self, delay: float):
+        """Stop granting tokens for ``delay`` seconds (e.g. after a 429).
+
+        Args:
+            delay: Pause in seconds
+        """
+        now = self._clock()
+        self._refill(now)
+        self._tokens = 0
+        self._paused_until = max(self._paused_until, now + delay)
+        logger.warning(f"Upstream quota exceeded, pausing calls for {delay:.1f}s")
+        self._schedule_dispatch()
+
+    def _schedule_dispatch(self):
+        """Arm the timer that releases queued calls as tokens refill."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._waiters:
+            return
+
+        now = self._clock()
+        self._refill(now)
+        delay = max(self._paused_until - now, (1 - self._tokens) / self.rate, 0)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _dispatch(self):
+        """Release queued calls in priority order while tokens are available."""
+        self._timer = None
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._take(self._clock()):
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+        self._schedule_dispatch()
+
+
+upstream_scheduler = UpstreamScheduler(
+    calls_per_minute=settings.WEATHER_API_CALLS_PER_MINUTE,
+    burst=settings.WEATHER_API_BURST,
+    max_queue=settings.WEATHER_API_QUEUE_MAX_SIZE,
+    timeouts={
+        Priority.INTERACTIVE: settings.WEATHER_API_QUEUE_TIMEOUT_INTERACTIVE,
+        Priority.BACKGROUND: settings.WEATHER_API_QUEUE_TIMEOUT_BACKGROUND,
+        Priority.WARMUP: settings.WEATHER_API_QUEUE_TIMEOUT_BACKGROUND,
+    },
+)
@@ -1,39 +1,115 @@
 """Weather API client service."""
+import asyncio
 import hashlib
 import json
 import logging
-from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import httpx
 
 from app.core.config import settings
-from app.schemas.weather import (
-    CurrentWeatherResponse,
-    DailyForecast,
-    ForecastResponse,
-    TemperatureRange,
-)
+from app.core.metrics import CACHE_BACKGROUND_REFRESHES, CACHE_STALE_SERVED
+from app.schemas.weather import CurrentWeatherResponse, ForecastResponse, TemperatureRange
 from app.services.cache import cache_service
+from app.services.cache_refresher import cache_refresher
+from app.services.forecast_engine import aggregate_daily
+from app.services.group_batcher import GroupBatcher, GroupMissError
+from app.services.http_client import upstream_client
+from app.services.location_resolver import location_resolver
+from app.services.negative_cache import negative_cache
+from app.services.resilience import (
+    Backoff,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResiliencePolicy,
+    RetryBudget,
+)
+from app.services.single_flight import SingleFlight
+from app.services.ttl_policy import TTLPolicy
+from app.services.upstream_scheduler import Priority, UpstreamThrottledError, upstream_scheduler
 from app.services.weather_messages import get_witty_message
+from app.utils.units import CANONICAL_UNITS, convert_speed, convert_temperature
 
 logger = logging.getLogger(__name__)
 
 
+class CityNotFoundError(ValueError):
+    """The upstream does not know the requested city (HTTP 404)."""
+
+
+def is_retryable_upstream_error(error: Exception) -> bool:
+    """Return whether an upstream error is transient and worth retrying.
+
+    Transport errors, 5xx responses and 429 (quota) responses are retryable;
+    other 4xx responses are answers about the request itself.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(error, httpx.TransportError)
+
+
+def is_quota_error(error: Exception) -> bool:
+    """Return whether an upstream error means calls are refused for now, whatever the city."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429
+    return isinstance(error, (CircuitOpenError, UpstreamThrottledError))
+
+
 class WeatherClient:
     """Client for interacting with OpenWeatherMap API."""
 
     def __init__(self):
-        self.base_url = settings.WEATHER_API_BASE_URL
         self.api_key = settings.WEATHER_API_KEY
-        self.timeout = settings.WEATHER_API_TIMEOUT
         self.max_retries = settings.WEATHER_API_MAX_RETRIES
+        self._policy = ResiliencePolicy(
+            name="weather-api",
+            max_attempts=self.max_retries,
+            backoff=Backoff(settings.WEATHER_API_BACKOFF_BASE, settings.WEATHER_API_BACKOFF_MAX),
+            budget=RetryBudget(
+                ratio=settings.WEATHER_API_RETRY_BUDGET_RATIO,
+                min_retries=settings.WEATHER_API_RETRY_BUDGET_MIN_RETRIES,
+                window=settings.WEATHER_API_RETRY_BUDGET_WINDOW,
+            ),
+            breaker=CircuitBreaker(
+                name="weather-api",
+                failure_threshold=settings.WEATHER_API_BREAKER_FAILURE_THRESHOLD,
+                recovery_timeout=settings.WEATHER_API_BREAKER_RECOVERY_TIMEOUT,
+                half_open_max_calls=settings.WEATHER_API_BREAKER_HALF_OPEN_MAX_CALLS,
+            ),
+            is_retryable=is_retryable_upstream_error,
+        )
+        self._current_ttl = TTLPolicy(
+            namespace="weather-current",
+            cadence=settings.CACHE_TTL_CURRENT_CADENCE,
+            publish_delay=settings.CACHE_TTL_PUBLISH_DELAY,
+            min_ttl=settings.CACHE_TTL_CURRENT_MIN,
+            max_ttl=settings.CACHE_TTL_CURRENT_MAX,
+            default_ttl=settings.CACHE_TTL,
+        )
+        self._forecast_ttl = TTLPolicy(
+            namespace="weather-forecast",
+            cadence=settings.CACHE_TTL_FORECAST_CADENCE,
+            publish_delay=settings.CACHE_TTL_PUBLISH_DELAY,
+            min_ttl=settings.CACHE_TTL_FORECAST_MIN,
+            max_ttl=settings.CACHE_TTL_FORECAST_MAX,
+            default_ttl=settings.CACHE_TTL,
+        )
+        self._current_flights = SingleFlight("weather-current")
+        self._forecast_flights = SingleFlight("weather-forecast")
+        self._refreshes: Dict[str, asyncio.Task] = {}
+        self._group_batcher = GroupBatcher(
+            self._fetch_group,
+            window=settings.WEATHER_GROUP_BATCH_WINDOW_MS / 1000,
+            max_size=settings.WEATHER_GROUP_BATCH_MAX_SIZE,
+        )
 
     def _generate_cache_key(self, endpoint: str, params: Dict[str, Any]) -> str:
-        """Generate cache key for request."""
+        """Generate cache key for request, namespaced by endpoint."""
         key_string = f"{endpoint}:{json.dumps(params, sort_keys=True)}"
-        return f"weather:{hashlib.md5(key_string.encode()).hexdigest()}"
+        return f"weather:{endpoint}:{hashlib.md5(key_string.encode()).hexdigest()}"
 
     def _build_location_query(self, city: str, country_code: Optional[str] = None) -> str:
         """Build location query string."""
@@ -41,21 +117,248 @@ class WeatherClient:
             return f"{city},{country_code}"
         return city
 
+    def _cache_key(self, endpoint: str, alias: str, city_id: Optional[int]) -> str:
+        """Build the cache key for a location.
+
+        Entries are keyed by canonical city id once it is known, so that every
+        alias of a city shares one entry; the API key is never part of the key.
+        Units are not either: entries hold the canonical representation and
+        are converted per request.
+        """
+        if city_id is not None:
+            return self._generate_cache_key(endpoint, {"id": city_id})
+        return self._generate_cache_key(endpoint, {"q": alias})
+
+    def _cache_tags(self, alias: str, city_id: Optional[int]) -> List[str]:
+        """Tags of a cache entry, for purging by location.
+
+        Whole endpoints are invalidated by bumping their namespace instead.
+        """
+        return [f"location:{city_id}" if city_id is not None else f"alias:{alias}"]
+
+    def _query_params(self, alias: str, city_id: Optional[int]) -> Dict[str, Any]:
+        """Build upstream query parameters, preferring the canonical city id."""
+        params: Dict[str, Any] = {"id": city_id} if city_id is not None else {"q": alias}
+        params.update(appid=self.api_key, units=CANONICAL_UNITS)
+        return params
+
+    def _localize_current(
+        self, result: CurrentWeatherResponse, units: str
+    ) -> CurrentWeatherResponse:
+        """Convert canonical current weather to the requested units."""
+        if units == result.units:
+            return result
+        return result.model_copy(
+            update={
+                "temperature": round(
+                    convert_temperature(result.temperature, result.units, units), 2
+                ),
+                "feels_like": round(convert_temperature(result.feels_like, result.units, units), 2),
+                "wind_speed": round(convert_speed(result.wind_speed, result.units, units), 2),
+                "units": units,
+            }
+        )
+
+    def _localize_forecast(self, result: ForecastResponse, units: str) -> ForecastResponse:
+        """Convert a canonical forecast to the requested units."""
+        if units == result.units:
+            return result
+
+        def temperature(value: float) -> float:
+            return round(convert_temperature(value, result.units, units), 1)
+
+        forecast = [
+            day.model_copy(
+                update={
+                    "temperature": TemperatureRange(
+                        min=temperature(day.temperature.min),
+                        max=temperature(day.temperature.max),
+                        avg=temperature(day.temperature.avg),
+                    ),
+                    "wind_speed": round(convert_speed(day.wind_speed, result.units, units), 1),
+                }
+            )
+            for day in result.forecast
+        ]
+        return result.model_copy(update={"units": units, "forecast": forecast})
+
+    def _is_stale(self, ttl: int, stale_ttl: int) -> bool:
+        """Check whether an entry has entered its stale window."""
+        return 0 <= ttl <= stale_ttl and stale_ttl > 0
+
+    def _schedule_refresh(
+        self,
+        flights: SingleFlight,
+        cache_key: str,
+        fetch: Callable[[], Awaitable[Any]],
+    ):
+        """Refresh a stale entry in the background, at most once per key."""
+        CACHE_STALE_SERVED.labels(flights.namespace).inc()
+        if cache_key in self._refreshes or flights.in_flight(cache_key):
+            return
+
+        task = asyncio.create_task(flights.do(cache_key, fetch))
+        self._refreshes[cache_key] = task
+        task.add_done_callback(
+            lambda done: self._refresh_done(flights.namespace, cache_key, done)
+        )
+
+    def _refresh_done(self, namespace: str, cache_key: str, task: asyncio.Task):
+        """Record the outcome of a background refresh."""
+        self._refreshes.pop(cache_key, None)
+        if task.cancelled():
+            CACHE_BACKGROUND_REFRESHES.labels(namespace, "cancelled").inc()
+        elif task.exception() is not None:
+            CACHE_BACKGROUND_REFRESHES.labels(namespace, "error").inc()
+            logger.warning(f"Background refresh failed for {cache_key}: {task.exception()}")
+        else:
+            CACHE_BACKGROUND_REFRESHES.labels(namespace, "success").inc()
+
+    def _forecast_period_start(self, data: Dict[str, Any]) -> Optional[int]:
+        """Start of the forecast period the payload was published for.
+
+        The forecast rolls forward when its first slot begins, so the payload
+        is anchored one publication cadence before that slot.
+        """
+        items = data.get("list") or []
+        if not items:
+            return None
+        return items[0]["dt"] - settings.CACHE_TTL_FORECAST_CADENCE
+
+    def _record_lookup(
+        self,
+        flights: SingleFlight,
+        cache_key: str,
+        fetch: Callable[..., Awaitable[Any]],
+        stale_ttl: int,
+        cached_data: Optional[str],
+    ):
+        """Report a cache lookup to the popularity-driven refresher."""
+        cache_refresher.record(
+            flights.namespace,
+            cache_key,
+            partial(flights.do, cache_key, partial(fetch, priority=Priority.BACKGROUND)),
+            stale_ttl,
+            hit=bool(cached_data),
+        )
+
+    def _retry_after(self, response: httpx.Response) -> float:
+        """Return the pause requested by a 429 response."""
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return settings.WEATHER_API_QUOTA_PAUSE
+
+    async def _get_json(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        location: str,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Dict[str, Any]:
+        """Call the weather API through the shared client, with retries.
+
+        Every attempt first waits for a quota token from the upstream scheduler.
+
+        Args:
+            endpoint: API endpoint name (e.g. 'weather', 'forecast')
+            params: Query parameters
+            location: Location query, used in error messages
+            priority: Scheduling priority of the call
+
+        Returns:
+            Decoded JSON payload
+
+        Raises:
+            CityNotFoundError: If the city is not found
+            CircuitOpenError: If the upstream circuit breaker is open
+            UpstreamThrottledError: If no quota token was granted in time
+            httpx.HTTPError: If all attempts fail, or the body is not JSON
+        """
+        async def attempt() -> Dict[str, Any]:
+            response = await upstream_client.get(f"/{endpoint}", params=params)
+            if response.status_code == 429:
+                upstream_scheduler.penalize(self._retry_after(response))
+            response.raise_for_status()
+            try:
+                return response.json()
+            except ValueError as e:
+                # Not a ValueError, which would read as a bad request
+                raise httpx.DecodingError(
+                    f"Malformed upstream response: {e}", request=response.request
+                ) from e
+
+        try:
+            return await self._policy.call(
+                attempt, gate=partial(upstream_scheduler.acquire, priority)
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise CityNotFoundError(f"City not found: {location}")
+            raise
+
+    async def _get_location_json(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        location: str,
+        alias: str,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Dict[str, Any]:
+        """Call the weather API for a location, remembering cities it does not know.
+
+        Raises:
+            CityNotFoundError: If the city is not found, or was not found recently
+        """
+        if await negative_cache.contains("city", alias):
+            logger.info(f"Negative cache hit for city: {location}")
+            raise CityNotFoundError(f"City not found: {location}")
+        try:
+            return await self._get_json(endpoint, params, location, priority)
+        except CityNotFoundError:
+            await negative_cache.add("city", alias)
+            raise
+
+    async def _fetch_group(
+        self, city_ids: List[int], units: str, priority: Priority
+    ) -> List[Dict[str, Any]]:
+        """Fetch current weather for several city ids in one upstream call.
+
+        Args:
+            city_ids: OpenWeatherMap city ids (at most 20)
+            units: Temperature units
+            priority: Scheduling priority of the call
+
+        Returns:
+            Raw per-city payloads, shaped like the single-city endpoint's
+        """
+        params = {
+            "id": ",".join(str(city_id) for city_id in city_ids),
+            "appid": self.api_key,
+            "units": units,
+        }
+        data = await self._get_json("group", params, f"city ids {params['id']}", priority)
+        return data["list"]
+
     async def get_current_weather(
         self,
         city: str,
         country_code: Optional[str] = None,
         units: str = "metric",
-    ) -> CurrentWeatherResponse:
+        as_json: bool = False,
+    ) -> Union[CurrentWeatherResponse, str]:
         """Fetch current weather data.
 
         Args:
             city: City name
             country_code: ISO 3166 country code (optional)
-            units: Temperature units (metric or imperial)
+            units: Temperature units (metric, imperial or standard)
+            as_json: Return cache hits in canonical units as the cached JSON
+                text, without building the model
 
         Returns:
-            CurrentWeatherResponse with weather data and witty message
+            CurrentWeatherResponse with weather data and witty message, or its
+            JSON text
 
         Raises:
             ValueError: If validation fails
@@ -65,106 +368,201 @@ class WeatherClient:
             raise ValueError("Weather API key not configured")
 
         location = self._build_location_query(city, country_code)
-        params = {
-            "q": location,
-            "appid": self.api_key,
-            "units": units,
-        }
+        alias = location_resolver.normalize(city, country_code)
+        city_id = await location_resolver.resolve(alias)
 
         # Check cache
-        cache_key = self._generate_cache_key("current", params)
-        cached_data = await cache_service.get(cache_key)
+        cache_key = self._cache_key("current", alias, city_id)
+        cached_data, ttl = await cache_service.get_with_ttl(cache_key)
+        return await self._serve_current_weather(
+            location, alias, city_id, units, cache_key, cached_data, ttl, as_json
+        )
+
+    async def get_current_weather_batch(
+        self,
+        locations: List[Tuple[str, Optional[str]]],
+        units: str = "metric",
+    ) -> List[Union[CurrentWeatherResponse, Exception]]:
+        """Fetch current weather for several locations.
+
+        Cache entries for all locations are read in a single Redis round-trip;
+        misses are fetched concurrently, at most WEATHER_BATCH_CONCURRENCY at a
+        time, through the same path as ``get_current_weather``.
+
+        Args:
+            locations: (city, country_code) pairs
+            units: Temperature units (metric, imperial or standard)
+
+        Returns:
+            One CurrentWeatherResponse or exception per location, in order
+
+        Raises:
+            ValueError: If the weather API key is not configured
+        """
+        if not self.api_key:
+            raise ValueError("Weather API key not configured")
+
+        queries = [
+            (
+                self._build_location_query(city, country_code),
+                location_resolver.normalize(city, country_code),
+            )
+            for city, country_code in locations
+        ]
+        city_ids = await location_resolver.resolve_many([alias for _, alias in queries])
+        cache_keys = [
+            self._cache_key("current", alias, city_id)
+            for (_, alias), city_id in zip(queries, city_ids)
+        ]
+        lookups = await cache_service.get_many_with_ttl(cache_keys)
+        semaphore = asyncio.Semaphore(settings.WEATHER_BATCH_CONCURRENCY)
+
+        async def load(index: int) -> CurrentWeatherResponse:
+            (location, alias), city_id = queries[index], city_ids[index]
+            cached_data, ttl = lookups[index]
+            if cached_data:
+                return await self._serve_current_weather(
+                    location, alias, city_id, units, cache_keys[index], cached_data, ttl
+                )
+            async with semaphore:
+                return await self._serve_current_weather(
+                    location, alias, city_id, units, cache_keys[index], None, ttl
+                )
+
+        logger.info(
+            f"Batch current weather: {len(locations)} locations, "
+            f"{sum(1 for cached_data, _ in lookups if cached_data)} cache hits"
+        )
+        return await asyncio.gather(
+            *(load(index) for index in range(len(queries))), return_exceptions=True
+        )
+
+    async def _serve_current_weather(
+        self,
+        location: str,
+        alias: str,
+        city_id: Optional[int],
+        units: str,
+        cache_key: str,
+        cached_data: Optional[str],
+        ttl: int,
+        as_json: bool = False,
+    ) -> Union[CurrentWeatherResponse, str]:
+        """Serve current weather in ``units`` from a cache lookup result, fetching on a miss."""
+        params = self._query_params(alias, city_id)
+        fetch = partial(self._fetch_current_weather, location, alias, params)
+        self._record_lookup(
+            self._current_flights,
+            cache_key,
+            fetch,
+            settings.CACHE_STALE_TTL_CURRENT,
+            cached_data,
+        )
         if cached_data:
             logger.info(f"Cache hit for current weather: {location}")
-            data = json.loads(cached_data)
-            return CurrentWeatherResponse(**data)
-
+            if self._is_stale(ttl, settings.CACHE_STALE_TTL_CURRENT):
+                self._schedule_refresh(
+                    self._current_flights,
+                    cache_key,
+                    partial(fetch, priority=Priority.BACKGROUND),
+                )
+            if as_json and units == CANONICAL_UNITS:
+                return cached_data
+            cached = CurrentWeatherResponse.model_validate_json(cached_data)
+            return self._localize_current(cached, units)
+
+        return self._localize_current(await self._current_flights.do(cache_key, fetch), units)
+
+    async def _fetch_current_weather(
+        self,
+        location: str,
+        alias: str,
+        params: Dict[str, Any],
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> CurrentWeatherResponse:
+        """Fetch canonical current weather from the upstream and cache it."""
         logger.info(f"Fetching current weather for: {location}")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            for attempt in range(self.max_retries):
-                try:
-                    response = await client.get(
-                        f"{self.base_url}/weather",
-                        params=params,
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-
-                    # Extract weather data
-                    condition = data["weather"][0]["main"]
-                    description = data["weather"][0]["description"]
-                    temp = data["main"]["temp"]
-                    feels_like = data["main"]["feels_like"]
-                    humidity = data["main"]["humidity"]
-                    wind_speed = data["wind"]["speed"]
-                    timestamp = datetime.utcfromtimestamp(data["dt"]).isoformat() + "Z"
-
-                    location_name = f"{data['name']}, {data['sys']['country']}"
-
-                    # Get witty message
-                    witty_message = get_witty_message(
-                        condition=condition,
-                        temperature=temp,
-                        wind_speed=wind_speed,
-                        units=units,
-                    )
-
-                    result = CurrentWeatherResponse(
-                        location=location_name,
-                        temperature=temp,
-                        feels_like=feels_like,
-                        humidity=humidity,
-                        description=description,
-                        condition=condition,
-                        wind_speed=wind_speed,
-                        timestamp=timestamp,
-                        units=units,
-                        witty_message=witty_message,
-                    )
-
-                    # Cache result
-                    await cache_service.set(
-                        cache_key,
-                        result.model_dump_json(),
-                        ttl=settings.CACHE_TTL,
-                    )
-
-                    return result
-
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 404:
-                        raise ValueError(f"City not found: {location}")
-                    logger.warning(
-                        f"HTTP error on attempt {attempt + 1}/{self.max_retries}: {e}"
-                    )
-                    if attempt == self.max_retries - 1:
-                        raise
-                except httpx.HTTPError as e:
-                    logger.warning(
-                        f"HTTP error on attempt {attempt + 1}/{self.max_retries}: {e}"
-                    )
-                    if attempt == self.max_retries - 1:
-                        raise
-                except Exception as e:
-                    logger.error(f"Unexpected error: {e}", exc_info=True)
+        data = None
+        if "id" in params and self._group_batcher.enabled:
+            try:
+                data = await self._group_batcher.fetch(params["id"], CANONICAL_UNITS, priority)
+            except GroupMissError as e:
+                logger.warning(f"{e}, fetching individually")
+            except Exception as e:
+                if is_quota_error(e):
                     raise
+                logger.warning(f"Group fetch failed ({e}), fetching city {params['id']} alone")
+        if data is None:
+            data = await self._get_location_json("weather", params, location, alias, priority)
+
+        city_id = data.get("id")
+        if city_id is not None:
+            await location_resolver.learn(alias, city_id)
+        cache_key = self._cache_key("current", alias, city_id)
+
+        # Extract weather data
+        condition = data["weather"][0]["main"]
+        description = data["weather"][0]["description"]
+        temp = data["main"]["temp"]
+        feels_like = data["main"]["feels_like"]
+        humidity = data["main"]["humidity"]
+        wind_speed = data["wind"]["speed"]
+        timestamp = datetime.utcfromtimestamp(data["dt"]).isoformat() + "Z"
+
+        location_name = f"{data['name']}, {data['sys']['country']}"
+
+        # Get witty message
+        witty_message = get_witty_message(
+            condition=condition,
+            temperature=temp,
+            wind_speed=wind_speed,
+            units=CANONICAL_UNITS,
+        )
+
+        result = CurrentWeatherResponse(
+            location=location_name,
+            temperature=temp,
+            feels_like=feels_like,
+            humidity=humidity,
+            description=description,
+            condition=condition,
+            wind_speed=wind_speed,
+            timestamp=timestamp,
+            units=CANONICAL_UNITS,
+            witty_message=witty_message,
+        )
+
+        # Cache result
+        fresh_ttl = self._current_ttl.ttl(data.get("dt"), cache_key)
+        await cache_service.set(
+            cache_key,
+            result.model_dump_json(),
+            ttl=fresh_ttl + settings.CACHE_STALE_TTL_CURRENT,
+            tags=self._cache_tags(alias, city_id),
+        )
+
+        return result
 
     async def get_forecast(
         self,
         city: str,
         country_code: Optional[str] = None,
         units: str = "metric",
-    ) -> ForecastResponse:
+        as_json: bool = False,
+    ) -> Union[ForecastResponse, str]:
         """Fetch 5-day weather forecast.
 
         Args:
             city: City name
             country_code: ISO 3166 country code (optional)
-            units: Temperature units (metric or imperial)
+            units: Temperature units (metric, imperial or standard)
+            as_json: Return cache hits in canonical units as the cached JSON
+                text, without building the model
 
         Returns:
-            ForecastResponse with 5-day forecast and witty messages
+            ForecastResponse with 5-day forecast and witty messages, or its
+            JSON text
 
         Raises:
             ValueError: If validation fails
@@ -174,121 +572,71 @@ class WeatherClient:
             raise ValueError("Weather API key not configured")
 
         location = self._build_location_query(city, country_code)
-        params = {
-            "q": location,
-            "appid": self.api_key,
-            "units": units,
-        }
+        alias = location_resolver.normalize(city, country_code)
+        city_id = await location_resolver.resolve(alias)
+        params = self._query_params(alias, city_id)
 
         # Check cache
-        cache_key = self._generate_cache_key("forecast", params)
-        cached_data = await cache_service.get(cache_key)
+        cache_key = self._cache_key("forecast", alias, city_id)
+        cached_data, ttl = await cache_service.get_with_ttl(cache_key)
+        fetch = partial(self._fetch_forecast, location, alias, params)
+        self._record_lookup(
+            self._forecast_flights,
+            cache_key,
+            fetch,
+            settings.CACHE_STALE_TTL_FORECAST,
+            cached_data,
+        )
         if cached_data:
             logger.info(f"Cache hit for forecast: {location}")
-            data = json.loads(cached_data)
-            return ForecastResponse(**data)
-
+            if self._is_stale(ttl, settings.CACHE_STALE_TTL_FORECAST):
+                self._schedule_refresh(
+                    self._forecast_flights,
+                    cache_key,
+                    partial(fetch, priority=Priority.BACKGROUND),
+                )
+            if as_json and units == CANONICAL_UNITS:
+                return cached_data
+            cached = ForecastResponse.model_validate_json(cached_data)
+            return self._localize_forecast(cached, units)
+
+        return self._localize_forecast(await self._forecast_flights.do(cache_key, fetch), units)
+
+    async def _fetch_forecast(
+        self,
+        location: str,
+        alias: str,
+        params: Dict[str, Any],
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> ForecastResponse:
+        """Fetch the canonical 5-day forecast from the upstream and cache it."""
         logger.info(f"Fetching 5-day forecast for: {location}")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            for attempt in range(self.max_retries):
-                try:
-                    response = await client.get(
-                        f"{self.base_url}/forecast",
-                        params=params,
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-
-                    location_name = f"{data['city']['name']}, {data['city']['country']}"
-
-                    # Group forecast data by date
-                    daily_data: Dict[str, List[Dict]] = defaultdict(list)
-                    for item in data["list"]:
-                        date = datetime.utcfromtimestamp(item["dt"]).strftime("%Y-%m-%d")
-                        daily_data[date].append(item)
-
-                    # Process daily forecasts (take first 5 days)
-                    forecasts = []
-                    for date in sorted(daily_data.keys())[:5]:
-                        day_items = daily_data[date]
-
-                        # Calculate temperature range
-                        temps = [item["main"]["temp"] for item in day_items]
-                        min_temp = min(temps)
-                        max_temp = max(temps)
-                        avg_temp = sum(temps) / len(temps)
-
-                        # Get most common weather condition
-                        conditions = [item["weather"][0]["main"] for item in day_items]
-                        condition = max(set(conditions), key=conditions.count)
-                        descriptions = [item["weather"][0]["description"] for item in day_items]
-                        description = max(set(descriptions), key=descriptions.count)
-
-                        # Calculate average humidity and wind speed
-                        humidity = sum(item["main"]["humidity"] for item in day_items) // len(
-                            day_items
-                        )
-                        wind_speed = sum(item["wind"]["speed"] for item in day_items) / len(
-                            day_items
-                        )
-
-                        # Get witty message
-                        witty_message = get_witty_message(
-                            condition=condition,
-                            temperature=avg_temp,
-                            wind_speed=wind_speed,
-                            units=units,
-                        )
-
-                        forecasts.append(
-                            DailyForecast(
-                                date=date,
-                                temperature=TemperatureRange(
-                                    min=round(min_temp, 1),
-                                    max=round(max_temp, 1),
-                                    avg=round(avg_temp, 1),
-                                ),
-                                description=description,
-                                condition=condition,
-                                humidity=humidity,
-                                wind_speed=round(wind_speed, 1),
-                                witty_message=witty_message,
-                            )
-                        )
-
-                    result = ForecastResponse(
-                        location=location_name,
-                        units=units,
-                        forecast=forecasts,
-                    )
-
-                    # Cache result
-                    await cache_service.set(
-                        cache_key,
-                        result.model_dump_json(),
-                        ttl=settings.CACHE_TTL,
-                    )
-
-                    return result
-
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 404:
-                        raise ValueError(f"City not found: {location}")
-                    logger.warning(
-                        f"HTTP error on attempt {attempt + 1}/{self.max_retries}: {e}"
-                    )
-                    if attempt == self.max_retries - 1:
-                        raise
-                except httpx.HTTPError as e:
-                    logger.warning(
-                        f"HTTP error on attempt {attempt + 1}/{self.max_retries}: {e}"
-                    )
-                    if attempt == self.max_retries - 1:
-                        raise
-                except Exception as e:
-                    logger.error(f"Unexpected error: {e}", exc_info=True)
-                    raise
+        data = await self._get_location_json("forecast", params, location, alias, priority)
+
+        city_id = data["city"].get("id")
+        if city_id is not None:
+            await location_resolver.learn(alias, city_id)
+        cache_key = self._cache_key("forecast", alias, city_id)
+
+        location_name = f"{data['city']['name']}, {data['city']['country']}"
+
+        result = ForecastResponse(
+            location=location_name,
+            units=CANONICAL_UNITS,
+            forecast=aggregate_daily(data["list"], CANONICAL_UNITS),
+        )
+
+        # Cache result
+        fresh_ttl = self._forecast_ttl.ttl(self._forecast_period_start(data), cache_key)
+        await cache_service.set(
+            cache_key,
+            result.model_dump_json(),
+            ttl=fresh_ttl + settings.CACHE_STALE_TTL_FORECAST,
+            tags=self._cache_tags(alias, city_id),
+        )
+
+        return result
 
 
 weather_client = WeatherClient()
\ No newline at end of file
@@ -2,6 +2,8 @@
 import random
 from typing import Dict, List
 
+from app.utils.units import CANONICAL_UNITS, convert_speed, convert_temperature
+
 # Weather messages organized by condition
 WEATHER_MESSAGES: Dict[str, List[str]] = {
     "Rain": [
@@ -79,20 +81,17 @@ def get_witty_message(
         condition: Main weather condition (e.g., 'Rain', 'Clear', 'Snow')
         temperature: Current temperature
         wind_speed: Wind speed
-        units: Temperature units (metric or imperial)
+        units: Units of temperature and wind speed (metric, imperial or standard)
 
     Returns:
         A humorous weather message
     """
-    # Determine temperature thresholds based on units
-    if units == "metric":
-        hot_threshold = 30  # 30°C
-        cold_threshold = 5  # 5°C
-        windy_threshold = 10  # 10 m/s
-    else:  # imperial
-        hot_threshold = 86  # 86°F
-        cold_threshold = 41  # 41°F
-        windy_threshold = 22  # 22 mph (approximately 10 m/s)
+    # Thresholds are defined in metric and apply to every unit system
+    temperature = convert_temperature(temperature, units, CANONICAL_UNITS)
+    wind_speed = convert_speed(wind_speed, units, CANONICAL_UNITS)
+    hot_threshold = 30  # 30°C
+    cold_threshold = 5  # 5°C
+    windy_threshold = 10  # 10 m/s
 
     # Check for special conditions
     if temperature > hot_threshold:
@@ -0,0 +1,24 @@
+"""Responses built from models or their cached JSON text."""
+from typing import Union
+
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def json_response(result: Union[BaseModel, str]) -> Response:
+    """Build a JSON response without FastAPI's response model round-trip.
+
+    Cache hits are served as the JSON text they were stored as, so the body
+    is sent as is instead of being parsed into a model, validated against
+    the route's ``response_model`` and serialized again. Models are
+    serialized once with ``model_dump_json``. The route keeps its
+    ``response_model`` for the OpenAPI schema.
+
+    Args:
+        result: Response model, or JSON text of one
+
+    Returns:
+        Response with the JSON body
+    """
+    body = result if isinstance(result, str) else result.model_dump_json()
+    return Response(content=body, media_type="application/json")
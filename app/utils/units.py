@@ -0,0 +1,77 @@
+"""Conversion between OpenWeatherMap unit systems."""
+
+# Representation weather data is fetched and cached in
+CANONICAL_UNITS = "metric"
+
+# OpenWeatherMap unit systems: temperature / wind speed
+#   standard: Kelvin / m/s
+#   metric: Celsius / m/s
+#   imperial: Fahrenheit / mph
+SUPPORTED_UNITS = ("metric", "imperial", "standard")
+
+KELVIN_OFFSET = 273.15
+METERS_PER_SECOND_PER_MPH = 0.44704
+
+
+def _check_units(units: str):
+    """Raise ValueError for unknown unit systems."""
+    if units not in SUPPORTED_UNITS:
+        raise ValueError(f"Unsupported units: {units}")
+
+
+def convert_temperature(value: float, from_units: str, to_units: str) -> float:
+    """Convert a temperature between unit systems.
+
+    Args:
+        value: Temperature in ``from_units``
+        from_units: Source unit system
+        to_units: Target unit system
+
+    Returns:
+        Temperature in ``to_units``
+
+    Raises:
+        ValueError: If a unit system is not supported
+    """
+    _check_units(from_units)
+    _check_units(to_units)
+    if from_units == to_units:
+        return value
+
+    if from_units == "imperial":
+        celsius = (value - 32) * 5 / 9
+    elif from_units == "standard":
+        celsius = value - KELVIN_OFFSET
+    else:
+        celsius = value
+
+    if to_units == "imperial":
+        return celsius * 9 / 5 + 32
+    if to_units == "standard":
+        return celsius + KELVIN_OFFSET
+    return celsius
+
+
+def convert_speed(value: float, from_units: str, to_units: str) -> float:
+    """Convert a wind speed between unit systems.
+
+    Args:
+        value: Speed in ``from_units``
+        from_units: Source unit system
+        to_units: Target unit system
+
+    Returns:
+        Speed in ``to_units``
+
+    Raises:
+        ValueError: If a unit system is not supported
+    """
+    _check_units(from_units)
+    _check_units(to_units)
+    if from_units == to_units:
+        return value
+
+    meters_per_second = value * METERS_PER_SECOND_PER_MPH if from_units == "imperial" else value
+    if to_units == "imperial":
+        return meters_per_second / METERS_PER_SECOND_PER_MPH
+    return meters_per_second
@@ -0,0 +1,133 @@
+"""Benchmark of single-key versus bulk CacheService operations.
+
+Writes, reads and deletes N keys one call at a time and with
+``set_many``/``get_many``/``delete_many``, and reports wall time and Redis
+round-trips for each. Against the in-process stand-in a round-trip time is
+simulated; pass ``--redis-url`` to measure a real server instead::
+
+    python -m benchmarks.cache_bulk --sizes 10,100,1000 --rtt-ms 0.5
+    python -m benchmarks.cache_bulk --redis-url redis://localhost:6379/15
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.services.cache import CacheService
+from tools.fake_redis import InMemoryRedis
+
+VALUE = json.dumps({"location": "London, GB", "temperature": 12.5, "humidity": 81})
+
+
+async def _timed(cache: CacheService, operation) -> Dict[str, Any]:
+    """Run one operation, returning its wall time and round-trips."""
+    client = cache.redis_client
+    round_trips = client.round_trips if isinstance(client, InMemoryRedis) else None
+    started = time.perf_counter()
+    await operation()
+    result = {"ms": round((time.perf_counter() - started) * 1000, 3)}
+    if round_trips is not None:
+        result["round_trips"] = client.round_trips - round_trips
+    return result
+
+
+async def run(
+    sizes: List[int], rtt: float = 0.0005, redis_url: Optional[str] = None
+) -> Dict[str, Any]:
+    """Benchmark single-key and bulk operations.
+
+    Args:
+        sizes: Numbers of keys to operate on
+        rtt: Simulated round-trip time for the stand-in, in seconds
+        redis_url: Redis server to use instead of the stand-in
+
+    Returns:
+        Results per size, operation and mode
+    """
+    cache = CacheService()
+    if redis_url:
+        import redis.asyncio as redis
+
+        cache.redis_client = redis.from_url(redis_url)
+    else:
+        cache.redis_client = InMemoryRedis(rtt=rtt)
+
+    results: Dict[str, Any] = {}
+    try:
+        for size in sizes:
+            keys = [f"benchmark:bulk:{size}:{i}" for i in range(size)]
+
+            async def set_each():
+                for key in keys:
+                    await cache.set(key, VALUE, ttl=60)
+
+            async def get_each():
+                for key in keys:
+                    await cache.get(key)
+
+            async def delete_each():
+                for key in keys:
+                    await cache.delete(key)
+
+            results[str(size)] = {
+                "set": {
+                    "single": await _timed(cache, set_each),
+                    "bulk": await _timed(
+                        cache, lambda: cache.set_many({key: (VALUE, 60) for key in keys})
+                    ),
+                },
+                "get": {
+                    "single": await _timed(cache, get_each),
+                    "bulk": await _timed(cache, lambda: cache.get_many(keys)),
+                },
+                "delete": {
+                    "single": await _timed(cache, delete_each),
+                    "bulk": await _timed(cache, lambda: cache.delete_many(keys)),
+                },
+            }
+    finally:
+        if redis_url:
+            await cache.redis_client.close()
+    return {
+        "backend": "server" if redis_url else f"in-process, {rtt * 1000:g} ms simulated RTT",
+        "sizes": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Single-key vs bulk cache operations")
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma-separated key counts")
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="Simulated round-trip time")
+    parser.add_argument("--redis-url", help="Use a Redis server instead of the stand-in")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = asyncio.run(run(sizes, rtt=args.rtt_ms / 1000, redis_url=args.redis_url))
+
+    print(f"Backend: {results['backend']}")
+    for size, operations in results["sizes"].items():
+        for operation, modes in operations.items():
+            single, bulk = modes["single"], modes["bulk"]
+            speedup = single["ms"] / bulk["ms"] if bulk["ms"] else float("inf")
+            trips = (
+                f" ({single['round_trips']} -> {bulk['round_trips']} round-trips)"
+                if "round_trips" in single
+                else ""
+            )
+            print(
+                f"{size:>6} keys {operation:<7} {single['ms']:>10.2f} ms -> "
+                f"{bulk['ms']:>8.2f} ms  x{speedup:.1f}{trips}"
+            )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
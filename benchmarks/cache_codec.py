@@ -0,0 +1,119 @@
+"""Stored size and decode cost of cached values per entry type and codec.
+
+For current weather, forecast and timezone entries, reports the stored value
+size and encode/decode time of each codec against the legacy plain-text
+format, and the cost of turning cached JSON back into a response model::
+
+    python -m benchmarks.cache_codec
+    python -m benchmarks.cache_codec --min-size 0 --output codec.json
+"""
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.schemas.timezone import TimezoneResponse
+from app.services.cache_codec import HAS_ZSTD, CacheCodec
+from benchmarks.micro import sample_current, sample_forecast
+
+
+def sample_timezone() -> TimezoneResponse:
+    """TimezoneResponse with fixed values."""
+    return TimezoneResponse(
+        timezone="America/New_York",
+        current_time="2023-11-14T17:13:20.123456-05:00",
+        utc_offset="-05:00",
+        is_dst=False,
+        abbreviation="EST",
+    )
+
+
+ENTRY_TYPES: Dict[str, Callable[[], Any]] = {
+    "current": sample_current,
+    "forecast": sample_forecast,
+    "timezone": sample_timezone,
+}
+
+
+def _ns_per_call(func: Callable[[], Any], repeat: int = 5) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return round(min(timer.repeat(repeat=repeat, number=number)) / number * 1e9, 1)
+
+
+def run(min_size: int = 512, levels: Optional[List[int]] = None) -> Dict[str, Any]:
+    """Measure every entry type with every available codec.
+
+    Args:
+        min_size: Compression threshold passed to the codecs
+        levels: Compression levels to measure
+
+    Returns:
+        Results per entry type
+    """
+    codecs = {"raw": CacheCodec("raw")}
+    for level in levels or [1, 6]:
+        codecs[f"zlib-{level}"] = CacheCodec("zlib", min_size=min_size, level=level)
+        if HAS_ZSTD:
+            codecs[f"zstd-{level}"] = CacheCodec("zstd", min_size=min_size, level=level)
+
+    results: Dict[str, Any] = {}
+    for name, build in ENTRY_TYPES.items():
+        model = build()
+        model_class = type(model)
+        text = model.model_dump_json()
+        legacy_bytes = len(text.encode())
+        entry: Dict[str, Any] = {
+            "legacy_bytes": legacy_bytes,
+            "parse": {
+                "json_loads_ns": _ns_per_call(lambda: model_class(**json.loads(text))),
+                "model_validate_json_ns": _ns_per_call(
+                    lambda: model_class.model_validate_json(text)
+                ),
+            },
+            "codecs": {},
+        }
+        for codec_name, codec in codecs.items():
+            stored = codec.encode(text)
+            entry["codecs"][codec_name] = {
+                "stored_bytes": len(stored),
+                "saved_pct": round((1 - len(stored) / legacy_bytes) * 100, 1),
+                "encode_ns": _ns_per_call(lambda: codec.encode(text)),
+                "decode_ns": _ns_per_call(lambda: codec.decode(stored)),
+            }
+        results[name] = entry
+    return {"min_size": min_size, "entry_types": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Cache value codec measurements")
+    parser.add_argument("--min-size", type=int, default=512, help="Compression threshold")
+    parser.add_argument("--levels", default="1,6", help="Comma-separated compression levels")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.min_size, [int(level) for level in args.levels.split(",")])
+    for name, entry in results["entry_types"].items():
+        parse = entry["parse"]
+        print(
+            f"{name}: {entry['legacy_bytes']} bytes as text; parse "
+            f"{parse['json_loads_ns'] / 1000:.1f} us (json.loads) -> "
+            f"{parse['model_validate_json_ns'] / 1000:.1f} us (model_validate_json)"
+        )
+        for codec_name, row in entry["codecs"].items():
+            print(
+                f"  {codec_name:<8} {row['stored_bytes']:>6} bytes "
+                f"({row['saved_pct']:+.1f}% saved)  encode {row['encode_ns'] / 1000:>6.2f} us  "
+                f"decode {row['decode_ns'] / 1000:>6.2f} us"
+            )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
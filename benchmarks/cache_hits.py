@@ -0,0 +1,97 @@
+"""CPU cost of serving a cache hit per response type.
+
+For current weather, forecast and timezone responses, times turning the
+cached JSON text into a response body the way the endpoints used to (parse
+it into the response model, then let FastAPI validate the model against the
+route's ``response_model``, convert it and render it with ``JSONResponse``)
+against sending the cached text as is::
+
+    python -m benchmarks.cache_hits
+    python -m benchmarks.cache_hits --output cache_hits.json
+"""
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.utils.responses import json_response
+from benchmarks.cache_codec import ENTRY_TYPES
+from benchmarks.micro import run_to_completion
+
+
+def _ns_per_call(func: Callable[[], Any], repeat: int = 5) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return round(min(timer.repeat(repeat=repeat, number=number)) / number * 1e9, 1)
+
+
+def model_path(model_class: Any) -> Callable[[str], bytes]:
+    """Response body of a cache hit built through the response model."""
+    field = create_response_field(name=f"Response_{model_class.__name__}", type_=model_class)
+
+    def serve(text: str) -> bytes:
+        model = model_class.model_validate_json(text)
+        content = run_to_completion(serialize_response(field=field, response_content=model))
+        return JSONResponse(content).body
+
+    return serve
+
+
+def raw_path(text: str) -> bytes:
+    """Response body of a cache hit sent as the cached text."""
+    return json_response(text).body
+
+
+def run() -> Dict[str, Any]:
+    """Measure both paths for every response type.
+
+    Returns:
+        Results per response type
+    """
+    results: Dict[str, Any] = {}
+    for name, build in ENTRY_TYPES.items():
+        model = build()
+        text = model.model_dump_json()
+        serve = model_path(type(model))
+        if json.loads(serve(text)) != json.loads(raw_path(text)):
+            raise RuntimeError(f"{name}: cached text and model response bodies differ")
+
+        model_ns = _ns_per_call(lambda: serve(text))
+        raw_ns = _ns_per_call(lambda: raw_path(text))
+        results[name] = {
+            "bytes": len(text.encode()),
+            "model_ns": model_ns,
+            "raw_ns": raw_ns,
+            "saved_ns": round(model_ns - raw_ns, 1),
+            "speedup": round(model_ns / raw_ns, 1),
+        }
+    return {"response_types": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Cache hit response cost")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run()
+    for name, row in results["response_types"].items():
+        print(
+            f"{name:<9} {row['bytes']:>6} bytes  model {row['model_ns'] / 1000:>7.2f} us -> "
+            f"raw {row['raw_ns'] / 1000:>5.2f} us  "
+            f"({row['saved_ns'] / 1000:.2f} us saved per hit, x{row['speedup']:.1f})"
+        )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
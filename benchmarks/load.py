@@ -0,0 +1,399 @@
+"""End-to-end load benchmark for the API.
+
+Drives ``app.main:app`` in-process through ``httpx.ASGITransport`` with a
+configurable traffic mix, against the local fake OpenWeatherMap upstream and
+either an in-process Redis stand-in or a real Redis server, and writes the
+results as JSON::
+
+    python -m benchmarks.load run --requests 5000 --concurrency 50 \\
+        --mix current=4,forecast=1,timezone=2,combined=1 --hit-ratio 0.9 \\
+        --upstream-latency lognormal:80:0.5 --output results/after.json
+
+    python -m benchmarks.load compare results/before.json results/after.json
+
+Hit ratios apply to weather traffic: a hit requests one of the pre-warmed hot
+cities, a miss a city never requested before. Timezone traffic is always
+served from the pre-warmed zones.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import platform
+import random
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from tools.fake_openweathermap import FakeUpstreamConfig, create_app, parse_latency
+from tools.fake_redis import InMemoryRedis
+
+ENDPOINTS = ("timezone", "current", "forecast", "combined")
+
+# Slash-free zone names: the timezone route does not accept "/" in its path parameter
+TIMEZONES = ["UTC", "Japan", "Singapore", "Iceland", "Egypt", "Turkey", "Poland", "Cuba"]
+
+# Metrics compared between runs, and whether a higher value is better
+COMPARED_METRICS = {
+    "rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "upstream_calls_per_request": False,
+    "redis_ops_per_request": False,
+}
+
+
+@dataclass
+class LoadOptions:
+    """Benchmark run configuration."""
+
+    requests: int = 2000
+    concurrency: int = 20
+    mix: Dict[str, float] = field(
+        default_factory=lambda: {"current": 4, "forecast": 1, "timezone": 2, "combined": 1}
+    )
+    hit_ratio: float = 0.9
+    hot_keys: int = 50
+    units: str = "metric"
+    seed: int = 0
+    redis_url: Optional[str] = None
+    upstream: Dict[str, Any] = field(default_factory=dict)
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse ``name=weight,...`` traffic mixes."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint '{name}' (one of {ENDPOINTS})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies: List[float], elapsed: Optional[float] = None) -> Dict[str, float]:
+    """Latency percentiles (ms) and, given the wall time, throughput."""
+    ordered = sorted(latencies)
+    summary = {
+        "requests": len(ordered),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+    if elapsed is not None:
+        summary["rps"] = round(len(ordered) / elapsed, 2) if elapsed > 0 else 0.0
+    return summary
+
+
+class RedisOps:
+    """Counts Redis commands, for the stand-in or a real server."""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def total(self) -> int:
+        """Commands executed so far."""
+        if isinstance(self.client, InMemoryRedis):
+            return self.client.total_commands
+        stats = await self.client.info("commandstats")
+        return sum(entry["calls"] for entry in stats.values())
+
+
+@asynccontextmanager
+async def benchmark_environment(options: LoadOptions) -> AsyncIterator[Tuple[Any, Any]]:
+    """Wire the application to the fake upstream and a cache backend.
+
+    Rate limiting and the upstream quota scheduler are disabled so that the
+    harness measures the service rather than its throttling. Everything that
+    is changed is restored on exit.
+
+    Yields:
+        The fake upstream application and a RedisOps counter
+    """
+    from app.api.v1 import combined, timezone as timezone_api, weather
+    from app.main import app
+    from app.services.cache import cache_service
+    from app.services.http_client import upstream_client
+    from app.services.upstream_scheduler import upstream_scheduler
+    from app.services.weather_client import weather_client
+
+    limiters = [app.state.limiter, combined.limiter, timezone_api.limiter, weather.limiter]
+    saved = {
+        "limiters": [limiter.enabled for limiter in limiters],
+        "scheduler": upstream_scheduler.enabled,
+        "redis_client": cache_service.redis_client,
+        "api_key": weather_client.api_key,
+        "base_url": upstream_client.base_url,
+    }
+
+    if options.redis_url:
+        import redis.asyncio as redis
+
+        redis_client = redis.from_url(options.redis_url)
+    else:
+        redis_client = InMemoryRedis()
+    upstream = create_app(FakeUpstreamConfig(seed=options.seed, **options.upstream))
+
+    for limiter in limiters:
+        limiter.enabled = False
+    upstream_scheduler.enabled = False
+    cache_service.redis_client = redis_client
+    if cache_service.local is not None:
+        cache_service.local.clear()
+    weather_client.api_key = "benchmark"
+    upstream_client.base_url = "http://fake-upstream/data/2.5"
+    await upstream_client.start(transport=httpx.ASGITransport(app=upstream))
+    try:
+        yield upstream, RedisOps(redis_client)
+    finally:
+        await upstream_client.close()
+        if options.redis_url:
+            await redis_client.close()
+        for limiter, enabled in zip(limiters, saved["limiters"]):
+            limiter.enabled = enabled
+        upstream_scheduler.enabled = saved["scheduler"]
+        cache_service.redis_client = saved["redis_client"]
+        if cache_service.local is not None:
+            cache_service.local.clear()
+        weather_client.api_key = saved["api_key"]
+        upstream_client.base_url = saved["base_url"]
+
+
+class TrafficGenerator:
+    """Builds request URLs for the configured mix and hit ratio."""
+
+    def __init__(self, options: LoadOptions):
+        self.options = options
+        self.rng = random.Random(options.seed)
+        self.names = list(options.mix)
+        self.weights = [options.mix[name] for name in self.names]
+        # Unique per run so that misses stay misses against a persistent Redis
+        self.run_id = f"{int(time.time())}{self.rng.randrange(1000):03d}"
+        self.hot_cities = [f"Hot{self.run_id}x{i}" for i in range(options.hot_keys)]
+        self._cold = 0
+
+    def _city(self) -> str:
+        if self.rng.random() < self.options.hit_ratio:
+            return self.rng.choice(self.hot_cities)
+        self._cold += 1
+        return f"Cold{self.run_id}x{self._cold}"
+
+    def url(self, endpoint: str, city: Optional[str] = None) -> str:
+        """URL of one request to ``endpoint``."""
+        units = self.options.units
+        tz = self.rng.choice(TIMEZONES)
+        if endpoint == "timezone":
+            return f"/api/v1/timezone/{tz}"
+        city = city or self._city()
+        if endpoint == "current":
+            return f"/api/v1/weather/current?city={city}&units={units}"
+        if endpoint == "forecast":
+            return f"/api/v1/weather/forecast?city={city}&units={units}"
+        return f"/api/v1/timezone-weather?city={city}&timezone={tz}&units={units}"
+
+    def next(self) -> Tuple[str, str]:
+        """Pick the next (endpoint, url)."""
+        endpoint = self.rng.choices(self.names, self.weights)[0]
+        return endpoint, self.url(endpoint)
+
+    def warmup_urls(self) -> List[str]:
+        """Requests that pre-populate the cache with the hot keys."""
+        urls = [f"/api/v1/timezone/{tz}" for tz in TIMEZONES]
+        for city in self.hot_cities:
+            urls.append(self.url("current", city))
+            urls.append(self.url("forecast", city))
+        return urls
+
+
+async def run(options: LoadOptions) -> Dict[str, Any]:
+    """Run one benchmark.
+
+    Args:
+        options: Run configuration
+
+    Returns:
+        Machine-readable results
+    """
+    from app.main import app
+
+    traffic = TrafficGenerator(options)
+    async with benchmark_environment(options) as (upstream, redis_ops):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+        ) as client:
+            for url in traffic.warmup_urls():
+                await client.get(url)
+            # Let micro-batched and background work from the warm-up settle
+            await asyncio.sleep(0.05)
+
+            plan = [traffic.next() for _ in range(options.requests)]
+            latencies: Dict[str, List[float]] = {name: [] for name in options.mix}
+            statuses: Dict[str, int] = {}
+            upstream_before = upstream.state.stats.snapshot()["total"]
+            redis_before = await redis_ops.total()
+            position = 0
+
+            async def worker():
+                nonlocal position
+                while position < len(plan):
+                    endpoint, url = plan[position]
+                    position += 1
+                    started = time.perf_counter()
+                    response = await client.get(url)
+                    latencies[endpoint].append(time.perf_counter() - started)
+                    key = str(response.status_code)
+                    statuses[key] = statuses.get(key, 0) + 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(options.concurrency)))
+            elapsed = time.perf_counter() - started
+
+            upstream_calls = upstream.state.stats.snapshot()["total"] - upstream_before
+            redis_commands = await redis_ops.total() - redis_before
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    summary = summarize(all_latencies, elapsed)
+    summary.update(
+        {
+            "elapsed_s": round(elapsed, 3),
+            "errors": sum(count for status, count in statuses.items() if status != "200"),
+            "upstream_calls_per_request": round(upstream_calls / options.requests, 4),
+            "redis_ops_per_request": round(redis_commands / options.requests, 4),
+        }
+    )
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "redis": "server" if options.redis_url else "in-process",
+        },
+        "options": asdict(options),
+        "summary": summary,
+        "statuses": statuses,
+        "endpoints": {name: summarize(values) for name, values in latencies.items()},
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Compare the summaries of two runs.
+
+    Args:
+        baseline: Results of the reference run
+        current: Results of the run under test
+        threshold: Relative change (percent) in the worse direction that counts
+            as a regression
+
+    Returns:
+        Per-metric rows and whether any metric regressed
+    """
+    rows = []
+    regressed = False
+    for metric, higher_is_better in COMPARED_METRICS.items():
+        before = baseline["summary"].get(metric)
+        after = current["summary"].get(metric)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        worse = -change if higher_is_better else change
+        flagged = worse > threshold
+        regressed |= flagged
+        rows.append(
+            {
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change_pct": round(change, 2),
+                "regression": flagged,
+            }
+        )
+    return rows, regressed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="End-to-end load benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run a benchmark")
+    run_parser.add_argument("--requests", type=int, default=LoadOptions.requests)
+    run_parser.add_argument("--concurrency", type=int, default=LoadOptions.concurrency)
+    run_parser.add_argument("--mix", type=parse_mix, default=None)
+    run_parser.add_argument("--hit-ratio", type=float, default=LoadOptions.hit_ratio)
+    run_parser.add_argument("--hot-keys", type=int, default=LoadOptions.hot_keys)
+    run_parser.add_argument("--units", default=LoadOptions.units)
+    run_parser.add_argument("--seed", type=int, default=LoadOptions.seed)
+    run_parser.add_argument("--redis-url", help="Use a Redis server instead of the stand-in")
+    run_parser.add_argument(
+        "--upstream-latency", default="none", help="Latency spec, see tools.fake_openweathermap"
+    )
+    run_parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    run_parser.add_argument("--output", type=Path, help="Write results here instead of stdout")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Percent")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        rows, regressed = compare(
+            json.loads(args.baseline.read_text()),
+            json.loads(args.current.read_text()),
+            args.threshold,
+        )
+        for row in rows:
+            marker = "  REGRESSION" if row["regression"] else ""
+            print(
+                f"{row['metric']:<28} {row['baseline']:>12} -> {row['current']:>12} "
+                f"({row['change_pct']:+.1f}%){marker}"
+            )
+        return 1 if regressed else 0
+
+    options = LoadOptions(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        hit_ratio=args.hit_ratio,
+        hot_keys=args.hot_keys,
+        units=args.units,
+        seed=args.seed,
+        redis_url=args.redis_url,
+        upstream={**parse_latency(args.upstream_latency), "error_rate": args.upstream_error_rate},
+    )
+    if args.mix:
+        options.mix = args.mix
+
+    # Per-request INFO logging would dominate the measurement
+    logging.disable(logging.INFO)
+    results = asyncio.run(run(options))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
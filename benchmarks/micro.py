@@ -0,0 +1,283 @@
+"""Microbenchmarks for CPU hot paths.
+
+Each benchmark times one call of a hot function with ``timeit`` and reports
+the best and median time per call over several repeats. Results are
+compared against a stored baseline to catch regressions::
+
+    python -m benchmarks.micro run --output benchmarks/baselines/micro.json
+    python -m benchmarks.micro run --compare --threshold 25
+
+    python -m benchmarks.micro compare before.json after.json
+
+Baselines are machine specific: record one on the machine that runs the
+comparison before relying on it.
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+from tools.fake_openweathermap import WeatherGenerator
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "micro.json"
+
+# Fixed inputs so that runs are comparable
+SEED = 0
+FIXED_TIME = 1_700_000_000
+
+
+def run_to_completion(coro: Coroutine) -> Any:
+    """Run a coroutine that never suspends, without an event loop.
+
+    Used for async service methods whose only awaits are cache calls that
+    return immediately when no Redis client is connected.
+    """
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("Benchmarked coroutine suspended; is a cache client connected?")
+
+
+def _witty_message() -> Callable[[], Any]:
+    from app.services.weather_messages import get_witty_message
+
+    return lambda: get_witty_message("Rain", 12.5, 4.2, "imperial")
+
+
+def _forecast_aggregation() -> Callable[[], Any]:
+    from app.services.forecast_engine import aggregate_daily
+
+    generator = WeatherGenerator(SEED, fixed_time=FIXED_TIME)
+    items = generator.forecast(generator.city_from_query("London"), "metric")["list"]
+    return lambda: aggregate_daily(items, "metric")
+
+
+def _timezone_info() -> Callable[[], Any]:
+    from app.services.cache import cache_service
+    from app.services.timezone_service import timezone_service
+
+    if cache_service.redis_client is not None:
+        raise RuntimeError("Timezone benchmark needs the cache disconnected")
+    return lambda: run_to_completion(
+        timezone_service._build_timezone_info("America/New_York", "timezone:benchmark")
+    )
+
+
+def _timezone_cache_key() -> Callable[[], Any]:
+    from app.services.timezone_service import timezone_service
+
+    return lambda: timezone_service._generate_cache_key("America/New_York")
+
+
+def _weather_cache_key() -> Callable[[], Any]:
+    from app.services.weather_client import weather_client
+
+    return lambda: weather_client._cache_key("weather", "london,gb", 2643743)
+
+
+def sample_current():
+    """CurrentWeatherResponse with fixed, typical values."""
+    from app.schemas.weather import CurrentWeatherResponse
+
+    return CurrentWeatherResponse(
+        location="London, GB",
+        temperature=12.5,
+        feels_like=11.8,
+        humidity=81,
+        description="light rain",
+        condition="Rain",
+        wind_speed=4.2,
+        timestamp="2023-11-14T22:13:20",
+        units="metric",
+        witty_message="Bring an umbrella.",
+    )
+
+
+def sample_forecast():
+    """Five-day ForecastResponse aggregated from generated upstream data."""
+    from app.schemas.weather import ForecastResponse
+    from app.services.forecast_engine import aggregate_daily
+
+    generator = WeatherGenerator(SEED, fixed_time=FIXED_TIME)
+    items = generator.forecast(generator.city_from_query("London"), "metric")["list"]
+    return ForecastResponse(
+        location="London, GB", units="metric", forecast=aggregate_daily(items, "metric")
+    )
+
+
+def _current_serialization() -> Callable[[], Any]:
+    return sample_current().model_dump_json
+
+
+def _forecast_serialization() -> Callable[[], Any]:
+    return sample_forecast().model_dump_json
+
+
+# Name -> setup function returning the callable to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], Any]]] = {
+    "witty_message": _witty_message,
+    "forecast_aggregation": _forecast_aggregation,
+    "timezone_info": _timezone_info,
+    "timezone_cache_key": _timezone_cache_key,
+    "weather_cache_key": _weather_cache_key,
+    "current_serialization": _current_serialization,
+    "forecast_serialization": _forecast_serialization,
+}
+
+
+def measure(func: Callable[[], Any], repeat: int = 7, min_time: float = 0.2) -> Dict[str, float]:
+    """Time a callable.
+
+    Args:
+        func: Callable to time
+        repeat: Number of timed repeats
+        min_time: Minimum duration of one repeat, in seconds
+
+    Returns:
+        Best and median nanoseconds per call, and calls per repeat
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(int(number * min_time / 0.2), 1)
+    per_call = [total / number * 1e9 for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "best_ns": round(min(per_call), 1),
+        "median_ns": round(statistics.median(per_call), 1),
+        "number": number,
+    }
+
+
+def run(
+    names: Optional[List[str]] = None, repeat: int = 7, min_time: float = 0.2
+) -> Dict[str, Any]:
+    """Run benchmarks.
+
+    Args:
+        names: Benchmarks to run, all when None
+        repeat: Number of timed repeats per benchmark
+        min_time: Minimum duration of one repeat, in seconds
+
+    Returns:
+        JSON-serializable results
+    """
+    unknown = set(names or []) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {sorted(unknown)}")
+
+    results = {}
+    for name in names or BENCHMARKS:
+        results[name] = measure(BENCHMARKS[name](), repeat=repeat, min_time=min_time)
+    return {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Compare the best time per call of two runs.
+
+    Args:
+        baseline: Results of the reference run
+        current: Results of the run under test
+        threshold: Slowdown (percent) that counts as a regression
+
+    Returns:
+        Per-benchmark rows and whether any benchmark regressed
+    """
+    rows = []
+    regressed = False
+    for name, after in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            continue
+        change = (after["best_ns"] - before["best_ns"]) / before["best_ns"] * 100
+        flagged = change > threshold
+        regressed |= flagged
+        rows.append(
+            {
+                "benchmark": name,
+                "baseline_ns": before["best_ns"],
+                "current_ns": after["best_ns"],
+                "change_pct": round(change, 2),
+                "regression": flagged,
+            }
+        )
+    return rows, regressed
+
+
+def print_comparison(rows: List[Dict[str, Any]]):
+    """Print comparison rows as a table."""
+    for row in rows:
+        marker = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['benchmark']:<24} {row['baseline_ns']:>12.1f} ns -> "
+            f"{row['current_ns']:>12.1f} ns ({row['change_pct']:+.1f}%){marker}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Microbenchmarks for CPU hot paths")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument("names", nargs="*", help=f"Subset of: {', '.join(BENCHMARKS)}")
+    run_parser.add_argument("--repeat", type=int, default=7)
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per repeat")
+    run_parser.add_argument("--output", type=Path, help="Write results here")
+    run_parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help="Baseline to compare against (default: the stored baseline)",
+    )
+    run_parser.add_argument("--threshold", type=float, default=25.0, help="Percent")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=25.0, help="Percent")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        rows, regressed = compare(
+            json.loads(args.baseline.read_text()),
+            json.loads(args.current.read_text()),
+            args.threshold,
+        )
+        print_comparison(rows)
+        return 1 if regressed else 0
+
+    # Logging inside the timed functions would dominate the measurement
+    logging.disable(logging.INFO)
+    results = run(args.names, repeat=args.repeat, min_time=args.min_time)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.compare:
+        rows, regressed = compare(json.loads(args.compare.read_text()), results, args.threshold)
+        print_comparison(rows)
+        return 1 if regressed else 0
+    if not args.output:
+        print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
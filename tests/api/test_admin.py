@@ -0,0 +1,76 @@
+"""Tests for cache administration endpoints."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.cache import CacheService
+from tools.fake_redis import InMemoryRedis
+
+HEADERS = {"X-API-Key": "secret"}
+
+
+@pytest.fixture
+def admin_cache(monkeypatch):
+    """Enable the admin API over a cache backed by an in-memory Redis."""
+    cache = CacheService()
+    cache.redis_client = InMemoryRedis()
+    monkeypatch.setattr("app.api.v1.admin.cache_service", cache)
+    monkeypatch.setattr("app.api.v1.admin.settings.ADMIN_API_KEY", "secret")
+    return cache
+
+
+def test_admin_api_is_disabled_without_a_key(client: TestClient):
+    """Test admin endpoints are refused when no admin key is configured."""
+    response = client.delete("/api/v1/admin/cache/tags/location:1", headers=HEADERS)
+    assert response.status_code == 403
+
+
+def test_admin_api_rejects_a_wrong_key(client: TestClient, admin_cache):
+    """Test admin endpoints require the configured key."""
+    response = client.delete(
+        "/api/v1/admin/cache/tags/location:1", headers={"X-API-Key": "wrong"}
+    )
+    assert response.status_code == 401
+
+
+async def test_purge_tag(client: TestClient, admin_cache):
+    """Test purging a tag deletes its entries and reports the count."""
+    await admin_cache.set("weather:forecast:a", "1", ttl=60, tags=["location:1"])
+    await admin_cache.set("weather:current:a", "2", ttl=60, tags=["location:2"])
+
+    response = client.delete("/api/v1/admin/cache/tags/location:1", headers=HEADERS)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["tags"] == ["location:1"]
+    assert data["purged_keys"] == 1
+    assert data["duration_ms"] >= 0
+    assert await admin_cache.get("weather:current:a") == "2"
+
+
+async def test_purge_location_purges_city_id_and_alias(client: TestClient, admin_cache, fake_cache):
+    """Test a location purge covers entries keyed by city id and by name."""
+    from app.services.location_resolver import location_resolver
+
+    await location_resolver.learn("paris,fr", 2988507)
+    await admin_cache.set("weather:current:a", "1", ttl=60, tags=["location:2988507"])
+    await admin_cache.set("weather:forecast:b", "2", ttl=60, tags=["alias:paris,fr"])
+
+    response = client.delete(
+        "/api/v1/admin/cache/locations?city=Paris&country_code=FR", headers=HEADERS
+    )
+    assert response.status_code == 200
+    assert response.json()["tags"] == ["location:2988507", "alias:paris,fr"]
+    assert response.json()["purged_keys"] == 2
+
+
+def test_bump_namespace(client: TestClient, admin_cache):
+    """Test bumping a namespace returns its new version."""
+    response = client.post("/api/v1/admin/cache/namespaces/weather:forecast/bump", headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json()["version"] == 1
+
+
+def test_unavailable_cache_is_a_503(client: TestClient, admin_cache):
+    """Test admin commands report an unavailable cache."""
+    admin_cache.redis_client = None
+    response = client.post("/api/v1/admin/cache/namespaces/timezone/bump", headers=HEADERS)
+    assert response.status_code == 503
@@ -35,4 +35,14 @@ def test_get_timezone_info_asia(client: TestClient):
     response = client.get("/api/v1/timezone/Asia/Tokyo")
     assert response.status_code == 200
     data = response.json()
-    assert data["timezone"] == "Asia/Tokyo"
\ No newline at end of file
+    assert data["timezone"] == "Asia/Tokyo"
+
+
+def test_get_timezone_info_cache_hit_serves_stored_json(client: TestClient, fake_cache):
+    """Test a cache hit returns the stored JSON text as the response body."""
+    first = client.get("/api/v1/timezone/UTC")
+    second = client.get("/api/v1/timezone/UTC")
+
+    assert first.status_code == second.status_code == 200
+    assert second.text == next(iter(fake_cache.values.values()))[0]
+    assert second.json() == first.json()
@@ -30,6 +30,20 @@ def test_get_current_weather_success(mock_get_weather, client: TestClient, mock_
     assert "witty_message" in data
 
 
+@patch("app.services.weather_client.weather_client.get_current_weather")
+def test_get_current_weather_serves_cached_json(mock_get_weather, client: TestClient):
+    """Test cached JSON text is sent as the response body unchanged."""
+    cached = '{"location":"London, GB","temperature":12.5}'
+    mock_get_weather.return_value = cached
+
+    response = client.get("/api/v1/weather/current?city=London&country_code=GB")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.text == cached
+    assert mock_get_weather.await_args.kwargs == {"as_json": True}
+
+
 def test_get_current_weather_missing_city(client: TestClient):
     """Test current weather with missing city parameter."""
     response = client.get("/api/v1/weather/current")
@@ -69,4 +83,60 @@ def test_get_forecast_success(mock_get_forecast, client: TestClient):
     assert data["location"] == "London, GB"
     assert "forecast" in data
     assert len(data["forecast"]) > 0
-    assert "witty_message" in data["forecast"][0]
\ No newline at end of file
+    assert "witty_message" in data["forecast"][0]
+
+
+@patch("app.services.weather_client.weather_client.get_current_weather")
+def test_get_current_weather_circuit_open(mock_get_weather, client: TestClient):
+    """Test an open upstream circuit fails fast with 503."""
+    from app.services.resilience import CircuitOpenError
+
+    mock_get_weather.side_effect = CircuitOpenError("Circuit 'weather-api' is open")
+
+    response = client.get("/api/v1/weather/current?city=London")
+    assert response.status_code == 503
+
+
+@patch("app.services.weather_client.weather_client.get_current_weather_batch")
+def test_get_current_weather_batch(mock_get_batch, client: TestClient):
+    """Test batch weather reports results and errors per item."""
+    from app.schemas.weather import CurrentWeatherResponse
+
+    mock_get_batch.return_value = [
+        CurrentWeatherResponse(
+            location="London, GB",
+            temperature=12.5,
+            feels_like=10.2,
+            humidity=76,
+            description="light rain",
+            condition="Rain",
+            wind_speed=5.5,
+            timestamp="2024-01-15T15:30:00Z",
+            units="metric",
+            witty_message="You'll regret not wearing a coat!",
+        ),
+        ValueError("City not found: Atlantis"),
+    ]
+
+    response = client.post(
+        "/api/v1/weather/current/batch",
+        json={"locations": [{"city": "London", "country_code": "GB"}, {"city": "Atlantis"}]},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["status"] == "ok"
+    assert results[0]["weather"]["location"] == "London, GB"
+    assert results[1] == {
+        "city": "Atlantis",
+        "country_code": None,
+        "status": "error",
+        "weather": None,
+        "error": "City not found: Atlantis",
+    }
+    mock_get_batch.assert_awaited_once_with([("London", "GB"), ("Atlantis", None)], "metric")
+
+
+def test_get_current_weather_batch_empty(client: TestClient):
+    """Test batch weather rejects an empty location list."""
+    response = client.post("/api/v1/weather/current/batch", json={"locations": []})
+    assert response.status_code == 422
@@ -0,0 +1,12 @@
+"""Tests for the bulk cache operations benchmark."""
+from benchmarks.cache_bulk import run
+
+
+async def test_bulk_operations_save_round_trips():
+    """Test every bulk operation takes one round-trip regardless of size."""
+    results = await run([5, 20], rtt=0)
+
+    for size, operations in results["sizes"].items():
+        for modes in operations.values():
+            assert modes["single"]["round_trips"] == int(size)
+            assert modes["bulk"]["round_trips"] == 1
@@ -0,0 +1,11 @@
+"""Tests for the cache hit response benchmark."""
+from benchmarks.cache_hits import run
+
+
+def test_raw_hits_are_cheaper_for_every_response_type():
+    """Test every response type is measured and sending cached text saves time."""
+    results = run()["response_types"]
+
+    assert set(results) == {"current", "forecast", "timezone"}
+    for row in results.values():
+        assert 0 < row["raw_ns"] < row["model_ns"]
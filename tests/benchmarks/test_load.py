@@ -0,0 +1,60 @@
+"""Tests for the end-to-end load benchmark harness."""
+import argparse
+
+import pytest
+
+from app.services.cache import cache_service
+from app.services.weather_client import weather_client
+from benchmarks.load import LoadOptions, compare, parse_mix, percentile, run
+
+
+def test_percentile_and_mix_parsing():
+    """Test nearest-rank percentiles and traffic mix specs."""
+    values = [float(i) for i in range(1, 101)]
+
+    assert (percentile(values, 50), percentile(values, 99), percentile([], 50)) == (50, 99, 0)
+    assert parse_mix("current=3,timezone") == {"current": 3.0, "timezone": 1.0}
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix("bogus=1")
+
+
+async def test_run_reports_throughput_latency_and_call_ratios():
+    """Test a small all-hit run and that the environment is restored."""
+    api_key = weather_client.api_key
+    options = LoadOptions(requests=60, concurrency=4, hit_ratio=1.0, hot_keys=3)
+
+    results = await run(options)
+
+    summary = results["summary"]
+    assert summary["requests"] == 60
+    assert summary["errors"] == 0
+    assert summary["rps"] > 0
+    assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+    assert summary["upstream_calls_per_request"] == 0
+    # Repeated hits are served by the in-process cache tier
+    assert summary["redis_ops_per_request"] < 0.5
+    assert set(results["endpoints"]) == {"current", "forecast", "timezone", "combined"}
+    assert cache_service.redis_client is None
+    assert weather_client.api_key == api_key
+
+
+async def test_misses_reach_the_upstream():
+    """Test the hit ratio controls upstream traffic."""
+    results = await run(LoadOptions(requests=20, concurrency=2, hit_ratio=0.0, mix={"current": 1}))
+
+    assert results["summary"]["upstream_calls_per_request"] == 1
+
+
+def test_compare_flags_regressions():
+    """Test only changes in the worse direction beyond the threshold are flagged."""
+    baseline = {"summary": {"rps": 1000, "p99_ms": 10.0, "redis_ops_per_request": 2.0}}
+    current = {"summary": {"rps": 1200, "p99_ms": 12.0, "redis_ops_per_request": 2.1}}
+
+    rows, regressed = compare(baseline, current, threshold=10)
+
+    assert regressed
+    assert {row["metric"]: row["regression"] for row in rows} == {
+        "rps": False,
+        "p99_ms": True,
+        "redis_ops_per_request": False,
+    }
@@ -0,0 +1,53 @@
+"""Tests for the microbenchmark suite."""
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.micro import BENCHMARKS, DEFAULT_BASELINE, compare, run, run_to_completion
+
+
+@pytest.mark.parametrize("name", sorted(BENCHMARKS))
+def test_benchmarked_callables_run(name):
+    """Test every benchmark sets up and runs its target once."""
+    BENCHMARKS[name]()()
+
+
+def test_run_reports_time_per_call():
+    """Test results carry per-call timings for the selected benchmarks."""
+    results = run(["timezone_cache_key"], repeat=2, min_time=0.01)
+
+    timing = results["benchmarks"]["timezone_cache_key"]
+    assert 0 < timing["best_ns"] <= timing["median_ns"]
+    with pytest.raises(ValueError):
+        run(["bogus"])
+
+
+def test_compare_flags_slowdowns_beyond_threshold():
+    """Test only slowdowns above the threshold are regressions."""
+    baseline = {"benchmarks": {"a": {"best_ns": 100.0}, "b": {"best_ns": 100.0}}}
+    current = {"benchmarks": {"a": {"best_ns": 130.0}, "b": {"best_ns": 60.0}, "c": {"best_ns": 1}}}
+
+    rows, regressed = compare(baseline, current, threshold=25)
+
+    assert regressed
+    assert [(row["benchmark"], row["regression"]) for row in rows] == [("a", True), ("b", False)]
+
+
+def test_stored_baseline_covers_every_benchmark():
+    """Test the committed baseline is kept in sync with the suite."""
+    assert set(json.loads(DEFAULT_BASELINE.read_text())["benchmarks"]) == set(BENCHMARKS)
+
+
+def test_run_to_completion_rejects_suspending_coroutines():
+    """Test coroutines that would need an event loop are refused."""
+
+    async def value():
+        return 1
+
+    async def suspends():
+        await asyncio.sleep(0)
+
+    assert run_to_completion(value()) == 1
+    with pytest.raises(RuntimeError):
+        run_to_completion(suspends())
@@ -1,8 +1,42 @@
 """Pytest configuration and fixtures."""
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.services.location_resolver import LocationResolver
+from app.services.upstream_scheduler import upstream_scheduler
+
+
+@pytest.fixture(autouse=True)
+def full_upstream_quota():
+    """Start every test with a full upstream token bucket, whatever earlier tests spent."""
+    upstream_scheduler._tokens = float(upstream_scheduler.capacity)
+    upstream_scheduler._paused_until = 0.0
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock_start() -> float:
+    """Time the ``clock`` fixture starts at; override it to start elsewhere."""
+    return 0.0
+
+
+@pytest.fixture
+def clock(clock_start):
+    """Manually advanced clock starting at ``clock_start``."""
+    return FakeClock(clock_start)
 
 
 @pytest.fixture
@@ -28,6 +62,7 @@ def mock_weather_response():
         "wind": {"speed": 5.5, "deg": 230},
         "dt": 1642262400,
         "sys": {"country": "GB"},
+        "id": 2643743,
         "name": "London",
     }
 
@@ -36,7 +71,7 @@ def mock_weather_response():
 def mock_forecast_response():
     """Mock OpenWeatherMap forecast response."""
     return {
-        "city": {"name": "London", "country": "GB"},
+        "city": {"id": 2643743, "name": "London", "country": "GB"},
         "list": [
             {
                 "dt": 1642262400,
@@ -59,4 +94,107 @@ def mock_forecast_response():
                 "wind": {"speed": 3.2},
             },
         ],
-    }
\ No newline at end of file
+    }
+
+
+class FakeCacheService:
+    """Dict-backed stand-in for CacheService."""
+
+    def __init__(self):
+        self.values: Dict[str, Tuple[str, float]] = {}
+        self.hashes: Dict[str, Dict[str, str]] = {}
+        self.sorted_sets: Dict[str, Dict[str, float]] = {}
+
+    def _live(self, key: str) -> Optional[Tuple[str, float]]:
+        entry = self.values.get(key)
+        if entry and entry[1] <= time.monotonic():
+            del self.values[key]
+            return None
+        return entry
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[str], int]:
+        entry = self._live(key)
+        if not entry:
+            return None, -2
+        return entry[0], int(entry[1] - time.monotonic())
+
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        return [await self.get(key) for key in keys]
+
+    async def get_many_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[str], int]]:
+        return [await self.get_with_ttl(key) for key in keys]
+
+    async def set(
+        self, key: str, value: str, ttl: int = 3600, tags: Sequence[str] = ()
+    ) -> bool:
+        self.values[key] = (value, time.monotonic() + ttl)
+        return True
+
+    async def delete(self, key: str) -> bool:
+        self.values.pop(key, None)
+        return True
+
+    async def hget(self, name: str, field: str) -> Optional[str]:
+        return self.hashes.get(name, {}).get(field)
+
+    async def hmget(self, name: str, fields: List[str]) -> List[Optional[str]]:
+        return [await self.hget(name, field) for field in fields]
+
+    async def hset(self, name: str, field: str, value: str) -> bool:
+        self.hashes.setdefault(name, {})[field] = value
+        return True
+
+    async def hset_capped(
+        self, name: str, field: str, value: str, max_size: int, ttl: int
+    ) -> Optional[int]:
+        fields = self.hashes.setdefault(name, {})
+        fields.pop(field, None)
+        fields[field] = value
+        evicted = list(fields)[: max(len(fields) - max_size, 0)]
+        for dropped in evicted:
+            del fields[dropped]
+        return len(evicted)
+
+    async def zscore(self, name: str, member: str) -> Optional[float]:
+        return self.sorted_sets.get(name, {}).get(member)
+
+    async def zadd_capped(
+        self,
+        name: str,
+        member: str,
+        score: float,
+        max_size: int,
+        ttl: int,
+        floor: float = float("-inf"),
+    ) -> Optional[int]:
+        members = self.sorted_sets.setdefault(name, {})
+        for expired in [m for m, s in members.items() if s <= floor]:
+            del members[expired]
+        members[member] = score
+        ranked = sorted(members, key=members.get)
+        for dropped in ranked[: max(len(ranked) - max_size, 0)]:
+            del members[dropped]
+        return max(len(ranked) - max_size, 0)
+
+    async def ping(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    """Replace the cache service used by the services with a dict-backed fake."""
+    cache = FakeCacheService()
+    for module in (
+        "app.services.weather_client",
+        "app.services.timezone_service",
+        "app.services.cache_refresher",
+        "app.services.location_resolver",
+        "app.services.negative_cache",
+    ):
+        monkeypatch.setattr(f"{module}.cache_service", cache)
+    monkeypatch.setattr("app.services.weather_client.location_resolver", LocationResolver())
+    return cache
@@ -0,0 +1,405 @@
+"""Tests for the two-tier cache service."""
+import asyncio
+import time
+
+import pytest
+import redis.asyncio as redis
+from prometheus_client import REGISTRY
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from app.services.cache import CacheService, CacheUnavailableError, LocalCache, _is_outage
+from app.services.memory_backend import MemoryBackend
+from app.services.resilience import Backoff
+from tools.fake_redis import InMemoryRedis
+
+
+def make_cache(redis=None, clock=None, channel=None, **limits) -> CacheService:
+    """CacheService with an L1 tier over an in-memory Redis."""
+    clock = clock or (lambda: 0.0)
+    local = LocalCache(
+        max_entries=limits.get("max_entries", 100),
+        max_bytes=limits.get("max_bytes", 10000),
+        max_ttl=limits.get("max_ttl", 5),
+        clock=clock,
+    )
+    cache = CacheService(local=local, invalidation_channel=channel)
+    cache.redis_client = redis or InMemoryRedis(clock)
+    return cache
+
+
+def test_local_cache_evicts_least_recently_used(clock):
+    """Test entry and byte bounds evict the least recently used entries."""
+    local = LocalCache(max_entries=2, max_bytes=30, max_ttl=5, clock=clock)
+
+    local.put("a", "1", 60)
+    local.put("b", "2", 60)
+    local.get("a")
+    local.put("c", "3", 60)
+    assert (local.get("a"), local.get("b"), local.get("c")) == (("1", 60), None, ("3", 60))
+
+    local.put("d", "x" * 20, 60)
+    assert local.get("a") is None
+    assert local.bytes == len("c3") + len("d") + 20
+
+    local.put("e", "y" * 40, 60)
+    assert local.get("e") is None
+
+
+def test_local_entries_never_outlive_the_redis_ttl(clock):
+    """Test local TTLs are capped by max_ttl and by the Redis TTL."""
+    local = LocalCache(max_entries=10, max_bytes=1000, max_ttl=5, clock=clock)
+
+    local.put("long", "1", 600)
+    local.put("short", "2", 2)
+    local.put("forever", "3", -1)
+    local.put("gone", "4", -2)
+
+    clock.now = 1.5
+    assert local.get("long") == ("1", 598)
+    assert local.get("short") == ("2", 0)
+    assert local.get("forever") == ("3", -1)
+    assert local.get("gone") is None
+    clock.now = 2
+    assert local.get("short") is None
+    clock.now = 5
+    assert local.get("long") is None
+
+
+async def test_repeated_reads_are_served_in_process(clock):
+    """Test hits skip Redis until the local copy expires."""
+    cache = make_cache(clock=clock)
+    await cache.redis_client.setex("k", 600, "v")
+
+    assert await cache.get_with_ttl("k") == ("v", 600)
+    clock.now = 3
+    assert await cache.get("k") == "v"
+    assert await cache.get_many_with_ttl(["k", "missing"]) == [("v", 597), (None, -2)]
+    assert cache.redis_client.commands["get"] == 2
+
+    clock.now = 6
+    assert await cache.get_with_ttl("k") == ("v", 594)
+    assert cache.redis_client.commands["get"] == 3
+
+
+async def test_writes_and_deletes_update_the_local_tier():
+    """Test set fills and delete drops the local copy."""
+    cache = make_cache()
+
+    await cache.set("k", "v", ttl=60)
+    assert await cache.get("k") == "v"
+    assert cache.redis_client.commands["get"] == 0
+
+    await cache.delete("k")
+    assert await cache.get("k") is None
+    assert cache.redis_client.commands["get"] == 1
+
+
+async def test_writes_invalidate_other_workers(clock):
+    """Test a write on one worker drops the copy held by another."""
+    redis = InMemoryRedis(clock)
+    writer = make_cache(redis, clock, channel="invalidate")
+    reader = make_cache(redis, clock, channel="invalidate")
+    reader._listener = asyncio.create_task(reader._listen_for_invalidations())
+    await asyncio.sleep(0)
+
+    await writer.set("k", "old", ttl=60)
+    assert await reader.get("k") == "old"
+    await writer.set("k", "new", ttl=60)
+    await asyncio.sleep(0)
+
+    assert await reader.get("k") == "new"
+    assert await writer.get("k") == "new"
+    await reader.disconnect()
+    await writer.disconnect()
+
+
+async def serve_quiet_redis(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal RESP server that answers commands but never publishes a message."""
+    try:
+        while True:
+            header = await reader.readline()
+            if not header:
+                break
+            command = []
+            for _ in range(int(header[1:])):
+                length = int((await reader.readline())[1:])
+                command.append((await reader.readexactly(length + 2))[:-2])
+            name = command[0].upper()
+            if name == b"PING":
+                writer.write(b"+PONG\r\n")
+            elif name == b"HGETALL":
+                writer.write(b"*0\r\n")
+            elif name == b"SUBSCRIBE":
+                channel = command[1]
+                reply = b"*3\r\n$9\r\nsubscribe\r\n$%d\r\n%s\r\n:1\r\n"
+                writer.write(reply % (len(channel), channel))
+            else:
+                writer.write(b"+OK\r\n")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def test_quiet_invalidation_channel_is_not_an_outage():
+    """Test the listener outlives the command read timeout on an idle channel."""
+    server = await asyncio.start_server(serve_quiet_redis, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    pool = redis.BlockingConnectionPool.from_url(f"redis://127.0.0.1:{port}", socket_timeout=0.05)
+    local = LocalCache(max_entries=100, max_bytes=10000, max_ttl=5)
+    cache = CacheService(local=local, invalidation_channel="invalidate")
+    try:
+        await cache.connect(redis.Redis(connection_pool=pool))
+        await asyncio.sleep(0.3)
+
+        assert cache.backend == "redis"
+        assert not cache._listener.done()
+    finally:
+        await cache.disconnect()
+        await pool.disconnect()
+        server.close()
+        await server.wait_closed()
+        await asyncio.sleep(0.01)
+
+
+class BrokenRedis:
+    """Client whose every command fails."""
+
+    def __getattr__(self, name):
+        raise ConnectionError("redis down")
+
+
+async def test_bulk_operations_take_one_round_trip(clock):
+    """Test set_many/get_many/delete_many each cost a single round-trip."""
+    cache = CacheService()
+    cache.redis_client = redis = InMemoryRedis(clock)
+
+    assert await cache.set_many({"a": ("1", 10), "b": ("2", 60)})
+    assert await cache.get_many(["a", "b", "c"]) == ["1", "2", None]
+    assert await cache.get_many_with_ttl(["a", "b"]) == [("1", 10), ("2", 60)]
+    assert await cache.delete_many(["a", "c"])
+
+    assert await cache.get_many(["a", "b"]) == [None, "2"]
+    assert redis.round_trips == 5
+
+
+async def test_bulk_writes_fill_and_drop_the_local_tier():
+    """Test bulk writes keep the L1 tier consistent."""
+    cache = make_cache()
+
+    await cache.set_many({"a": ("1", 10), "b": ("2", 60)})
+    assert await cache.get_many_with_ttl(["a", "b"]) == [("1", 10), ("2", 60)]
+    assert cache.redis_client.commands["get"] == 0
+
+    await cache.delete_many(["a"])
+    assert await cache.get_many(["a", "b"]) == [None, "2"]
+    assert cache.redis_client.commands["get"] == 1
+
+
+async def test_bulk_operations_degrade_to_misses():
+    """Test Redis errors turn into misses and failed writes, as for single keys."""
+    cache = make_cache(redis=BrokenRedis())
+
+    assert await cache.set_many({"a": ("1", 10)}) is False
+    assert await cache.get_many(["a"]) == [None]
+    assert await cache.get_many_with_ttl(["a"]) == [(None, -2)]
+    assert await cache.delete_many(["a"]) is False
+
+
+class FlakyRedis(InMemoryRedis):
+    """Stand-in that can be taken down like an unreachable server."""
+
+    def __init__(self, down: bool = False):
+        super().__init__()
+        self.down = down
+
+    async def _round_trip(self):
+        if self.down:
+            raise RedisConnectionError("Error 111 connecting to localhost:6379")
+        await super()._round_trip()
+
+
+def make_failover_cache(with_fallback: bool = True) -> CacheService:
+    """CacheService with an in-process fallback that reconnects immediately."""
+    return CacheService(
+        fallback=MemoryBackend() if with_fallback else None,
+        reconnect_backoff=Backoff(0, 0),
+    )
+
+
+async def wait_for_backend(cache: CacheService, backend: str):
+    """Let the reconnect loop run until ``backend`` is active."""
+    for _ in range(10):
+        if cache.backend == backend:
+            return
+        await asyncio.sleep(0)
+    assert cache.backend == backend
+
+
+async def test_unreachable_redis_at_startup_uses_fallback_until_reconnected():
+    """Test caching works in-process while Redis is down and moves back after."""
+    cache = make_failover_cache()
+    redis = FlakyRedis(down=True)
+
+    await cache.connect(redis)
+    assert cache.backend == "memory"
+    assert await cache.set("k", "v", ttl=60)
+    assert await cache.get("k") == "v"
+    assert await cache.ping()
+
+    redis.down = False
+    await wait_for_backend(cache, "redis")
+    assert await cache.get("k") is None
+    assert await cache.set("k", "v2", ttl=60)
+    assert await redis.get("k") is not None
+    await cache.disconnect()
+
+
+async def test_connection_errors_fail_over_at_runtime():
+    """Test a command failing on an unreachable server switches to the fallback."""
+    cache = make_failover_cache()
+    redis = FlakyRedis()
+    await cache.connect(redis)
+    assert cache.backend == "redis"
+
+    redis.down = True
+    assert await cache.get("k") is None
+    assert cache.backend == "memory"
+    assert await cache.set("k", "v", ttl=60)
+    assert await cache.get("k") == "v"
+
+    redis.down = False
+    await wait_for_backend(cache, "redis")
+    await cache.disconnect()
+    assert cache.backend == "none"
+
+
+async def test_without_fallback_caching_is_off_until_reconnected():
+    """Test the reconnect loop restores caching with the fallback disabled."""
+    cache = make_failover_cache(with_fallback=False)
+    redis = FlakyRedis(down=True)
+
+    await cache.connect(redis)
+    assert cache.backend == "none"
+    assert await cache.set("k", "v", ttl=60) is False
+
+    redis.down = False
+    await wait_for_backend(cache, "redis")
+    assert await cache.set("k", "v", ttl=60)
+    await cache.disconnect()
+
+
+def test_only_connection_errors_are_outages():
+    """Test errors unrelated to reaching the server do not trigger fail-over."""
+    assert _is_outage(RedisConnectionError("Error 111 connecting to localhost:6379"))
+    assert _is_outage(RedisTimeoutError("Timeout reading from socket"))
+    assert not _is_outage(ValueError("Unsupported cache value format: 9"))
+
+
+async def test_bumping_a_namespace_invalidates_only_its_keys():
+    """Test a version bump hides a namespace's keys, locally and for other workers."""
+    redis = InMemoryRedis()
+    cache, other = make_cache(redis), make_cache(redis)
+    await cache.set("weather:current:a", "1", ttl=60)
+    await cache.set("timezone:b", "2", ttl=60)
+
+    assert await cache.bump_namespace("weather:current") == 1
+    assert await cache.get("weather:current:a") is None
+    assert await cache.get("timezone:b") == "2"
+    await cache.set("weather:current:a", "3", ttl=60)
+    assert await redis.get("weather:current:v1:a") is not None
+
+    # Another worker reads the old version until it syncs
+    assert await other.get_many(["weather:current:a"]) == ["1"]
+    await other.connect(redis)
+    for _ in range(10):
+        if other._versions:
+            break
+        await asyncio.sleep(0)
+    assert await other.get_many(["weather:current:a"]) == ["3"]
+    await other.disconnect()
+
+
+async def test_purge_tag_deletes_tagged_keys_in_batches(monkeypatch):
+    """Test a tag purge deletes exactly its keys, including local copies, and its index."""
+    monkeypatch.setattr("app.services.cache.PURGE_BATCH_SIZE", 2)
+    redis = InMemoryRedis()
+    cache = make_cache(redis)
+    for i in range(5):
+        await cache.set(f"weather:current:{i}", "v", ttl=60, tags=["location:1"])
+    await cache.set("weather:current:other", "v", ttl=60, tags=["location:2"])
+    await cache.delete("weather:current:0")
+
+    round_trips = redis.round_trips
+    deleted = await cache.purge_tag("location:1")
+    assert deleted == 4
+    # ZSCAN, three batches of DELs (the deleted key is still indexed), index DEL
+    assert redis.round_trips - round_trips == 1 + 3 + 1
+    assert await cache.get("weather:current:1") is None
+    assert await cache.get("weather:current:other") == "v"
+    assert await redis.get("cache:tag:location:1") is None
+    assert await cache.purge_tag("location:1") == 0
+
+
+async def test_tag_index_drops_expired_keys_on_write():
+    """Test tag indexes only keep keys that have not expired yet."""
+    redis = InMemoryRedis()
+    cache = make_cache(redis)
+    await redis.zadd("cache:tag:location:1", {"weather:current:old": 1.0})
+
+    await cache.set("weather:current:new", "v", ttl=60, tags=["location:1"])
+
+    assert await redis.zscore("cache:tag:location:1", "weather:current:old") is None
+    assert await redis.zscore("cache:tag:location:1", "weather:current:new") > time.time()
+
+
+async def test_admin_commands_raise_without_a_backend():
+    """Test purges and bumps report an unreachable cache instead of doing nothing."""
+    cache = CacheService()
+    with pytest.raises(CacheUnavailableError):
+        await cache.purge_tag("location:1")
+    with pytest.raises(CacheUnavailableError):
+        await cache.bump_namespace("timezone")
+
+
+def sample(name: str, **labels) -> float:
+    """Current value of a metric sample, 0 if not exported yet."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_operations_are_measured_per_namespace():
+    """Test hits, misses, latency and sizes are labeled by namespace, versions included."""
+    cache = make_cache()
+    lookups = {
+        (namespace, result): sample("cache_lookups_total", namespace=namespace, result=result)
+        for namespace in ("weather-forecast", "timezone", "other")
+        for result in ("hit", "miss")
+    }
+    sets = sample("cache_value_size_bytes_count", namespace="weather-forecast", operation="set")
+    gets = sample(
+        "cache_operation_duration_seconds_count", namespace="timezone", operation="get_many"
+    )
+
+    await cache.bump_namespace("weather:forecast")
+    await cache.set("weather:forecast:a", "x" * 100, ttl=60)
+    assert await cache.get("weather:forecast:a") is not None
+    await cache.get_many(["timezone:a", "timezone:b"])
+    await cache.get("benchmark:a")
+
+    def delta(namespace, result):
+        current = sample("cache_lookups_total", namespace=namespace, result=result)
+        return current - lookups[namespace, result]
+
+    assert delta("weather-forecast", "hit") == 1
+    assert delta("timezone", "miss") == 2
+    assert delta("other", "miss") == 1
+    assert (
+        sample("cache_value_size_bytes_count", namespace="weather-forecast", operation="set")
+        == sets + 1
+    )
+    assert (
+        sample("cache_operation_duration_seconds_count", namespace="timezone", operation="get_many")
+        == gets + 1
+    )
@@ -0,0 +1,77 @@
+"""Tests for cached value encoding."""
+import pytest
+
+from app.services import cache_codec
+from app.services.cache import CacheService
+from app.services.cache_codec import MAGIC, CacheCodec
+from tools.fake_redis import InMemoryRedis
+
+LARGE = '{"forecast": [' + ", ".join(['{"temperature": 12.5}'] * 50) + "]}"
+
+
+def test_large_values_are_compressed_behind_a_header():
+    """Test values above the threshold are compressed and round-trip."""
+    codec = CacheCodec("zlib", min_size=100)
+
+    stored = codec.encode(LARGE)
+
+    assert stored[:2] == bytes((MAGIC, cache_codec.FORMAT_ZLIB))
+    assert len(stored) < len(LARGE)
+    assert codec.decode(stored) == LARGE
+
+
+def test_small_and_incompressible_values_are_stored_raw():
+    """Test compression is skipped below the threshold or when it does not help."""
+    value = '{"a": 1}'
+
+    for codec in (CacheCodec("zlib", min_size=100), CacheCodec("zlib", min_size=1)):
+        stored = codec.encode(value)
+        assert stored[:2] == bytes((MAGIC, cache_codec.FORMAT_RAW))
+        assert codec.decode(stored) == value
+
+
+def test_legacy_plain_text_entries_are_readable():
+    """Test entries written before the header existed decode as text."""
+    codec = CacheCodec()
+
+    assert codec.decode('{"a": 1}') == '{"a": 1}'
+    assert codec.decode(b'{"a": 1}') == '{"a": 1}'
+    assert codec.decode(None) is None
+
+
+def test_unknown_formats_are_rejected():
+    """Test unknown codecs and stored formats raise ValueError."""
+    with pytest.raises(ValueError):
+        CacheCodec("brotli")
+    with pytest.raises(ValueError):
+        CacheCodec().decode(bytes((MAGIC, 99)) + b"data")
+
+
+def test_zstd_falls_back_to_zlib_when_unavailable(monkeypatch):
+    """Test a missing zstandard package degrades to zlib."""
+    monkeypatch.setattr(cache_codec, "HAS_ZSTD", False)
+
+    assert CacheCodec("zstd").compression == "zlib"
+
+
+async def test_cache_service_stores_encoded_bytes():
+    """Test CacheService encodes on write and reads old and new entries."""
+    cache = CacheService(codec=CacheCodec("zlib", min_size=100))
+    cache.redis_client = redis = InMemoryRedis(clock=lambda: 0.0)
+    await redis.setex("legacy", 60, '{"a": 1}')
+
+    await cache.set("new", LARGE, ttl=60)
+
+    assert (await redis.get("new"))[:2] == bytes((MAGIC, cache_codec.FORMAT_ZLIB))
+    assert await cache.get_many(["legacy", "new"]) == ['{"a": 1}', LARGE]
+    assert await cache.get_with_ttl("new") == (LARGE, 60)
+
+
+async def test_undecodable_entries_are_misses():
+    """Test corrupt entries degrade to cache misses."""
+    cache = CacheService()
+    cache.redis_client = redis = InMemoryRedis()
+    await redis.setex("bad", 60, bytes((MAGIC, cache_codec.FORMAT_ZLIB)) + b"not zlib")
+
+    assert await cache.get("bad") is None
+    assert await cache.get_many_with_ttl(["bad"]) == [(None, -2)]
@@ -0,0 +1,183 @@
+"""Tests for the popularity-driven cache refresher."""
+import asyncio
+from unittest.mock import AsyncMock
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REFRESHER_PREVENTED_MISSES
+from app.services.cache_refresher import CacheRefresher, SpaceSavingSketch
+from app.services.upstream_scheduler import Priority
+from app.services.weather_client import WeatherClient
+
+
+def refresher(clock=None, **overrides) -> CacheRefresher:
+    """Refresher with small test defaults."""
+    options = {"top_k": 2, "interval": 10, "budget": 5, "lead": 30, "sketch_size": 4}
+    options.update(overrides)
+    return CacheRefresher(clock=clock or (lambda: 0.0), **options)
+
+
+def prevented_misses(namespace: str) -> float:
+    """Current value of the prevented misses counter."""
+    return CACHE_REFRESHER_PREVENTED_MISSES.labels(namespace)._value.get()
+
+
+def test_sketch_keeps_heavy_hitters():
+    """Test frequent keys survive a stream of one-off keys."""
+    sketch = SpaceSavingSketch(capacity=8)
+    for i in range(100):
+        sketch.add("hot")
+        if i % 2 == 0:
+            sketch.add("warm")
+        sketch.add(f"cold-{i}")
+
+    top = sketch.top(2)
+
+    assert [key for key, _, _ in top] == ["hot", "warm"]
+    assert top[0][1] >= 100
+    assert len(sketch) == 8
+
+
+def test_sketch_evicts_the_lowest_count():
+    """Test the evicted key always has the lowest count, also after increments and decay."""
+    sketch = SpaceSavingSketch(capacity=3)
+    for key, times in (("a", 1), ("b", 2), ("c", 3)):
+        for _ in range(times):
+            sketch.add(key)
+    sketch.add("a", weight=5)
+    sketch.decay(0.5)
+
+    assert sketch.add("d") == "b"
+    assert sketch.add("e") == "c"
+    assert {key for key, _, _ in sketch.top(3)} == {"a", "d", "e"}
+
+
+def test_sketch_decay_and_values():
+    """Test decay scales counts and the latest value is kept."""
+    sketch = SpaceSavingSketch(capacity=2)
+    sketch.add("a", value=1)
+    sketch.add("a", value=2)
+    sketch.decay(0.5)
+
+    assert sketch.top(1) == [("a", 1.0, 2)]
+
+
+async def test_refreshes_popular_entries_near_expiry(fake_cache):
+    """Test only popular entries close to going stale are refreshed."""
+    cache_refresher = refresher()
+    refresh = {key: AsyncMock() for key in ("hot", "later", "cold")}
+    await fake_cache.set("hot", "{}", ttl=100)
+    await fake_cache.set("later", "{}", ttl=1000)
+    await fake_cache.set("cold", "{}", ttl=10)
+    for key, lookups in (("hot", 5), ("later", 3), ("cold", 1)):
+        for _ in range(lookups):
+            cache_refresher.record("weather-current", key, refresh[key], 80, hit=True)
+
+    assert await cache_refresher.refresh_once() == 1
+
+    refresh["hot"].assert_awaited_once()
+    refresh["later"].assert_not_awaited()
+    refresh["cold"].assert_not_awaited()
+
+
+async def test_budget_limits_refreshes_per_cycle(fake_cache):
+    """Test at most ``budget`` entries are refreshed per cycle, most popular first."""
+    cache_refresher = refresher(top_k=3, budget=2)
+    refresh = {key: AsyncMock() for key in ("a", "b", "c")}
+    for weight, key in enumerate(("c", "b", "a"), start=1):
+        await fake_cache.set(key, "{}", ttl=10)
+        for _ in range(weight):
+            cache_refresher.record("weather-current", key, refresh[key], 0, hit=True)
+
+    assert await cache_refresher.refresh_once() == 2
+    assert not refresh["c"].await_count
+
+
+async def test_backs_off_refreshes_that_bring_no_newer_data(fake_cache, clock):
+    """Test an entry still due after its refresh is retried later, less often each time."""
+    cache_refresher = refresher(clock)
+    await fake_cache.set("old", "{}", ttl=20)
+    refresh = AsyncMock()
+    cache_refresher.record("weather-current", "old", refresh, 0, hit=True)
+
+    for now in (0, 10, 20, 30, 60, 90, 120, 150):
+        clock.now = now
+        cache_refresher.record("weather-current", "old", refresh, 0, hit=True)
+        await cache_refresher.refresh_once()
+
+    # Refreshed at 0, then backed off for 30 s and 60 s
+    assert refresh.await_count == 3
+
+
+async def test_refresh_with_newer_data_clears_the_backoff(fake_cache):
+    """Test an entry whose refresh extends its freshness stays on the normal schedule."""
+    cache_refresher = refresher()
+    cache_refresher._backoff["key"] = (0.0, 120.0)
+    await fake_cache.set("key", "{}", ttl=20)
+
+    async def refresh():
+        await fake_cache.set("key", "{}", ttl=600)
+
+    cache_refresher.record("weather-current", "key", refresh, 0, hit=True)
+
+    assert await cache_refresher.refresh_once() == 1
+    assert "key" not in cache_refresher._backoff
+
+
+async def test_counts_prevented_misses(fake_cache, clock):
+    """Test hits after the replaced entry's expiry count as prevented misses."""
+    cache_refresher = refresher(clock)
+    await fake_cache.set("key", "{}", ttl=20)
+    cache_refresher.record("test-prevented", "key", AsyncMock(), 0, hit=True)
+    await cache_refresher.refresh_once()
+    before = prevented_misses("test-prevented")
+
+    clock.now = 10
+    cache_refresher.record("test-prevented", "key", AsyncMock(), 0, hit=True)
+    clock.now = 25
+    cache_refresher.record("test-prevented", "key", AsyncMock(), 0, hit=True)
+    cache_refresher.record("test-prevented", "key", AsyncMock(), 0, hit=True)
+
+    assert prevented_misses("test-prevented") == before + 1
+
+
+async def test_disabled_refresher_ignores_lookups():
+    """Test a zero top-K disables tracking and the loop."""
+    cache_refresher = refresher(top_k=0)
+    cache_refresher.record("weather-current", "key", AsyncMock(), 0, hit=False)
+    cache_refresher.start()
+
+    assert len(cache_refresher.sketch) == 0
+    assert cache_refresher._task is None
+
+
+async def test_start_and_stop(fake_cache):
+    """Test the loop runs cycles until stopped."""
+    cache_refresher = refresher(interval=0.01)
+    cache_refresher.start()
+    await asyncio.sleep(0.03)
+    await cache_refresher.stop()
+
+    assert cache_refresher._task is None
+
+
+async def test_weather_client_lookups_feed_refresher(
+    fake_cache, monkeypatch, mock_weather_response
+):
+    """Test WeatherClient lookups are tracked and refreshed in the background."""
+    cache_refresher = refresher()
+    monkeypatch.setattr("app.services.weather_client.cache_refresher", cache_refresher)
+    client = WeatherClient()
+    client.api_key = "test-key"
+    upstream = AsyncMock(return_value=mock_weather_response)
+    monkeypatch.setattr(client, "_get_json", upstream)
+
+    for _ in range(3):
+        await client.get_current_weather("London", "GB")
+    ((key, count, _),) = cache_refresher.sketch.top(1)
+    cached_data, _ = await fake_cache.get_with_ttl(key)
+    await fake_cache.set(key, cached_data, ttl=settings.CACHE_STALE_TTL_CURRENT)
+
+    assert count == 2
+    assert await cache_refresher.refresh_once() == 1
+    assert upstream.await_count == 2
+    assert upstream.await_args.args[3] == Priority.BACKGROUND
@@ -0,0 +1,169 @@
+"""Tests for cache snapshots."""
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.cache import CacheService, LocalCache
+from app.services.cache_refresher import CacheRefresher
+from app.services.cache_snapshot import RECORD, CacheSnapshotter, read_snapshot, write_snapshot
+from tools.fake_redis import InMemoryRedis
+
+
+@pytest.fixture
+def clock_start() -> float:
+    """Start the clock at a wall-clock time."""
+    return 1_700_000_000.0
+
+
+def make_cache() -> CacheService:
+    """CacheService with an L1 tier over an empty in-memory Redis."""
+    cache = CacheService(local=LocalCache(max_entries=100, max_bytes=100000, max_ttl=5))
+    cache.redis_client = InMemoryRedis()
+    return cache
+
+
+def test_snapshot_file_round_trip(tmp_path):
+    """Test records read back as written, ignoring a truncated last record."""
+    path = tmp_path / "cache.snapshot"
+    entries = [
+        ("weather:current:a", b"\xc1\x00{}", 1.5, ("location:1", "alias:new york,us")),
+        ("timezone:b", b"x" * 1000, 2.0, ()),
+    ]
+    assert write_snapshot(path, entries) == 2
+    assert list(read_snapshot(path)) == entries
+
+    with open(path, "ab") as file:
+        file.write(RECORD.pack(3.0, 100, 10, 0) + b"partial")
+    assert list(read_snapshot(path)) == entries
+
+    path.write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError):
+        list(read_snapshot(path))
+
+
+async def test_hot_entries_survive_a_restart(tmp_path, monkeypatch, clock):
+    """Test saved entries are restored with their remaining TTL, without overwriting."""
+    path = tmp_path / "cache.snapshot"
+    monkeypatch.setattr(
+        "app.services.cache_snapshot.cache_refresher",
+        CacheRefresher(top_k=10, interval=1, budget=1, lead=0, sketch_size=10),
+    )
+    before = make_cache()
+    monkeypatch.setattr("app.services.cache_snapshot.cache_service", before)
+    await before.set("weather:current:a", '"current"', ttl=600)
+    await before.set("timezone:b", '"timezone"', ttl=30)
+    await before.set("benchmark:c", "other", ttl=600)
+    snapshotter = CacheSnapshotter(path, max_entries=10, interval=0, clock=clock)
+    assert await snapshotter.save() == 2
+
+    after = make_cache()
+    monkeypatch.setattr("app.services.cache_snapshot.cache_service", after)
+    clock.now += 10
+    assert await snapshotter.load() == 2
+    # Whole seconds are truncated on every hop
+    value, ttl = await after.get_with_ttl("weather:current:a")
+    assert value == '"current"' and 587 <= ttl <= 590
+    value, ttl = after.local.get("timezone:b")
+    assert value == '"timezone"' and 17 <= ttl <= 20
+    assert await after.get("benchmark:c") is None
+
+    # Entries already present are at least as fresh; expired ones are skipped
+    await after.set("weather:current:a", "newer", ttl=600)
+    await after.redis_client.delete("timezone:b")
+    clock.now += 30
+    assert await snapshotter.load() == 0
+    assert await after.get("weather:current:a") == "newer"
+
+
+async def test_restored_entries_can_be_purged_by_tag(tmp_path, monkeypatch, clock):
+    """Test entries keep their tags through a snapshot, so purging a location reaches them."""
+    path = tmp_path / "cache.snapshot"
+    monkeypatch.setattr(
+        "app.services.cache_snapshot.cache_refresher",
+        CacheRefresher(top_k=10, interval=1, budget=1, lead=0, sketch_size=10),
+    )
+    before = make_cache()
+    monkeypatch.setattr("app.services.cache_snapshot.cache_service", before)
+    await before.set("weather:current:a", '"london"', ttl=600, tags=["location:2643743"])
+    await before.set("weather:current:b", '"paris"', ttl=600, tags=["location:2988507"])
+    snapshotter = CacheSnapshotter(path, max_entries=10, interval=0, clock=clock)
+    assert await snapshotter.save() == 2
+
+    after = make_cache()
+    monkeypatch.setattr("app.services.cache_snapshot.cache_service", after)
+    assert await snapshotter.load() == 2
+    assert await after.purge_tag("location:2643743") == 1
+
+    assert await after.get("weather:current:a") is None
+    assert await after.get("weather:current:b") == '"paris"'
+
+
+async def test_snapshot_is_imported_in_batches(tmp_path, monkeypatch, clock):
+    """Test records are read and imported a batch at a time, not all at once."""
+    path = tmp_path / "cache.snapshot"
+    write_snapshot(path, [(f"timezone:{i}", b'"v"', clock.now + 600, ()) for i in range(5)])
+    cache = make_cache()
+    batches = []
+    import_entries = cache.import_entries
+
+    async def record_batch(entries):
+        batches.append(len(entries))
+        return await import_entries(entries)
+
+    monkeypatch.setattr(cache, "import_entries", record_batch)
+    monkeypatch.setattr("app.services.cache_snapshot.cache_service", cache)
+    monkeypatch.setattr("app.services.cache_snapshot.LOAD_BATCH_SIZE", 2)
+    snapshotter = CacheSnapshotter(path, max_entries=10, interval=0, clock=clock)
+
+    assert await snapshotter.load() == 5
+    assert batches == [2, 2, 1]
+    assert await cache.get("timezone:4") == '"v"'
+
+
+async def test_bad_records_are_skipped_and_never_stored(tmp_path, monkeypatch, clock):
+    """Test corrupt or non-JSON records are dropped while the others are restored."""
+    path = tmp_path / "cache.snapshot"
+    expires_at = clock.now + 600
+    write_snapshot(
+        path,
+        [
+            ("weather:current:zlib", b"\xc1\x01not zlib", expires_at, ()),
+            ("weather:current:codec", b"\xc1\x09{}", expires_at, ()),
+            ("weather:current:text", b"not json", expires_at, ()),
+            ("weather:current:good", b'{"temperature": 12.5}', expires_at, ()),
+        ],
+    )
+    cache = make_cache()
+    monkeypatch.setattr("app.services.cache_snapshot.cache_service", cache)
+    snapshotter = CacheSnapshotter(path, max_entries=10, interval=0, clock=clock)
+
+    assert await snapshotter.load() == 1
+    assert await cache.get("weather:current:good") == '{"temperature": 12.5}'
+    assert cache.redis_client.commands["set"] == 1
+
+
+async def test_failed_restore_does_not_stop_startup(tmp_path, monkeypatch):
+    """Test an unexpected error while restoring is logged and treated as a cold start."""
+    path = tmp_path / "cache.snapshot"
+    write_snapshot(path, [("timezone:a", b'"v"', 2e9, ())])
+    cache = make_cache()
+    monkeypatch.setattr(cache, "import_entries", AsyncMock(side_effect=RuntimeError("boom")))
+    monkeypatch.setattr("app.services.cache_snapshot.cache_service", cache)
+
+    assert await CacheSnapshotter(path, max_entries=10, interval=0).load() == 0
+
+
+async def test_missing_snapshot_is_a_cold_start(tmp_path):
+    """Test startup proceeds without a snapshot file."""
+    snapshotter = CacheSnapshotter(tmp_path / "missing", max_entries=10, interval=0)
+    assert await snapshotter.load() == 0
+
+
+async def test_empty_cache_keeps_the_last_snapshot(tmp_path, monkeypatch):
+    """Test a save with nothing cached does not replace the last snapshot."""
+    path = tmp_path / "cache.snapshot"
+    write_snapshot(path, [("timezone:a", b"v", 2e9, ())])
+    monkeypatch.setattr("app.services.cache_snapshot.cache_service", make_cache())
+    snapshotter = CacheSnapshotter(path, max_entries=10, interval=0)
+    assert await snapshotter.save() == 0
+    assert len(list(read_snapshot(path))) == 1
@@ -0,0 +1,104 @@
+"""Tests for Redis client-side caching in CacheService."""
+import asyncio
+import os
+
+import pytest
+import redis.asyncio as redis
+
+from app.services.cache import CacheService, LocalCache
+from tools.fake_redis import InMemoryRedis
+
+# Integration tests run against this server when set, e.g. redis://localhost:6379/15
+REDIS_URL = os.environ.get("TEST_REDIS_URL")
+
+
+class InvalidatingRedis(InMemoryRedis):
+    """Stand-in that delivers a tracking invalidation during every round-trip."""
+
+    def __init__(self, clock):
+        super().__init__(clock)
+        self.cache = None
+
+    async def _round_trip(self):
+        await super()._round_trip()
+        if self.cache is not None:
+            self.cache._apply_tracking_invalidation([b"weather:other"])
+
+
+def make_tracking_cache(redis_client, clock) -> CacheService:
+    """CacheService tracking ``weather:`` keys, with tracking marked active."""
+    local = LocalCache(max_entries=100, max_bytes=10000, max_ttl=5, clock=clock)
+    cache = CacheService(local=local, tracking_prefixes=["weather:"])
+    cache.redis_client = redis_client
+    cache.tracking = True
+    return cache
+
+
+async def test_tracked_keys_are_held_for_their_redis_ttl(clock):
+    """Test tracked keys outlive the local TTL and untracked keys do not."""
+    cache = make_tracking_cache(InMemoryRedis(clock), clock)
+    await cache.set("weather:k", "v", ttl=600)
+    await cache.set("timezone:k", "v", ttl=600)
+
+    clock.now = 100
+    assert await cache.get_many_with_ttl(["weather:k", "timezone:k"]) == [
+        ("v", 500),
+        ("v", 500),
+    ]
+    assert cache.redis_client.commands["get"] == 1
+
+
+async def test_invalidations_drop_local_copies(clock):
+    """Test key and flush invalidations from Redis."""
+    cache = make_tracking_cache(InMemoryRedis(clock), clock)
+    await cache.set("weather:a", "1", ttl=600)
+    await cache.set("weather:b", "2", ttl=600)
+
+    cache._apply_tracking_invalidation([b"weather:a"])
+    assert cache.local.get("weather:a") is None
+    assert cache.local.get("weather:b") is not None
+
+    cache._apply_tracking_invalidation(None)
+    assert len(cache.local) == 0
+
+
+async def test_reads_overlapping_an_invalidation_are_not_trusted(clock):
+    """Test a value read while an invalidation arrived keeps the short local TTL."""
+    redis_client = InvalidatingRedis(clock)
+    cache = make_tracking_cache(redis_client, clock)
+    await redis_client.setex("weather:k", 600, "v")
+    redis_client.cache = cache
+
+    await cache.get("weather:k")
+    clock.now = 10
+
+    assert cache.local.get("weather:k") is None
+
+
+@pytest.mark.skipif(not REDIS_URL, reason="TEST_REDIS_URL not set")
+async def test_server_invalidates_tracked_keys():
+    """Test a write by another client invalidates this worker's copy."""
+    writer = redis.from_url(REDIS_URL)
+    local = LocalCache(max_entries=100, max_bytes=10000, max_ttl=5)
+    cache = CacheService(local=local, tracking_prefixes=["test:tracking:"])
+    await cache.connect(redis.from_url(REDIS_URL))
+    try:
+        for _ in range(50):
+            if cache.tracking:
+                break
+            await asyncio.sleep(0.02)
+        assert cache.tracking
+
+        await cache.set("test:tracking:k", "old", ttl=60)
+        assert await cache.get("test:tracking:k") == "old"
+        await writer.setex("test:tracking:k", 60, "new")
+        for _ in range(50):
+            if cache.local.get("test:tracking:k") is None:
+                break
+            await asyncio.sleep(0.02)
+
+        assert await cache.get("test:tracking:k") == "new"
+    finally:
+        await writer.delete("test:tracking:k")
+        await writer.close()
+        await cache.disconnect()
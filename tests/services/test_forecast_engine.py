@@ -0,0 +1,132 @@
+"""Tests for daily forecast aggregation."""
+import random
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+
+from app.schemas.weather import DailyForecast, TemperatureRange
+from app.services import forecast_engine
+from app.services.forecast_engine import aggregate_daily, aggregate_daily_many
+from app.services.weather_messages import get_witty_message
+
+
+@pytest.fixture(autouse=True)
+def deterministic_messages(monkeypatch):
+    """Pick the first witty message so forecasts compare deterministically."""
+    monkeypatch.setattr("app.services.weather_messages.random.choice", lambda seq: seq[0])
+
+
+CONDITIONS = [("Rain", "light rain"), ("Clear", "clear sky"), ("Clouds", "few clouds")]
+
+
+def reference_aggregate(items, units):
+    """The per-day aggregation WeatherClient used to perform inline."""
+    daily_data = defaultdict(list)
+    for item in items:
+        daily_data[datetime.utcfromtimestamp(item["dt"]).strftime("%Y-%m-%d")].append(item)
+
+    forecasts = []
+    for date in sorted(daily_data.keys())[:5]:
+        day_items = daily_data[date]
+        temps = [item["main"]["temp"] for item in day_items]
+        conditions = [item["weather"][0]["main"] for item in day_items]
+        descriptions = [item["weather"][0]["description"] for item in day_items]
+        avg_temp = sum(temps) / len(temps)
+        wind_speed = sum(item["wind"]["speed"] for item in day_items) / len(day_items)
+        condition = max(set(conditions), key=conditions.count)
+        forecasts.append(
+            DailyForecast(
+                date=date,
+                temperature=TemperatureRange(
+                    min=round(min(temps), 1), max=round(max(temps), 1), avg=round(avg_temp, 1)
+                ),
+                description=max(set(descriptions), key=descriptions.count),
+                condition=condition,
+                humidity=sum(item["main"]["humidity"] for item in day_items) // len(day_items),
+                wind_speed=round(wind_speed, 1),
+                witty_message=get_witty_message(condition, avg_temp, wind_speed, units),
+            )
+        )
+    return forecasts
+
+
+def three_hourly_items(seed: int, start: int = 1642204800, count: int = 40):
+    """Generate forecast items whose daily modes are unambiguous."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        dt = start + i * 10800
+        # Every day is dominated by one condition so the mode has no ties.
+        main, description = CONDITIONS[(dt // 86400) % len(CONDITIONS)]
+        if i % 8 == 7:
+            main, description = CONDITIONS[(dt // 86400 + 1) % len(CONDITIONS)]
+        items.append(
+            {
+                "dt": dt,
+                "main": {"temp": round(rng.uniform(-10, 35), 2), "humidity": rng.randint(20, 100)},
+                "weather": [{"main": main, "description": description}],
+                "wind": {"speed": round(rng.uniform(0, 15), 2)},
+            }
+        )
+    return items
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_reference_aggregation(seed):
+    """Test the engine reproduces the previous per-day loop."""
+    items = three_hourly_items(seed)
+
+    assert aggregate_daily(items, "metric") == reference_aggregate(items, "metric")
+
+
+def test_fixture_payload(mock_forecast_response):
+    """Test aggregation of the sample upstream payload."""
+    forecasts = aggregate_daily(mock_forecast_response["list"], "metric")
+
+    assert [f.date for f in forecasts] == ["2022-01-15", "2022-01-16"]
+    assert forecasts[0].condition == "Rain"
+    assert forecasts[1].temperature == TemperatureRange(min=15.0, max=15.0, avg=15.0)
+
+
+def test_ties_prefer_first_seen_value():
+    """Test modal condition ties resolve to the earliest item."""
+    items = three_hourly_items(0, count=2)
+    items[0]["weather"] = [{"main": "Snow", "description": "light snow"}]
+    items[1]["weather"] = [{"main": "Rain", "description": "light rain"}]
+
+    forecast = aggregate_daily(items, "metric")[0]
+
+    assert (forecast.condition, forecast.description) == ("Snow", "light snow")
+
+
+def test_limits_days_and_sorts_out_of_order_items():
+    """Test only the leading days are returned, in date order."""
+    items = list(reversed(three_hourly_items(1, count=56)))
+
+    forecasts = aggregate_daily(items, "metric", days=3)
+
+    assert [f.date for f in forecasts] == ["2022-01-15", "2022-01-16", "2022-01-17"]
+
+
+def test_many_without_numpy_matches_single(monkeypatch):
+    """Test the pure Python fallback of the batch entry point."""
+    monkeypatch.setattr(forecast_engine, "np", None)
+    payloads = [three_hourly_items(seed) for seed in range(3)]
+
+    assert aggregate_daily_many(payloads, "imperial") == [
+        aggregate_daily(items, "imperial") for items in payloads
+    ]
+
+
+def test_many_with_numpy_matches_single():
+    """Test the vectorized path returns identical forecasts."""
+    pytest.importorskip("numpy")
+    payloads = [three_hourly_items(seed, start=1642204800 + seed * 3600) for seed in range(8)]
+    payloads.append([])
+    payloads[0][0]["weather"] = [{"main": "Snow", "description": "light snow"}]
+    payloads[0][1]["weather"] = [{"main": "Snow", "description": "light snow"}]
+
+    assert aggregate_daily_many(payloads, "metric") == [
+        aggregate_daily(items, "metric") for items in payloads
+    ]
@@ -0,0 +1,144 @@
+"""Tests for upstream micro-batching."""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services import weather_client as weather_client_module
+from app.services.group_batcher import GroupBatcher, GroupMissError
+from app.services.upstream_scheduler import Priority, UpstreamThrottledError
+from app.services.weather_client import WeatherClient
+
+
+def city(city_id: int) -> dict:
+    """Minimal group response entry."""
+    return {"id": city_id, "name": f"City {city_id}"}
+
+
+async def test_concurrent_fetches_share_one_call():
+    """Test fetches within the window are served by one group call."""
+    fetch_group = AsyncMock(side_effect=lambda ids, units, priority: [city(i) for i in ids])
+    batcher = GroupBatcher(fetch_group, window=0.01, max_size=20)
+
+    results = await asyncio.gather(*(batcher.fetch(city_id, "metric") for city_id in (1, 2, 3)))
+
+    assert [result["id"] for result in results] == [1, 2, 3]
+    fetch_group.assert_awaited_once_with([1, 2, 3], "metric", Priority.INTERACTIVE)
+
+
+async def test_full_batch_flushes_immediately():
+    """Test a batch is sent as soon as it reaches the maximum size."""
+    fetch_group = AsyncMock(side_effect=lambda ids, units, priority: [city(i) for i in ids])
+    batcher = GroupBatcher(fetch_group, window=10, max_size=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.fetch(1, "metric"), batcher.fetch(2, "metric")), timeout=1
+    )
+
+    assert [result["id"] for result in results] == [1, 2]
+
+
+async def test_lone_fetch_is_handed_back():
+    """Test a city alone in its batch is left to a single-city call."""
+    fetch_group = AsyncMock()
+    batcher = GroupBatcher(fetch_group, window=0.001, max_size=20)
+
+    assert await batcher.fetch(1, "metric") is None
+    fetch_group.assert_not_awaited()
+
+
+async def test_batches_are_split_by_units_and_use_highest_priority():
+    """Test units are batched separately at their members' top priority."""
+    fetch_group = AsyncMock(side_effect=lambda ids, units, priority: [city(i) for i in ids])
+    batcher = GroupBatcher(fetch_group, window=0.01, max_size=20)
+
+    await asyncio.gather(
+        batcher.fetch(1, "metric", Priority.BACKGROUND),
+        batcher.fetch(2, "metric", Priority.INTERACTIVE),
+        batcher.fetch(1, "imperial", Priority.BACKGROUND),
+        batcher.fetch(2, "imperial", Priority.WARMUP),
+    )
+
+    calls = {call.args[1]: call.args[2] for call in fetch_group.await_args_list}
+    assert calls == {"metric": Priority.INTERACTIVE, "imperial": Priority.BACKGROUND}
+
+
+async def test_missing_city_and_errors_are_reported():
+    """Test callers learn about missing entries and failed calls."""
+    batcher = GroupBatcher(AsyncMock(return_value=[city(1)]), window=0.01, max_size=20)
+    results = await asyncio.gather(
+        batcher.fetch(1, "metric"), batcher.fetch(2, "metric"), return_exceptions=True
+    )
+    assert results[0]["id"] == 1
+    assert isinstance(results[1], GroupMissError)
+
+    batcher = GroupBatcher(AsyncMock(side_effect=RuntimeError("down")), window=0.01, max_size=20)
+    with pytest.raises(RuntimeError):
+        await asyncio.gather(batcher.fetch(1, "metric"), batcher.fetch(2, "metric"))
+
+
+async def test_weather_client_batches_known_cities(fake_cache, monkeypatch, mock_weather_response):
+    """Test concurrent misses for known cities become one group call."""
+    client = WeatherClient()
+    client.api_key = "test-key"
+    for alias, city_id in (("london", 1), ("paris", 2), ("rome", 3)):
+        await weather_client_module.location_resolver.learn(alias, city_id)
+
+    async def get_json(endpoint, params, location, priority=None):
+        assert endpoint == "group"
+        return {
+            "list": [
+                {**mock_weather_response, "id": int(city_id), "name": f"City {city_id}"}
+                for city_id in params["id"].split(",")
+            ]
+        }
+
+    upstream = AsyncMock(side_effect=get_json)
+    monkeypatch.setattr(client, "_get_json", upstream)
+
+    results = await asyncio.gather(
+        *(client.get_current_weather(name) for name in ("London", "Paris", "Rome"))
+    )
+
+    assert [result.location for result in results] == ["City 1, GB", "City 2, GB", "City 3, GB"]
+    assert upstream.await_count == 1
+    assert len(fake_cache.values) == 3
+
+
+@pytest.mark.parametrize("error", [ValueError("City not found: city ids 1,2"), RuntimeError("bad")])
+async def test_weather_client_falls_back_when_group_call_fails(
+    fake_cache, monkeypatch, mock_weather_response, error
+):
+    """Test a failed group call is retried as single-city calls for every waiter."""
+    client = WeatherClient()
+    client.api_key = "test-key"
+    for alias, city_id in (("london", 1), ("paris", 2)):
+        await weather_client_module.location_resolver.learn(alias, city_id)
+
+    async def get_json(endpoint, params, location, priority=None):
+        if endpoint == "group":
+            raise error
+        return {**mock_weather_response, "id": params["id"], "name": f"City {params['id']}"}
+
+    upstream = AsyncMock(side_effect=get_json)
+    monkeypatch.setattr(client, "_get_json", upstream)
+
+    results = await asyncio.gather(
+        *(client.get_current_weather(name) for name in ("London", "Paris"))
+    )
+
+    assert [result.location for result in results] == ["City 1, GB", "City 2, GB"]
+    assert [call.args[0] for call in upstream.await_args_list] == ["group", "weather", "weather"]
+
+
+async def test_weather_client_does_not_fall_back_when_throttled(fake_cache, monkeypatch):
+    """Test quota errors from the group call are not multiplied into single-city calls."""
+    client = WeatherClient()
+    client.api_key = "test-key"
+    await weather_client_module.location_resolver.learn("london", 1)
+    upstream = AsyncMock(side_effect=UpstreamThrottledError("queue full"))
+    monkeypatch.setattr(client, "_get_json", upstream)
+
+    with pytest.raises(UpstreamThrottledError):
+        await client.get_current_weather("London")
+    assert upstream.await_count == 1
@@ -0,0 +1,101 @@
+"""Tests for the shared upstream HTTP client."""
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.services.http_client import UpstreamHTTPClient
+from app.services.upstream_scheduler import Priority
+from app.services.weather_client import weather_client
+
+
+@pytest.fixture
+def upstream(mock_weather_response):
+    """Shared client wired to a mock transport that records requests."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/weather"):
+            return httpx.Response(200, json=mock_weather_response)
+        return httpx.Response(404)
+
+    client = UpstreamHTTPClient()
+    client.requests = requests
+    client.transport = httpx.MockTransport(handler)
+    return client
+
+
+async def test_start_warms_up_connections(upstream, monkeypatch):
+    """Test startup pre-opens the configured number of connections."""
+    monkeypatch.setattr("app.core.config.settings.WEATHER_API_WARMUP_CONNECTIONS", 3)
+
+    await upstream.start(transport=upstream.transport)
+
+    assert [request.method for request in upstream.requests] == ["HEAD"] * 3
+    await upstream.close()
+
+
+async def test_warm_up_waits_for_the_scheduler(upstream, monkeypatch):
+    """Test warm-up requests take quota tokens at the lowest priority."""
+    acquire = AsyncMock()
+    monkeypatch.setattr("app.services.http_client.upstream_scheduler.acquire", acquire)
+    monkeypatch.setattr("app.core.config.settings.WEATHER_API_WARMUP_CONNECTIONS", 2)
+
+    await upstream.start(transport=upstream.transport)
+
+    assert [call.args for call in acquire.await_args_list] == [(Priority.WARMUP,)] * 2
+    await upstream.close()
+
+
+async def test_client_is_reused(upstream):
+    """Test every request goes through the same pooled client."""
+    await upstream.start(transport=upstream.transport)
+    client = upstream.client
+
+    await upstream.get("/weather", params={"q": "London"})
+    await upstream.get("/weather", params={"q": "Paris"})
+
+    assert upstream.client is client
+    assert str(upstream.requests[-1].url).startswith(
+        "https://api.openweathermap.org/data/2.5/weather"
+    )
+    await upstream.close()
+
+
+async def test_close_is_idempotent(upstream):
+    """Test closing twice does not fail."""
+    await upstream.start(transport=upstream.transport)
+    await upstream.close()
+    await upstream.close()
+
+
+def test_unset_phase_timeouts_use_the_overall_timeout(monkeypatch):
+    """Test an unset per-phase timeout falls back instead of disabling the timeout."""
+    monkeypatch.setattr("app.core.config.settings.WEATHER_API_TIMEOUT", 30)
+    monkeypatch.setattr("app.core.config.settings.WEATHER_API_READ_TIMEOUT", None)
+    monkeypatch.setattr("app.core.config.settings.WEATHER_API_CONNECT_TIMEOUT", 2.0)
+
+    timeout = UpstreamHTTPClient()._build_client().timeout
+
+    assert timeout.read == 30
+    assert timeout.connect == 2.0
+
+
+def test_pool_stats_without_client():
+    """Test pool stats before the client is opened."""
+    assert UpstreamHTTPClient().pool_stats() == {"in_use": 0, "idle": 0, "waiting": 0}
+
+
+async def test_weather_client_uses_shared_client(upstream, monkeypatch):
+    """Test WeatherClient sends cache misses through the shared client."""
+    monkeypatch.setattr(weather_client, "api_key", "test-key")
+    monkeypatch.setattr("app.services.weather_client.upstream_client", upstream)
+    await upstream.start(transport=upstream.transport)
+
+    result = await weather_client.get_current_weather("London", "GB")
+
+    assert result.location == "London, GB"
+    assert upstream.requests[-1].url.path.endswith("/weather")
+    assert upstream.requests[-1].url.params["appid"] == "test-key"
+    await upstream.close()
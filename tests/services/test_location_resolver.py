@@ -0,0 +1,83 @@
+"""Tests for canonical location resolution."""
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.cache import CacheService
+from app.services.location_resolver import LocationResolver
+from app.services.weather_client import WeatherClient
+from tools.fake_redis import InMemoryRedis
+
+
+@pytest.mark.parametrize(
+    "city,country_code,expected",
+    [
+        ("London", None, "london"),
+        ("  London ", None, "london"),
+        ("London", "GB", "london,gb"),
+        ("London,GB", None, "london,gb"),
+        ("london , gb", None, "london,gb"),
+        ("New   York", " us ", "new york,us"),
+    ],
+)
+def test_normalize(city, country_code, expected):
+    """Test equivalent queries normalize to the same alias."""
+    assert LocationResolver.normalize(city, country_code) == expected
+
+
+async def test_learned_alias_resolves_locally_and_from_redis(fake_cache):
+    """Test learned aliases are shared through Redis."""
+    resolver = LocationResolver()
+    await resolver.learn("london,gb", 2643743)
+
+    assert await resolver.resolve("london,gb") == 2643743
+    assert await LocationResolver().resolve("london,gb") == 2643743
+    assert await resolver.resolve("paris") is None
+
+
+async def test_local_map_is_bounded(fake_cache):
+    """Test the in-process alias map evicts least recently used entries."""
+    resolver = LocationResolver(max_entries=2)
+    for alias, city_id in (("a", 1), ("b", 2), ("c", 3)):
+        await resolver.learn(alias, city_id)
+
+    assert list(resolver._aliases) == ["b", "c"]
+    assert resolver.stats()["aliases_per_city"] == 1.0
+
+
+async def test_redis_map_is_capped(monkeypatch):
+    """Test the shared alias hash keeps only the most recently learned aliases."""
+    redis = InMemoryRedis()
+    cache = CacheService()
+    cache.redis_client = redis
+    monkeypatch.setattr("app.services.location_resolver.cache_service", cache)
+    resolver = LocationResolver(redis_max_entries=2, redis_ttl=60)
+    for alias, city_id in (("a", 1), ("b", 2), ("c", 3)):
+        await resolver.learn(alias, city_id)
+
+    assert await redis.hgetall(LocationResolver.REDIS_KEY) == {"b": "2", "c": "3"}
+    assert await LocationResolver().resolve("a") is None
+    assert 0 < await redis.ttl(LocationResolver.REDIS_KEY) <= 60
+
+
+async def test_aliases_share_one_cache_entry(fake_cache, monkeypatch, mock_weather_response):
+    """Test equivalent queries are served from one canonical cache entry."""
+    client = WeatherClient()
+    client.api_key = "test-key"
+    upstream = AsyncMock(return_value=mock_weather_response)
+    monkeypatch.setattr(client, "_get_json", upstream)
+
+    for city, country_code in (
+        ("London", None),
+        (" london ", None),
+        ("London", "GB"),
+        ("LONDON, gb", None),
+    ):
+        result = await client.get_current_weather(city, country_code)
+        assert result.location == "London, GB"
+
+    assert upstream.await_count == 2
+    assert upstream.await_args_list[0].args[1]["q"] == "london"
+    assert list(fake_cache.values) == [
+        client._generate_cache_key("current", {"id": 2643743})
+    ]
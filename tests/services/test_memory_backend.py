@@ -0,0 +1,35 @@
+"""Tests for the in-process cache backend."""
+from app.services.memory_backend import MemoryBackend
+
+
+async def test_keys_expire_and_oldest_are_evicted():
+    """Test TTL expiry and the entry bound."""
+    now = [0.0]
+    backend = MemoryBackend(max_entries=2, clock=lambda: now[0])
+
+    await backend.setex("a", 10, "1")
+    await backend.setex("b", 60, "2")
+    async with backend.pipeline(transaction=False) as pipe:
+        assert await pipe.get("a").ttl("b").execute() == ["1", 60]
+
+    await backend.setex("c", 60, "3")
+    assert await backend.mget(["a", "b", "c"]) == [None, "2", "3"]
+
+    now[0] = 60
+    assert (await backend.get("b"), await backend.ttl("b")) == (None, -2)
+    backend.clear()
+    assert await backend.get("c") is None
+
+
+async def test_sorted_set_ranges_follow_redis():
+    """Test ZREMRANGEBYRANK and ZREMRANGEBYSCORE use Redis range semantics."""
+    backend = MemoryBackend()
+    await backend.zadd("z", {"a": 1, "b": 2})
+    assert await backend.zremrangebyrank("z", 0, -4) == 0
+
+    await backend.zadd("z", {"c": 3, "d": 4, "e": 5})
+    assert await backend.zremrangebyrank("z", 0, -4) == 2
+    assert await backend.zscore("z", "b") is None
+    assert await backend.zscore("z", "c") == 3.0
+    assert await backend.zremrangebyscore("z", "-inf", 4) == 2
+    assert await backend.zscore("z", "e") == 5.0
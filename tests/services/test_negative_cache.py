@@ -0,0 +1,63 @@
+"""Tests for negative caching of failed lookups."""
+import pytest
+
+from app.services.cache import CacheService
+from app.services.negative_cache import NegativeCache
+from tools.fake_redis import InMemoryRedis
+
+
+@pytest.fixture
+def clock_start() -> float:
+    """Start the clock at a wall-clock time."""
+    return 1_700_000_000.0
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    """In-memory Redis behind the cache service used for negative entries."""
+    redis = InMemoryRedis()
+    cache = CacheService()
+    cache.redis_client = redis
+    monkeypatch.setattr("app.services.negative_cache.cache_service", cache)
+    return redis
+
+
+async def test_failures_are_remembered_until_their_ttl(redis, clock):
+    """Test a failed name is a hit until it expires, apart from positive entries."""
+    negative = NegativeCache({"city": 300}, clock=clock)
+
+    assert not await negative.contains("city", "atlantis")
+    await negative.add("city", "atlantis")
+    assert await negative.contains("city", "atlantis")
+    assert not await negative.contains("city", "paris")
+    assert await redis.zscore("negative:city", NegativeCache._member("atlantis")) is not None
+
+    clock.now += 301
+    assert not await negative.contains("city", "atlantis")
+
+
+async def test_namespace_is_capped(redis, clock):
+    """Test flooding with names keeps only the newest max_entries, dropping expired first."""
+    negative = NegativeCache({"city": 300}, max_entries=3, clock=clock)
+    await negative.add("city", "expired")
+    clock.now += 301
+    for i in range(5):
+        clock.now += 1
+        await negative.add("city", f"name-{i}")
+
+    assert [await negative.contains("city", f"name-{i}") for i in range(5)] == [
+        False,
+        False,
+        True,
+        True,
+        True,
+    ]
+    assert await redis.zscore("negative:city", NegativeCache._member("expired")) is None
+
+
+async def test_disabled_namespace_is_never_checked(redis):
+    """Test a zero TTL turns negative caching off without Redis calls."""
+    negative = NegativeCache({"city": 0})
+    await negative.add("city", "atlantis")
+    assert not await negative.contains("city", "atlantis")
+    assert redis.total_commands == 0
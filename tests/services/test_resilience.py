@@ -0,0 +1,145 @@
+"""Tests for upstream resilience policies."""
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.services.resilience import (
+    Backoff,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResiliencePolicy,
+    RetryBudget,
+)
+from app.services.weather_client import is_retryable_upstream_error
+
+
+def status_error(status: int) -> httpx.HTTPStatusError:
+    """Build an HTTPStatusError for ``status``."""
+    request = httpx.Request("GET", "https://example.test/weather")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status}", request=request, response=response)
+
+
+def make_policy(max_attempts=3, threshold=5, budget=None, clock=None) -> ResiliencePolicy:
+    """Build a policy with zero backoff."""
+    clock = clock or (lambda: 0.0)
+    return ResiliencePolicy(
+        name="test",
+        max_attempts=max_attempts,
+        backoff=Backoff(0, 0),
+        budget=budget or RetryBudget(ratio=1.0, min_retries=100, window=10, clock=clock),
+        breaker=CircuitBreaker("test", threshold, recovery_timeout=30, clock=clock),
+        is_retryable=is_retryable_upstream_error,
+    )
+
+
+def test_backoff_is_bounded():
+    """Test jittered delays stay within the exponential envelope."""
+    backoff = Backoff(base=0.5, maximum=2.0)
+    for attempt in range(6):
+        delay = backoff.delay(attempt)
+        assert 0 <= delay <= min(2.0, 0.5 * 2**attempt)
+
+
+def test_retry_budget_caps_retry_ratio(clock):
+    """Test retries are limited to a share of calls in the window."""
+    budget = RetryBudget(ratio=0.1, min_retries=2, window=10, clock=clock)
+    for _ in range(50):
+        budget.record_call()
+
+    granted = sum(budget.try_acquire() for _ in range(20))
+    assert granted == 5
+
+    clock.now = 11
+    budget.record_call()
+    assert budget.try_acquire()
+
+
+def test_retryable_classification():
+    """Test which upstream errors are retried."""
+    assert is_retryable_upstream_error(status_error(503))
+    assert is_retryable_upstream_error(status_error(429))
+    assert is_retryable_upstream_error(httpx.ConnectTimeout("timeout"))
+    assert not is_retryable_upstream_error(status_error(404))
+    assert not is_retryable_upstream_error(status_error(401))
+
+
+async def test_policy_retries_until_success():
+    """Test transient failures are retried."""
+    policy = make_policy()
+    fn = AsyncMock(side_effect=[status_error(502), httpx.ReadTimeout("slow"), "ok"])
+
+    assert await policy.call(fn) == "ok"
+    assert fn.await_count == 3
+
+
+async def test_policy_does_not_retry_client_errors():
+    """Test a 404 is raised immediately."""
+    policy = make_policy()
+    fn = AsyncMock(side_effect=status_error(404))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await policy.call(fn)
+    assert fn.await_count == 1
+
+
+async def test_policy_stops_when_budget_exhausted():
+    """Test retries stop once the retry budget is spent."""
+    budget = RetryBudget(ratio=0.0, min_retries=0, window=10)
+    policy = make_policy(budget=budget)
+    fn = AsyncMock(side_effect=status_error(500))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await policy.call(fn)
+    assert fn.await_count == 1
+
+
+async def test_breaker_opens_and_recovers(clock):
+    """Test the breaker fails fast while open and closes after a good probe."""
+    policy = make_policy(max_attempts=1, threshold=2, clock=clock)
+    failing = AsyncMock(side_effect=status_error(503))
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await policy.call(failing)
+    assert policy.breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        await policy.call(AsyncMock(return_value="ok"))
+
+    clock.now = 31
+    assert await policy.call(AsyncMock(return_value="ok")) == "ok"
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_failed_probe_reopens_breaker(clock):
+    """Test a failing half-open probe opens the breaker again."""
+    policy = make_policy(max_attempts=1, threshold=1, clock=clock)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await policy.call(AsyncMock(side_effect=status_error(500)))
+    clock.now = 31
+    with pytest.raises(httpx.HTTPStatusError):
+        await policy.call(AsyncMock(side_effect=status_error(500)))
+
+    assert policy.breaker.state == CircuitBreaker.OPEN
+
+
+async def test_cancelled_probe_releases_its_slot(clock):
+    """Test a cancelled half-open probe lets the next call probe again."""
+    policy = make_policy(max_attempts=1, threshold=1, clock=clock)
+    with pytest.raises(httpx.HTTPStatusError):
+        await policy.call(AsyncMock(side_effect=status_error(500)))
+    clock.now = 31
+
+    probe = asyncio.create_task(policy.call(AsyncMock(side_effect=asyncio.Event().wait)))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert policy.breaker.state == CircuitBreaker.HALF_OPEN
+    assert await policy.call(AsyncMock(return_value="ok")) == "ok"
+    assert policy.breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,90 @@
+"""Tests for single-flight request coalescing."""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+from app.services.weather_client import WeatherClient
+
+
+async def test_concurrent_calls_share_one_fetch():
+    """Test concurrent callers for the same key trigger a single fetch."""
+    flights = SingleFlight("test")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flights.do("key", fetch) for _ in range(10)))
+
+    assert results == ["result"] * 10
+    assert calls == 1
+    assert not flights.in_flight("key")
+
+
+async def test_different_keys_fetch_independently():
+    """Test calls for different keys are not coalesced."""
+    flights = SingleFlight("test")
+    fetch = AsyncMock(side_effect=["a", "b"])
+
+    results = await asyncio.gather(flights.do("a", fetch), flights.do("b", fetch))
+
+    assert results == ["a", "b"]
+    assert fetch.await_count == 2
+
+
+async def test_error_is_shared_and_not_remembered():
+    """Test waiters share the leader's error and the next call retries."""
+    flights = SingleFlight("test")
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("City not found: Atlantis")
+
+    results = await asyncio.gather(
+        *(flights.do("key", failing) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert await flights.do("key", AsyncMock(return_value="ok")) == "ok"
+
+
+async def test_leader_cancellation_does_not_fail_waiters():
+    """Test cancelling the leader leaves the shared fetch running."""
+    flights = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    leader = asyncio.ensure_future(flights.do("key", fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flights.do("key", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "result"
+
+
+async def test_weather_client_coalesces_current_weather(monkeypatch, mock_weather_response):
+    """Test concurrent cache misses for one city make one upstream call."""
+    client = WeatherClient()
+    client.api_key = "test-key"
+
+    async def get_json(endpoint, params, location, priority=None):
+        await asyncio.sleep(0.01)
+        return mock_weather_response
+
+    get_json_mock = AsyncMock(side_effect=get_json)
+    monkeypatch.setattr(client, "_get_json", get_json_mock)
+
+    results = await asyncio.gather(
+        *(client.get_current_weather("London", "GB") for _ in range(5))
+    )
+
+    assert {result.location for result in results} == {"London, GB"}
+    assert get_json_mock.await_count == 1
@@ -0,0 +1,32 @@
+"""Tests for the timezone service."""
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.metrics import CACHE_NEGATIVE_REJECTIONS
+from app.services.timezone_service import TimezoneService
+
+
+async def test_unknown_timezone_is_rejected_in_process(fake_cache, monkeypatch):
+    """Test unknown names are rejected in-process, before pytz or any cache access."""
+    service = TimezoneService()
+    lookups = []
+    monkeypatch.setattr("app.services.timezone_service.pytz.timezone", lookups.append)
+    cache_get = AsyncMock()
+    monkeypatch.setattr(fake_cache, "get", cache_get)
+    rejected = CACHE_NEGATIVE_REJECTIONS.labels("timezone")._value.get()
+
+    with pytest.raises(ValueError, match="Unknown timezone"):
+        await service.get_timezone_info("Mars/Olympus_Mons")
+
+    assert lookups == []
+    cache_get.assert_not_awaited()
+    assert fake_cache.values == {} and fake_cache.sorted_sets == {}
+    assert CACHE_NEGATIVE_REJECTIONS.labels("timezone")._value.get() == rejected + 1
+
+
+async def test_known_timezones_match_case_insensitively(fake_cache):
+    """Test names pytz accepts in any case are still served."""
+    result = await TimezoneService().get_timezone_info("europe/london")
+
+    assert result.utc_offset in ("+00:00", "+01:00")
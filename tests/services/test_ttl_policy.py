@@ -0,0 +1,65 @@
+"""Tests for adaptive cache TTLs."""
+import pytest
+
+from app.services.ttl_policy import TTLPolicy
+from app.services.weather_client import WeatherClient
+
+NOW = 1_700_000_000
+
+
+def policy(**overrides) -> TTLPolicy:
+    """Current-weather style policy with a fixed clock."""
+    options = {
+        "namespace": "test",
+        "cadence": 600,
+        "publish_delay": 60,
+        "min_ttl": 60,
+        "max_ttl": 1800,
+        "default_ttl": 1800,
+        "clock": lambda: NOW,
+    }
+    options.update(overrides)
+    return TTLPolicy(**options)
+
+
+@pytest.mark.parametrize(
+    "age,expected",
+    [
+        (0, 660),  # fresh observation: kept until the next one is published
+        (500, 160),
+        (640, 60),  # next observation is due: clamped to the minimum
+        (7200, 60),
+        (-3000, 1800),  # clock skew: clamped to the maximum
+    ],
+)
+def test_ttl_follows_observation_time(age, expected):
+    """Test the TTL runs until newer data is expected upstream."""
+    assert policy().ttl(NOW - age) == expected
+
+
+def test_missing_observation_or_cadence_uses_default():
+    """Test the flat default applies without an anchor or cadence."""
+    assert policy().ttl(None) == 1800
+    assert policy(cadence=0).ttl(NOW) == 1800
+
+
+async def test_forecast_ttl_ends_when_forecast_rolls(
+    fake_cache, monkeypatch, mock_forecast_response
+):
+    """Test forecast entries expire shortly after their first slot begins."""
+    client = WeatherClient()
+    client.api_key = "test-key"
+    first_slot = mock_forecast_response["list"][0]["dt"]
+    client._forecast_ttl.clock = lambda: first_slot - 3600
+
+    async def get_json(endpoint, params, location, priority=None):
+        return mock_forecast_response
+
+    monkeypatch.setattr(client, "_get_json", get_json)
+    monkeypatch.setattr("app.core.config.settings.CACHE_STALE_TTL_FORECAST", 0)
+
+    await client.get_forecast("London", "GB")
+
+    (key,) = fake_cache.values
+    _, ttl = await fake_cache.get_with_ttl(key)
+    assert 3600 + 60 - 1 <= ttl <= 3600 + 60
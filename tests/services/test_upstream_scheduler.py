@@ -0,0 +1,93 @@
+"""Tests for the upstream quota scheduler."""
+import asyncio
+
+import pytest
+
+from app.services.upstream_scheduler import (
+    Priority,
+    UpstreamQueueFullError,
+    UpstreamQueueTimeoutError,
+    UpstreamScheduler,
+)
+
+TIMEOUTS = {priority: 1.0 for priority in Priority}
+
+
+def make_scheduler(calls_per_minute=60, burst=2, max_queue=10) -> UpstreamScheduler:
+    """Build a scheduler with a fast refill rate for tests."""
+    scheduler = UpstreamScheduler(calls_per_minute, burst, max_queue, TIMEOUTS)
+    scheduler.rate = 100.0
+    return scheduler
+
+
+async def test_burst_is_granted_immediately():
+    """Test calls within the burst do not wait."""
+    scheduler = make_scheduler(burst=3)
+
+    for _ in range(3):
+        await asyncio.wait_for(scheduler.acquire(), timeout=0.001)
+    assert scheduler.queue_depth == 0
+
+
+async def test_interactive_calls_go_first():
+    """Test queued interactive calls are released before background ones."""
+    scheduler = make_scheduler(burst=1)
+    await scheduler.acquire()
+    order = []
+
+    async def call(priority, name):
+        await scheduler.acquire(priority)
+        order.append(name)
+
+    background = asyncio.ensure_future(call(Priority.WARMUP, "warmup"))
+    refresh = asyncio.ensure_future(call(Priority.BACKGROUND, "refresh"))
+    await asyncio.sleep(0)
+    interactive = asyncio.ensure_future(call(Priority.INTERACTIVE, "user"))
+    await asyncio.gather(background, refresh, interactive)
+
+    assert order == ["user", "refresh", "warmup"]
+
+
+async def test_queue_is_bounded():
+    """Test calls are rejected once the queue is full."""
+    scheduler = make_scheduler(burst=1, max_queue=1)
+    scheduler.rate = 0.01
+    await scheduler.acquire()
+    waiter = asyncio.ensure_future(scheduler.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(UpstreamQueueFullError):
+        await scheduler.acquire()
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.queue_depth == 0
+
+
+async def test_deadline_expires():
+    """Test queued calls fail once their deadline passes."""
+    scheduler = make_scheduler(burst=1)
+    scheduler.rate = 0.01
+    await scheduler.acquire()
+
+    with pytest.raises(UpstreamQueueTimeoutError):
+        await scheduler.acquire(timeout=0.01)
+    assert scheduler.queue_depth == 0
+
+
+async def test_penalize_pauses_grants():
+    """Test a quota response pauses token grants."""
+    scheduler = make_scheduler(burst=5)
+    scheduler.penalize(0.05)
+
+    with pytest.raises(UpstreamQueueTimeoutError):
+        await scheduler.acquire(timeout=0.01)
+    await asyncio.wait_for(scheduler.acquire(), timeout=0.5)
+
+
+async def test_disabled_scheduler_never_waits():
+    """Test a zero quota disables scheduling."""
+    scheduler = UpstreamScheduler(0, 1, 0, TIMEOUTS)
+
+    for _ in range(100):
+        await scheduler.acquire()
@@ -0,0 +1,225 @@
+"""Tests for the weather API client service."""
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.schemas.weather import CurrentWeatherResponse
+from app.services.http_client import UpstreamHTTPClient
+from app.services.upstream_scheduler import Priority
+from app.services.weather_client import CityNotFoundError, WeatherClient
+
+
+@pytest.fixture
+def weather(monkeypatch, mock_weather_response):
+    """WeatherClient with a mocked upstream."""
+    client = WeatherClient()
+    client.api_key = "test-key"
+
+    async def get_json(endpoint, params, location, priority=None):
+        await asyncio.sleep(0.01)
+        return mock_weather_response
+
+    client.upstream = AsyncMock(side_effect=get_json)
+    monkeypatch.setattr(client, "_get_json", client.upstream)
+    return client
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Mocked cache service."""
+    mock = AsyncMock()
+    mock.set.return_value = True
+    monkeypatch.setattr("app.services.weather_client.cache_service", mock)
+    return mock
+
+
+def cached_current_weather() -> str:
+    """Serialized current weather entry as stored in the cache."""
+    return CurrentWeatherResponse(
+        location="London, GB",
+        temperature=11.0,
+        feels_like=9.0,
+        humidity=80,
+        description="light rain",
+        condition="Rain",
+        wind_speed=4.0,
+        timestamp="2024-01-15T15:00:00Z",
+        units="metric",
+        witty_message="You'll regret not wearing a coat!",
+    ).model_dump_json()
+
+
+async def test_fresh_hit_does_not_refresh(weather, cache):
+    """Test a fresh cache hit is served without contacting the upstream."""
+    cache.get_with_ttl.return_value = (cached_current_weather(), settings.CACHE_TTL)
+
+    result = await weather.get_current_weather("London", "GB")
+    await asyncio.sleep(0.02)
+
+    assert result.temperature == 11.0
+    weather.upstream.assert_not_awaited()
+
+
+async def test_hit_can_be_served_as_cached_json(weather, cache):
+    """Test hits in canonical units skip building the model when JSON is wanted."""
+    cache.get_with_ttl.return_value = (cached_current_weather(), settings.CACHE_TTL)
+
+    result = await weather.get_current_weather("London", "GB", as_json=True)
+    converted = await weather.get_current_weather("London", "GB", "imperial", as_json=True)
+
+    assert result == cached_current_weather()
+    assert isinstance(converted, CurrentWeatherResponse)
+    assert converted.units == "imperial"
+
+
+async def test_stale_hit_is_served_and_refreshed_once(weather, cache):
+    """Test stale hits return cached data and trigger a single refresh."""
+    cache.get_with_ttl.return_value = (cached_current_weather(), 5)
+
+    results = await asyncio.gather(
+        *(weather.get_current_weather("London", "GB") for _ in range(5))
+    )
+    await asyncio.sleep(0.03)
+
+    assert {result.temperature for result in results} == {11.0}
+    assert weather.upstream.await_count == 1
+    assert weather.upstream.await_args.args[3] == Priority.BACKGROUND
+    cache.set.assert_awaited_once()
+
+
+async def test_miss_writes_hard_ttl(weather, cache, mock_weather_response):
+    """Test entries are cached for the soft TTL plus the stale window."""
+    cache.get_with_ttl.return_value = (None, -2)
+    weather._current_ttl.clock = lambda: mock_weather_response["dt"] + 100
+
+    result = await weather.get_current_weather("London", "GB")
+
+    assert result.temperature == 12.5
+    assert cache.set.await_args.kwargs["ttl"] == (
+        settings.CACHE_TTL_CURRENT_CADENCE
+        + settings.CACHE_TTL_PUBLISH_DELAY
+        - 100
+        + settings.CACHE_STALE_TTL_CURRENT
+    )
+
+
+async def test_stale_window_disabled(weather, cache, monkeypatch):
+    """Test a zero stale window never refreshes in the background."""
+    monkeypatch.setattr(settings, "CACHE_STALE_TTL_CURRENT", 0)
+    cache.get_with_ttl.return_value = (cached_current_weather(), 5)
+
+    await weather.get_current_weather("London", "GB")
+    await asyncio.sleep(0.02)
+
+    weather.upstream.assert_not_awaited()
+
+
+async def test_batch_serves_hits_and_fetches_misses(fake_cache, monkeypatch, mock_weather_response):
+    """Test batch lookups read the cache once and fan out misses with a cap."""
+    monkeypatch.setattr(settings, "WEATHER_BATCH_CONCURRENCY", 2)
+    client = WeatherClient()
+    client.api_key = "test-key"
+    active = peak = 0
+
+    async def get_json(endpoint, params, location, priority=None):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if params.get("q") == "atlantis":
+            raise ValueError("City not found: Atlantis")
+        return {**mock_weather_response, "id": hash(params["q"]), "name": params["q"].title()}
+
+    monkeypatch.setattr(client, "_get_json", AsyncMock(side_effect=get_json))
+    await fake_cache.set(
+        client._cache_key("current", "paris", None), cached_current_weather()
+    )
+
+    results = await client.get_current_weather_batch(
+        [("Paris", None), ("Berlin", None), ("Rome", None), ("Oslo", None), ("Atlantis", None)]
+    )
+
+    assert results[0].location == "London, GB"
+    assert [result.location for result in results[1:4]] == ["Berlin, GB", "Rome, GB", "Oslo, GB"]
+    assert isinstance(results[4], ValueError)
+    assert peak == 2
+
+
+async def test_units_share_one_upstream_call_and_entry(
+    fake_cache, monkeypatch, mock_weather_response
+):
+    """Test every unit system is served from one canonical metric entry."""
+    client = WeatherClient()
+    client.api_key = "test-key"
+    upstream = AsyncMock(return_value=mock_weather_response)
+    monkeypatch.setattr(client, "_get_json", upstream)
+
+    metric = await client.get_current_weather("London", "GB", "metric")
+    imperial = await client.get_current_weather("London", "GB", "imperial")
+    standard = await client.get_current_weather("London", "GB", "standard")
+
+    assert upstream.await_count == 1
+    assert upstream.await_args.args[1]["units"] == "metric"
+    assert len(fake_cache.values) == 1
+    assert (metric.temperature, imperial.temperature, standard.temperature) == (12.5, 54.5, 285.65)
+    assert imperial.wind_speed == 12.3
+    assert imperial.units == "imperial"
+    assert imperial.witty_message == metric.witty_message
+
+
+async def test_forecast_is_converted_locally(fake_cache, monkeypatch, mock_forecast_response):
+    """Test forecasts in other units are derived from the cached metric forecast."""
+    client = WeatherClient()
+    client.api_key = "test-key"
+    upstream = AsyncMock(return_value=mock_forecast_response)
+    monkeypatch.setattr(client, "_get_json", upstream)
+
+    metric = await client.get_forecast("London", "GB")
+    imperial = await client.get_forecast("London", "GB", "imperial")
+
+    assert upstream.await_count == 1
+    assert imperial.units == "imperial"
+    assert imperial.forecast[1].temperature.max == 59.0
+    assert imperial.forecast[0].wind_speed == 12.3
+    assert imperial.forecast[0].date == metric.forecast[0].date
+
+
+async def test_unknown_city_is_not_fetched_again(fake_cache, monkeypatch):
+    """Test a city the upstream does not know is answered from the negative cache."""
+    client = WeatherClient()
+    client.api_key = "test-key"
+    upstream = AsyncMock(side_effect=CityNotFoundError("City not found: Atlantis"))
+    monkeypatch.setattr(client, "_get_json", upstream)
+
+    for lookup in (client.get_current_weather, client.get_forecast, client.get_current_weather):
+        with pytest.raises(ValueError, match="City not found"):
+            await lookup("Atlantis")
+    assert upstream.await_count == 1
+    assert fake_cache.values == {}
+
+
+async def test_malformed_upstream_body_is_not_remembered_as_unknown(fake_cache, monkeypatch):
+    """Test a 200 that is not JSON fails as an upstream error and never marks the city unknown."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="<html>Bad gateway</html>")
+
+    upstream = UpstreamHTTPClient()
+    await upstream.start(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("app.services.weather_client.upstream_client", upstream)
+    client = WeatherClient()
+    client.api_key = "test-key"
+
+    for _ in range(2):
+        with pytest.raises(httpx.DecodingError):
+            await client.get_current_weather("London")
+    await upstream.close()
+
+    assert len([r for r in requests if r.method == "GET"]) == 2
+    assert fake_cache.sorted_sets == {}
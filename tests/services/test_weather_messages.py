@@ -1,7 +1,7 @@
 """Tests for weather message generator."""
 import pytest
 
-from app.services.weather_messages import get_witty_message
+from app.services.weather_messages import WEATHER_MESSAGES, get_witty_message
 
 
 def test_get_witty_message_rain():
@@ -71,4 +71,13 @@ def test_get_witty_message_thunderstorm():
 def test_get_witty_message_clouds():
     """Test witty message for cloudy weather."""
     message = get_witty_message("Clouds", 16.0, 4.0, "metric")
-    assert isinstance(message, str)
\ No newline at end of file
+    assert isinstance(message, str)
+
+
+@pytest.mark.parametrize(
+    "temperature,wind_speed,units",
+    [(35.0, 2.0, "metric"), (95.0, 4.5, "imperial"), (308.15, 2.0, "standard")],
+)
+def test_get_witty_message_thresholds_are_unit_agnostic(temperature, wind_speed, units):
+    """Test the same conditions pick the same category in every unit system."""
+    assert get_witty_message("Clear", temperature, wind_speed, units) in WEATHER_MESSAGES["Hot"]
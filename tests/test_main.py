@@ -22,4 +22,5 @@ def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
     data = response.json()
-    assert data["status"] == "healthy"
\ No newline at end of file
+    assert data["status"] == "healthy"
+    assert data["cache_backend"] in ("redis", "memory", "none")
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""Tests for the local OpenWeatherMap stand-in."""
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.http_client import UpstreamHTTPClient
+from app.services.weather_client import WeatherClient
+from tools.fake_openweathermap import FakeUpstreamConfig, create_app, parse_latency
+
+NOW = 1_700_000_000
+
+
+def upstream(**options) -> httpx.AsyncClient:
+    """Client for a fake upstream built with ``options``."""
+    app = create_app(FakeUpstreamConfig(fixed_time=NOW, **options))
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://fake/data/2.5"
+    )
+
+
+async def test_payloads_are_deterministic_and_shaped_like_the_api(mock_weather_response):
+    """Test payloads repeat per seed and carry the fields the client reads."""
+    async with upstream() as a, upstream() as b, upstream(seed=1) as c:
+        params = {"q": "london,gb", "units": "metric"}
+        first = (await a.get("/weather", params=params)).json()
+        assert first == (await b.get("/weather", params=params)).json()
+        assert first != (await c.get("/weather", params=params)).json()
+
+    assert set(mock_weather_response) <= set(first)
+    assert (first["name"], first["sys"]["country"]) == ("London", "GB")
+    assert first["dt"] == NOW - NOW % 600
+
+
+async def test_forecast_and_group_endpoints():
+    """Test the forecast and multi-city endpoints."""
+    async with upstream() as client:
+        forecast = (await client.get("/forecast", params={"q": "Paris,FR"})).json()
+        city_id = forecast["city"]["id"]
+        group = (await client.get("/group", params={"id": f"{city_id},42"})).json()
+
+    assert len(forecast["list"]) == 40
+    assert forecast["list"][0]["dt"] > NOW
+    assert [item["id"] for item in group["list"]] == [city_id, 42]
+    assert group["list"][0]["name"] == "Paris"
+
+
+async def test_units_are_applied():
+    """Test imperial payloads are the metric ones converted."""
+    async with upstream() as client:
+        metric = (await client.get("/weather", params={"id": 1, "units": "metric"})).json()
+        imperial = (await client.get("/weather", params={"id": 1, "units": "imperial"})).json()
+
+    assert imperial["main"]["temp"] == pytest.approx(metric["main"]["temp"] * 9 / 5 + 32, abs=0.02)
+
+
+async def test_unknown_city_is_404():
+    """Test configured unknown cities are answered like the real API."""
+    async with upstream() as client:
+        response = await client.get("/weather", params={"q": "Atlantis"})
+
+    assert response.status_code == 404
+
+
+async def test_quota_returns_429_with_retry_after():
+    """Test calls beyond the per-minute quota are throttled."""
+    async with upstream(quota_per_minute=2) as client:
+        statuses = [(await client.get("/weather", params={"id": 1})) for _ in range(3)]
+
+    assert [r.status_code for r in statuses] == [200, 200, 429]
+    assert int(statuses[-1].headers["Retry-After"]) > 0
+
+
+async def test_error_rate_and_latency():
+    """Test injected 5xx responses and delays."""
+    async with upstream(error_rate=1.0, latency="fixed", latency_ms=20) as client:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        response = await client.get("/weather", params={"id": 1})
+
+    assert response.status_code in (500, 502, 503)
+    assert loop.time() - started >= 0.02
+
+
+async def test_timeouts_hang_requests():
+    """Test hanging requests do not answer within a client timeout."""
+    async with upstream(timeout_rate=1.0, timeout_seconds=1) as client:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.get("/weather", params={"id": 1}), timeout=0.05)
+
+
+async def test_record_and_replay(tmp_path):
+    """Test recorded responses are replayed offline, without the API key."""
+    cassette = tmp_path / "cassette.jsonl"
+    real = create_app(FakeUpstreamConfig(fixed_time=NOW))
+
+    recorder = create_app(
+        FakeUpstreamConfig(mode="record", cassette=cassette, record_url="http://real/data/2.5"),
+        record_transport=httpx.ASGITransport(app=real),
+    )
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=recorder), base_url="http://fake/data/2.5"
+    ) as client:
+        recorded = await client.get("/weather", params={"q": "Oslo", "appid": "secret"})
+
+    assert "secret" not in cassette.read_text()
+    async with upstream(mode="replay", cassette=cassette) as client:
+        replayed = await client.get("/weather", params={"q": "Oslo", "appid": "other"})
+        missing = await client.get("/weather", params={"q": "Bergen"})
+
+    assert replayed.json() == recorded.json()
+    assert missing.status_code == 404
+
+
+def test_parse_latency():
+    """Test CLI latency specs."""
+    assert parse_latency("lognormal:80:0.5") == {
+        "latency": "lognormal",
+        "latency_ms": 80.0,
+        "latency_spread": 0.5,
+    }
+
+
+async def test_weather_client_against_fake_upstream(fake_cache, monkeypatch):
+    """Test WeatherClient end to end against the in-process fake."""
+    app = create_app(FakeUpstreamConfig(fixed_time=NOW))
+    client = UpstreamHTTPClient()
+    client.base_url = "http://fake/data/2.5"
+    await client.start(transport=httpx.ASGITransport(app=app))
+    monkeypatch.setattr("app.services.weather_client.upstream_client", client)
+    weather = WeatherClient()
+    weather.api_key = "test-key"
+
+    results = await asyncio.gather(*(weather.get_current_weather("Lisbon", "PT") for _ in range(5)))
+    forecast = await weather.get_forecast("Lisbon", "PT", "imperial")
+    await client.close()
+
+    assert {result.location for result in results} == {"Lisbon, PT"}
+    assert len(forecast.forecast) == 5
+    assert app.state.stats.snapshot()["requests"] == {"weather": 1, "forecast": 1}
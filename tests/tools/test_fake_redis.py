@@ -0,0 +1,20 @@
+"""Tests for the in-process Redis stand-in."""
+from app.services.cache import CacheService
+from tools.fake_redis import InMemoryRedis
+
+
+async def test_cache_service_runs_on_the_stand_in(clock):
+    """Test CacheService commands, pipelines and expiry against the stand-in."""
+    cache = CacheService()
+    cache.redis_client = InMemoryRedis(clock)
+
+    await cache.set("a", "1", ttl=10)
+    await cache.hset("aliases", "london", "1")
+
+    assert await cache.get_with_ttl("a") == ("1", 10)
+    assert await cache.get_many_with_ttl(["a", "b"]) == [("1", 10), (None, -2)]
+    assert await cache.hmget("aliases", ["london", "paris"]) == ["1", None]
+    clock.now = 10
+    assert await cache.get("a") is None
+    assert cache.redis_client.commands["get"] == 4
+    assert cache.redis_client.total_commands == 10
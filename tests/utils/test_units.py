@@ -0,0 +1,39 @@
+"""Tests for unit conversion."""
+import pytest
+
+from app.utils.units import convert_speed, convert_temperature
+
+
+@pytest.mark.parametrize(
+    "value,from_units,to_units,expected",
+    [
+        (0, "metric", "imperial", 32),
+        (100, "metric", "imperial", 212),
+        (0, "metric", "standard", 273.15),
+        (-40, "imperial", "metric", -40),
+        (300, "standard", "imperial", 80.33),
+        (12.5, "metric", "metric", 12.5),
+    ],
+)
+def test_convert_temperature(value, from_units, to_units, expected):
+    """Test temperatures convert between all unit systems."""
+    assert convert_temperature(value, from_units, to_units) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "value,from_units,to_units,expected",
+    [
+        (10, "metric", "imperial", 22.369),
+        (22.369, "imperial", "standard", 10),
+        (5.5, "standard", "metric", 5.5),
+    ],
+)
+def test_convert_speed(value, from_units, to_units, expected):
+    """Test wind speeds convert between m/s and mph."""
+    assert convert_speed(value, from_units, to_units) == pytest.approx(expected, abs=1e-3)
+
+
+def test_unknown_units_are_rejected():
+    """Test unsupported unit systems raise ValueError."""
+    with pytest.raises(ValueError):
+        convert_temperature(10, "metric", "rankine")
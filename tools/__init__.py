@@ -0,0 +1 @@
+"""Development tools: local upstream stand-ins and benchmarks."""
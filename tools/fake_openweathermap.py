@@ -0,0 +1,435 @@
+"""Local OpenWeatherMap stand-in with latency and fault injection.
+
+Serves ``/data/2.5/weather``, ``/data/2.5/forecast`` and ``/data/2.5/group``
+with deterministic payloads shaped like the real API, so WeatherClient can be
+exercised offline. Point the application at it with
+``WEATHER_API_BASE_URL=http://localhost:8081/data/2.5`` and run::
+
+    python -m tools.fake_openweathermap --port 8081 --latency lognormal:80:0.5 \\
+        --error-rate 0.02 --quota-per-minute 600
+
+In tests and benchmarks the app can be mounted in-process instead, through
+``upstream_client.start(transport=httpx.ASGITransport(app=create_app(...)))``.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+import httpx
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from app.utils.units import convert_speed, convert_temperature
+
+logger = logging.getLogger(__name__)
+
+CONDITIONS = [
+    ("Clear", "clear sky"),
+    ("Clouds", "few clouds"),
+    ("Clouds", "overcast clouds"),
+    ("Rain", "light rain"),
+    ("Drizzle", "light intensity drizzle"),
+    ("Thunderstorm", "thunderstorm"),
+    ("Snow", "light snow"),
+    ("Mist", "mist"),
+]
+COUNTRIES = ["GB", "US", "DE", "FR", "JP", "BR", "IN", "AU"]
+
+FORECAST_STEP = 10800
+FORECAST_ITEMS = 40
+OBSERVATION_CADENCE = 600
+
+
+class FakeUpstreamConfig(BaseModel):
+    """Behaviour of the fake upstream."""
+
+    seed: int = Field(0, description="Seed for payloads and fault injection")
+    latency: Literal["none", "fixed", "uniform", "exponential", "lognormal"] = "none"
+    latency_ms: float = Field(0.0, description="Fixed, mean or median latency (ms)")
+    latency_spread: float = Field(0.0, description="Uniform half-width (ms) or lognormal sigma")
+    error_rate: float = Field(0.0, ge=0, le=1, description="Share of 5xx responses")
+    timeout_rate: float = Field(0.0, ge=0, le=1, description="Share of hanging requests")
+    timeout_seconds: float = Field(60.0, description="How long a hanging request hangs")
+    quota_per_minute: int = Field(0, description="Calls per minute before 429s (0 = unlimited)")
+    not_found: List[str] = Field(["atlantis"], description="City names answered with 404")
+    fixed_time: Optional[int] = Field(None, description="Unix time used instead of the clock")
+    mode: Literal["generate", "record", "replay"] = "generate"
+    cassette: Optional[Path] = Field(None, description="JSON lines file for record/replay")
+    record_url: str = Field(
+        "https://api.openweathermap.org/data/2.5", description="Real upstream to record"
+    )
+
+
+class FakeUpstreamStats:
+    """Counters of what the fake upstream served."""
+
+    def __init__(self):
+        self.requests: Dict[str, int] = {}
+        self.outcomes: Dict[str, int] = {}
+
+    def count(self, endpoint: str, outcome: str):
+        """Count one request."""
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters."""
+        return {
+            "requests": dict(self.requests),
+            "outcomes": dict(self.outcomes),
+            "total": sum(self.requests.values()),
+        }
+
+
+class WeatherGenerator:
+    """Deterministic OpenWeatherMap-shaped payloads.
+
+    Every city's weather derives from a hash of the seed and the city, and
+    changes only when the observation period (10 minutes for current
+    weather, 3 hours for forecasts) rolls over.
+    """
+
+    def __init__(self, seed: int, fixed_time: Optional[int] = None):
+        self.seed = seed
+        self.fixed_time = fixed_time
+        self._names: Dict[int, Tuple[str, str]] = {}
+
+    def now(self) -> int:
+        """Current Unix time, or the configured fixed time."""
+        return self.fixed_time if self.fixed_time is not None else int(time.time())
+
+    def _rng(self, *parts: Any) -> random.Random:
+        digest = hashlib.sha256(":".join(str(p) for p in (self.seed, *parts)).encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def city_from_query(self, q: str) -> Tuple[int, str, str]:
+        """Resolve a ``q`` parameter to (id, name, country)."""
+        parts = [part.strip() for part in q.split(",") if part.strip()]
+        name = parts[0].title() if parts else "Unknown"
+        rng = self._rng("city", name.casefold())
+        country = parts[-1].upper() if len(parts) > 1 else rng.choice(COUNTRIES)
+        city_id = 1_000_000 + rng.randrange(9_000_000)
+        self._names[city_id] = (name, country)
+        return city_id, name, country
+
+    def city_from_id(self, city_id: int) -> Tuple[int, str, str]:
+        """Resolve an ``id`` parameter to (id, name, country)."""
+        name, country = self._names.get(city_id, (f"City {city_id}", "GB"))
+        return city_id, name, country
+
+    def _sample(self, city_id: int, dt: int, units: str) -> Dict[str, Any]:
+        """Weather of a city at one observation time."""
+        rng = self._rng("weather", city_id, dt)
+        climate = self._rng("climate", city_id).uniform(-5, 25)
+        temp = climate + rng.uniform(-8, 8)
+        wind = rng.uniform(0, 14)
+        condition, description = rng.choice(CONDITIONS)
+        return {
+            "main": {
+                "temp": round(convert_temperature(temp, "metric", units), 2),
+                "feels_like": round(convert_temperature(temp - wind * 0.3, "metric", units), 2),
+                "temp_min": round(convert_temperature(temp - 1.5, "metric", units), 2),
+                "temp_max": round(convert_temperature(temp + 1.5, "metric", units), 2),
+                "pressure": rng.randint(990, 1030),
+                "humidity": rng.randint(30, 100),
+            },
+            "weather": [
+                {"id": 800, "main": condition, "description": description, "icon": "01d"}
+            ],
+            "wind": {
+                "speed": round(convert_speed(wind, "metric", units), 2),
+                "deg": rng.randrange(360),
+            },
+        }
+
+    def current(self, city: Tuple[int, str, str], units: str) -> Dict[str, Any]:
+        """Current weather payload (``/weather``)."""
+        city_id, name, country = city
+        dt = self.now() // OBSERVATION_CADENCE * OBSERVATION_CADENCE
+        rng = self._rng("coord", city_id)
+        return {
+            "coord": {
+                "lon": round(rng.uniform(-180, 180), 4),
+                "lat": round(rng.uniform(-60, 70), 4),
+            },
+            **self._sample(city_id, dt, units),
+            "dt": dt,
+            "sys": {"country": country},
+            "id": city_id,
+            "name": name,
+        }
+
+    def forecast(self, city: Tuple[int, str, str], units: str) -> Dict[str, Any]:
+        """Five day / three hour forecast payload (``/forecast``)."""
+        city_id, name, country = city
+        first = (self.now() // FORECAST_STEP + 1) * FORECAST_STEP
+        items = []
+        for i in range(FORECAST_ITEMS):
+            dt = first + i * FORECAST_STEP
+            items.append({"dt": dt, **self._sample(city_id, dt, units)})
+        return {
+            "cod": "200",
+            "cnt": len(items),
+            "list": items,
+            "city": {"id": city_id, "name": name, "country": country},
+        }
+
+
+class Cassette:
+    """Recorded upstream responses keyed by endpoint and query."""
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path is not None and path.exists():
+            for line in path.read_text().splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries[entry["key"]] = entry
+
+    @staticmethod
+    def key(endpoint: str, params: Dict[str, str]) -> str:
+        """Recording key; the API key is never part of it."""
+        query = sorted((k, v) for k, v in params.items() if k != "appid")
+        return f"{endpoint}?{json.dumps(query)}"
+
+    def get(self, endpoint: str, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Return a recorded response."""
+        return self.entries.get(self.key(endpoint, params))
+
+    def add(self, endpoint: str, params: Dict[str, str], status: int, body: Any):
+        """Record a response and append it to the cassette file."""
+        entry = {"key": self.key(endpoint, params), "status": status, "body": body}
+        self.entries[entry["key"]] = entry
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+class FaultInjector:
+    """Latency, error, timeout and quota behaviour of the fake upstream."""
+
+    def __init__(self, config: FakeUpstreamConfig, clock=time.monotonic):
+        self.config = config
+        self.clock = clock
+        self.rng = random.Random(config.seed)
+        self._window_start = clock()
+        self._window_calls = 0
+
+    def latency(self) -> float:
+        """Sample one response delay in seconds."""
+        cfg = self.config
+        if cfg.latency == "fixed":
+            delay = cfg.latency_ms
+        elif cfg.latency == "uniform":
+            delay = self.rng.uniform(
+                cfg.latency_ms - cfg.latency_spread, cfg.latency_ms + cfg.latency_spread
+            )
+        elif cfg.latency == "exponential":
+            delay = self.rng.expovariate(1 / cfg.latency_ms) if cfg.latency_ms > 0 else 0.0
+        elif cfg.latency == "lognormal":
+            delay = self.rng.lognormvariate(0, cfg.latency_spread) * cfg.latency_ms
+        else:
+            delay = 0.0
+        return max(delay, 0.0) / 1000
+
+    def quota_exceeded(self) -> Optional[int]:
+        """Count a call against the quota; return Retry-After seconds if over it."""
+        if self.config.quota_per_minute <= 0:
+            return None
+        now = self.clock()
+        if now - self._window_start >= 60:
+            self._window_start = now
+            self._window_calls = 0
+        self._window_calls += 1
+        if self._window_calls > self.config.quota_per_minute:
+            return max(int(60 - (now - self._window_start)) + 1, 1)
+        return None
+
+    def hangs(self) -> bool:
+        """Whether this request should hang."""
+        return self.rng.random() < self.config.timeout_rate
+
+    def fails(self) -> bool:
+        """Whether this request should fail with a 5xx."""
+        return self.rng.random() < self.config.error_rate
+
+
+def create_app(
+    config: Optional[FakeUpstreamConfig] = None,
+    record_transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> FastAPI:
+    """Build the fake upstream application.
+
+    Args:
+        config: Fake upstream behaviour (defaults: no latency, no faults)
+        record_transport: Transport override for the upstream recorded from
+
+    Returns:
+        FastAPI application serving the OpenWeatherMap endpoints under /data/2.5
+    """
+    config = config or FakeUpstreamConfig()
+    generator = WeatherGenerator(config.seed, config.fixed_time)
+    faults = FaultInjector(config)
+    cassette = Cassette(config.cassette)
+    stats = FakeUpstreamStats()
+    not_found = {name.casefold() for name in config.not_found}
+
+    app = FastAPI(title="Fake OpenWeatherMap")
+    app.state.config = config
+    app.state.stats = stats
+    app.state.generator = generator
+    router = APIRouter(prefix="/data/2.5")
+
+    def error(status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        return JSONResponse({"cod": str(status), "message": message}, status, headers=headers)
+
+    async def record(endpoint: str, params: Dict[str, str]) -> JSONResponse:
+        async with httpx.AsyncClient(
+            base_url=config.record_url, timeout=30, transport=record_transport
+        ) as client:
+            response = await client.get(f"/{endpoint}", params=params)
+        body = response.json()
+        cassette.add(endpoint, params, response.status_code, body)
+        logger.info(f"Recorded {endpoint} ({response.status_code})")
+        return JSONResponse(body, response.status_code)
+
+    def generate(endpoint: str, params: Dict[str, str]) -> JSONResponse:
+        units = params.get("units", "standard")
+        if endpoint == "group":
+            ids = [int(i) for i in params.get("id", "").split(",") if i.strip()]
+            if not ids or len(ids) > 20:
+                return error(400, "id parameter must list 1 to 20 city ids")
+            items = [generator.current(generator.city_from_id(i), units) for i in ids]
+            return JSONResponse({"cnt": len(items), "list": items})
+
+        if "id" in params:
+            city = generator.city_from_id(int(params["id"]))
+        elif "q" in params:
+            if params["q"].split(",")[0].strip().casefold() in not_found:
+                return error(404, "city not found")
+            city = generator.city_from_query(params["q"])
+        else:
+            return error(400, "Nothing to geocode")
+
+        if endpoint == "weather":
+            return JSONResponse(generator.current(city, units))
+        return JSONResponse(generator.forecast(city, units))
+
+    async def serve(endpoint: str, request: Request) -> JSONResponse:
+        params = dict(request.query_params)
+        await asyncio.sleep(faults.latency())
+
+        retry_after = faults.quota_exceeded()
+        if retry_after is not None:
+            stats.count(endpoint, "quota")
+            return error(429, "quota exceeded", {"Retry-After": str(retry_after)})
+        if faults.hangs():
+            stats.count(endpoint, "timeout")
+            await asyncio.sleep(config.timeout_seconds)
+            return error(504, "gateway timeout")
+        if faults.fails():
+            stats.count(endpoint, "error")
+            return error(faults.rng.choice([500, 502, 503]), "internal error")
+
+        if config.mode == "replay":
+            entry = cassette.get(endpoint, params)
+            if entry is None:
+                stats.count(endpoint, "unrecorded")
+                return error(404, "no recording for this request")
+            stats.count(endpoint, "replayed")
+            return JSONResponse(entry["body"], entry["status"])
+        if config.mode == "record":
+            stats.count(endpoint, "recorded")
+            return await record(endpoint, params)
+
+        response = generate(endpoint, params)
+        stats.count(endpoint, "ok" if response.status_code == 200 else str(response.status_code))
+        return response
+
+    @router.get("/weather")
+    async def weather(request: Request):
+        return await serve("weather", request)
+
+    @router.get("/forecast")
+    async def forecast(request: Request):
+        return await serve("forecast", request)
+
+    @router.get("/group")
+    async def group(request: Request):
+        return await serve("group", request)
+
+    @app.get("/__stats")
+    async def get_stats():
+        return stats.snapshot()
+
+    @app.post("/__reset")
+    async def reset():
+        stats.requests.clear()
+        stats.outcomes.clear()
+        return {"status": "reset"}
+
+    app.include_router(router)
+    return app
+
+
+def parse_latency(value: str) -> Dict[str, Any]:
+    """Parse ``kind[:ms[:spread]]`` latency specs, e.g. ``lognormal:80:0.5``."""
+    kind, *numbers = value.split(":")
+    options: Dict[str, Any] = {"latency": kind}
+    if numbers:
+        options["latency_ms"] = float(numbers[0])
+    if len(numbers) > 1:
+        options["latency_spread"] = float(numbers[1])
+    return options
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the fake upstream with uvicorn."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--latency",
+        default="none",
+        help="none | fixed:MS | uniform:MS:HALF_WIDTH | exponential:MEAN_MS "
+        "| lognormal:MEDIAN_MS:SIGMA",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-seconds", type=float, default=60.0)
+    parser.add_argument("--quota-per-minute", type=int, default=0)
+    parser.add_argument("--fixed-time", type=int)
+    parser.add_argument("--mode", choices=["generate", "record", "replay"], default="generate")
+    parser.add_argument("--cassette", type=Path)
+    parser.add_argument("--record-url", default=FakeUpstreamConfig().record_url)
+    args = parser.parse_args(argv)
+
+    config = FakeUpstreamConfig(
+        seed=args.seed,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+        quota_per_minute=args.quota_per_minute,
+        fixed_time=args.fixed_time,
+        mode=args.mode,
+        cassette=args.cassette,
+        record_url=args.record_url,
+        **parse_latency(args.latency),
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""In-process stand-in for the ``redis.asyncio`` client.
+
+Extends the cache's in-process backend, which implements the subset of
+commands CacheService uses with expiry and pub/sub between clients sharing
+one instance. It counts every command and network round-trip (a pipeline
+is one), optionally adding a simulated round-trip time, so benchmarks can
+report Redis operations per request. Assign an instance to
+``cache_service.redis_client`` instead of calling ``cache_service.connect()``.
+"""
+import asyncio
+import time
+from collections import Counter
+
+from app.services.memory_backend import MemoryBackend
+
+
+class InMemoryRedis(MemoryBackend):
+    """Unbounded MemoryBackend with command and round-trip counters."""
+
+    def __init__(self, clock=time.monotonic, rtt: float = 0.0):
+        super().__init__(max_entries=float("inf"), clock=clock)
+        self.rtt = rtt
+        self.round_trips = 0
+        self.commands: Counter = Counter()
+
+    async def _command(self, name: str):
+        self.commands[name] += 1
+        await super()._command(name)
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        if self.rtt:
+            await asyncio.sleep(self.rtt)
+
+    @property
+    def total_commands(self) -> int:
+        """Commands executed so far."""
+        return sum(self.commands.values())